@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+디렉터리의 약관 html 파일을 로컬에서 한꺼번에 분석한다.
+
+추출(trafilatura)과 문장 분할은 프로세스 풀에서, 모델 호출이 필요한 단계는 문서별 스레드에서 실행하며,
+모든 문서가 하나의 LLMClient와 공유 스레드 풀(TERMLENS_MAX_WORKERS), 모델별 동시성 조절기를 함께 사용한다.
+문서가 끝날 때마다 결과를 출력 JSONL에 한 줄({"path", "raw_hash", "content_hash", "result", "seconds"})씩 추가하고,
+같은 --out으로 다시 실행하면 결과가 있는 문서는 건너뛴다. (실패한 문서는 다시 분석)
+
+--store dynamodb를 지정하면 문장 결과 저장소(termlens-sentence-results)를 사용해 저장소를 미리 채우며,
+TERMLENS_RESPONSE_CACHE를 설정하면 응답 캐시도 함께 채운다.
+
+사용 예:
+    python scripts/analyze_corpus.py corpus/ --out results.jsonl
+    python scripts/analyze_corpus.py corpus/ --out results.jsonl --processes 8 --documents 16 --store dynamodb
+"""
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from corpus_runner import iter_corpus_files, run_corpus  # noqa: E402
+from runtime import get_runtime  # noqa: E402
+from sentence_store import InMemorySentenceStore  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="로컬 약관 말뭉치 분석")
+    parser.add_argument("root", help="약관 html 디렉터리 (또는 파일)")
+    parser.add_argument("--out", required=True, help="결과 JSONL 경로 (재실행 시 이어서 분석)")
+    parser.add_argument("--processes", type=int, default=None, help="추출/분할 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--documents", type=int, default=4, help="동시에 분석할 문서 수")
+    parser.add_argument("--store", choices=("memory", "dynamodb"), default="memory", help="문장 결과 저장소")
+    parser.add_argument("--limit", type=int, default=0, help="분석할 최대 문서 수 (0이면 전체)")
+    args = parser.parse_args()
+
+    paths = iter_corpus_files(args.root)
+    if args.limit:
+        paths = paths[: args.limit]
+    print(f"문서 수: {len(paths)}")
+
+    runtime = get_runtime()
+    sentence_store = runtime.sentence_store if args.store == "dynamodb" else InMemorySentenceStore()
+    started = time.perf_counter()
+
+    def on_record(record):
+        status = "완료" if "result" in record else f"실패: {record.get('error')}"
+        print(f"[{record['path']}] {status}", file=sys.stderr)
+
+    counts = run_corpus(
+        paths,
+        args.out,
+        runtime.llm_client,
+        sentence_store=sentence_store,
+        processes=args.processes,
+        documents=args.documents,
+        on_record=on_record,
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"건너뜀 {counts['skipped']}, 완료 {counts['completed']}, 실패 {counts['failed']} "
+        f"({elapsed:.1f}초)"
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
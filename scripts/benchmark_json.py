@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+LLM 응답 JSON 파싱(json_utils.extract_json_fragment)의 두 경로를 비교한다.
+
+- 바로 파싱: 응답 전체가 올바른 JSON 객체/배열일 때(구조화 출력, 지시를 지킨 응답) json.loads 한 번으로 끝남
+- 보정 파싱(repair_json_fragment): 코드블록 제거, 괄호를 한 글자씩 훑어 조각 자르기, 역슬래시 보정
+
+점수화 배치 형태의 응답을 항목 수별로 만들어 응답 모양(정상/들여쓰기/코드블록/앞뒤 설명/잘림/잘못된 역슬래시)마다
+호출당 시간을 측정하고, 두 경로의 파싱 결과가 같은지 확인한다. 결과가 다르면 종료 코드 1을 반환한다.
+
+사용 예:
+    python scripts/benchmark_json.py
+    python scripts/benchmark_json.py --items 10,40,200 --repeat 2000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from json_utils import extract_json_fragment, repair_json_fragment  # noqa: E402
+from tos_evaluate import CATEGORY_EVAL_POINTS  # noqa: E402
+
+
+def make_items(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    categories = list(CATEGORY_EVAL_POINTS)
+    items = []
+    for idx in range(count):
+        item = {"id": idx, "importance_score": rng.randint(1, 5)}
+        if item["importance_score"] >= 4:
+            item["category"] = rng.choice(categories)
+        items.append(item)
+    return items
+
+
+def make_responses(count: int):
+    """(응답 모양, 응답 문자열) 목록"""
+    items = make_items(count)
+    compact = json.dumps(items, ensure_ascii=False)
+    evaluation = json.dumps(
+        {"reasoning": "회사가 일방적으로 서비스를 중단할 수 있어 이용자에게 불리합니다. " * 3, "label": "bad"},
+        ensure_ascii=False,
+    )
+    return [
+        ("정상", compact),
+        ("들여쓰기", json.dumps(items, ensure_ascii=False, indent=2)),
+        ("코드블록", f"```json\n{compact}\n```"),
+        ("앞뒤 설명", f"다음은 결과입니다.\n{compact}\n이상입니다."),
+        ("잘림", compact[:-1]),
+        ("역슬래시", compact.replace('"id": 0,', '"note": "제1조\\_정의", "id": 0,', 1)),
+        ("평가 객체", evaluation),
+    ]
+
+
+def timed_calls(fn, text: str, repeat: int) -> float:
+    """호출당 평균 시간(마이크로초)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LLM 응답 JSON 파싱 경로 비교")
+    parser.add_argument("--items", default="10,40,200", help="배열 항목 수 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=1000, help="경우별 반복 횟수")
+    args = parser.parse_args()
+
+    mismatches = 0
+    print(f"{'항목 수':>6} {'응답 모양':<10} {'길이':>7} {'경로':<6} {'기본(us)':>9} {'보정(us)':>9} {'배율':>6} {'일치':>4}")
+    for count in (int(value) for value in args.items.split(",")):
+        for shape, text in make_responses(count):
+            try:
+                json.loads(text.strip())
+                path = "바로"
+            except ValueError:
+                path = "보정"
+            same = extract_json_fragment(text) == repair_json_fragment(text)
+            mismatches += not same
+            default_us = timed_calls(extract_json_fragment, text, args.repeat)
+            repair_us = timed_calls(repair_json_fragment, text, args.repeat)
+            print(
+                f"{count:>6} {shape:<10} {len(text):>7} {path:<6} {default_us:>9.1f} {repair_us:>9.1f} "
+                f"{repair_us / default_us:>5.1f}x {'예' if same else '아니오':>4}"
+            )
+
+    if mismatches:
+        print(f"두 경로의 결과가 다른 경우: {mismatches}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
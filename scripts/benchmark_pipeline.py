@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+가짜 LLM 백엔드(simulated_llm)로 분석 파이프라인의 단계별 성능을 측정한다.
+
+합성 한국어/영어 약관(크기별)을 만들어 다음 단계를 차례로 실행하고,
+단계마다 경과 시간, CPU 시간, 모델 호출 수, 최대 스레드 수, 최대 동시 호출 수를 출력한다.
+    split        split_sentences_block (+ 10자 이하 제거)
+    score        score_sentence_importance
+    categorize   categorize_sentences (중요도 4 이상)
+    summarize    summarize_by_category
+    evaluate     evaluate_category_summaries
+    pipeline     run_pipeline (사전 분류·중복 제거·단계 융합을 포함한 전체 흐름)
+
+--json-out으로 결과를 저장하고, 이후 --baseline으로 비교하면 경과 시간이
+--tolerance 비율 이상 늘어난 단계가 있을 때 종료 코드 1을 반환한다. (성능 회귀 확인용)
+지연 시간은 실제 Bedrock보다 짧게 주고 비교하는 것이 좋다. 분포 형식은 simulated_llm.parse_latency 참고.
+
+사용 예:
+    python scripts/benchmark_pipeline.py --sizes small,medium --languages ko,en
+    python scripts/benchmark_pipeline.py --small-latency fixed:0.05 --large-latency fixed:0.2 --json-out base.json
+    python scripts/benchmark_pipeline.py --small-latency fixed:0.05 --large-latency fixed:0.2 --baseline base.json
+    python scripts/benchmark_pipeline.py --sizes large --throttle-rate 0.05 --error-rate 0.02
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from llm_governor import reset_limiters  # noqa: E402
+from runtime import DEFAULT_MAX_WORKERS, RuntimeContext, set_runtime  # noqa: E402
+from simulated_llm import SimulatedLLMClient  # noqa: E402
+from text_splitter import split_sentences_block  # noqa: E402
+from tos_evaluate import evaluate_category_summaries  # noqa: E402
+from tos_pipeline import run_pipeline  # noqa: E402
+from tos_processing import categorize_sentences, score_sentence_importance  # noqa: E402
+from tos_summarize import summarize_by_category  # noqa: E402
+
+# 크기별 조항 수 (조항당 3~6문장)
+SIZES = {"small": 15, "medium": 80, "large": 400, "xlarge": 2000}
+STAGES = ("split", "score", "categorize", "summarize", "evaluate", "pipeline")
+
+_KO_SUBJECTS = ["회사", "회원", "이용자", "당사", "서비스 제공자"]
+_KO_OBJECTS = ["개인정보", "유료 서비스", "계정", "게시물", "결제 정보", "위치 정보", "포인트", "쿠폰"]
+_KO_CLAUSES = [
+    "{s}는 {o}를 {n}일 이내에 처리하여야 합니다.",
+    "{s}는 관련 법령에 따라 {o}를 제3자에게 제공할 수 있습니다.",
+    "{s}는 사전 통지 없이 {o}의 이용을 제한할 수 있으며, 이에 대하여 책임을 지지 않습니다.",
+    "{o}의 이용 요금은 매월 {n}일에 자동으로 결제되며, 해지 신청 전까지 계속 청구됩니다.",
+    "{s}는 {o}와 관련하여 발생한 손해에 대하여 고의 또는 중과실이 없는 한 책임을 지지 않습니다.",
+    "본 약관은 {n}년 {m}월 {n}일부터 시행합니다.",
+    "{s}는 {o}의 보관 기간이 경과한 경우 지체 없이 파기합니다.",
+    "문의 사항은 고객센터(1588-{n}{m})로 연락하시기 바랍니다.",
+]
+_EN_SUBJECTS = ["The Company", "You", "The User", "We", "The Service Provider"]
+_EN_OBJECTS = ["personal data", "paid subscriptions", "your account", "user content", "payment details", "location data"]
+_EN_CLAUSES = [
+    "{s} may share {o} with third parties as permitted by applicable law.",
+    "{s} may suspend access to {o} at any time without prior notice.",
+    "Fees for {o} are billed automatically every {n} days until cancelled.",
+    "{s} shall not be liable for any damages arising from {o}, except as required by law.",
+    "{s} will delete {o} within {n} days after the retention period expires.",
+    "These Terms are effective as of {m}/{n}/2024.",
+    "Any dispute regarding {o} shall be resolved by binding arbitration in Seoul.",
+    "Please contact support at help{n}@example.com for questions about {o}.",
+]
+
+
+def make_corpus(language: str, articles: int, seed: int = 0) -> str:
+    """합성 약관 본문. 같은 인자에는 항상 같은 본문을 만든다."""
+    rng = random.Random(f"{language}:{articles}:{seed}")
+    subjects, objects, clauses = (
+        (_KO_SUBJECTS, _KO_OBJECTS, _KO_CLAUSES) if language == "ko" else (_EN_SUBJECTS, _EN_OBJECTS, _EN_CLAUSES)
+    )
+    lines = []
+    for number in range(1, articles + 1):
+        lines.append(f"제{number}조 (조항 {number})" if language == "ko" else f"Article {number}.")
+        sentences = []
+        for _ in range(rng.randint(3, 6)):
+            template = rng.choice(clauses)
+            sentences.append(template.format(
+                s=rng.choice(subjects), o=rng.choice(objects),
+                n=rng.randint(1, 90), m=rng.randint(1, 12),
+            ))
+        lines.append(" ".join(sentences))
+    return "\n".join(lines)
+
+
+class ThreadSampler:
+    """측정 구간의 최대 활성 스레드 수를 주기적으로 기록한다."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            # 샘플러 스레드 자신은 제외
+            self.peak = max(self.peak, threading.active_count() - 1)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def measure(name, fn, client, results):
+    # 단계마다 새 공유 스레드 풀을 써서, 단계별로 실제 생성된 스레드 수를 측정
+    executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="termlens")
+    set_runtime(RuntimeContext(llm_client=client, executor=executor))
+    calls_before = client.total_calls()
+    client.reset_peak()
+    try:
+        with ThreadSampler() as sampler:
+            wall_started = time.perf_counter()
+            cpu_started = time.process_time()
+            value = fn()
+            cpu = time.process_time() - cpu_started
+            wall = time.perf_counter() - wall_started
+    finally:
+        executor.shutdown()
+        set_runtime(None)
+    results[name] = {
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(cpu, 4),
+        "calls": client.total_calls() - calls_before,
+        "peak_threads": sampler.peak,
+        "peak_in_flight": client.peak_in_flight,
+    }
+    return value
+
+
+def run_case(text, client_args):
+    """합성 약관 하나에 대해 단계별 측정값을 반환한다."""
+    results = {}
+    reset_limiters()
+    client = SimulatedLLMClient(**client_args)
+
+    records = measure(
+        "split", lambda: [s for s in split_sentences_block(text) if len(s) > 10], client, results
+    )
+    for idx, record in enumerate(records):
+        record.id = idx
+    sentences = [record.sentence for record in records]
+    scored = measure("score", lambda: score_sentence_importance(sentences, client), client, results)
+    for item in scored:
+        if isinstance(item.get("id"), int) and 0 <= item["id"] < len(records):
+            records[item["id"]].importance_score = item["importance_score"]
+    important = [record for record in records if (record.importance_score or 0) >= 4]
+    categories = measure(
+        "categorize",
+        lambda: categorize_sentences([{"id": r.id, "sentence": r.sentence} for r in important], client),
+        client,
+        results,
+    )
+    for item in categories:
+        if isinstance(item.get("id"), int) and 0 <= item["id"] < len(records):
+            records[item["id"]].category = item["category"]
+    categorized = [record for record in important if record.category is not None]
+    summaries = measure("summarize", lambda: summarize_by_category(categorized, client), client, results)
+    measure("evaluate", lambda: evaluate_category_summaries(summaries, client), client, results)
+
+    # 전체 흐름은 별도 클라이언트로 측정 (조절기 한도도 초기 상태에서 시작)
+    reset_limiters()
+    pipeline_client = SimulatedLLMClient(**client_args)
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    measure("pipeline", lambda: run_pipeline(text, content_hash, pipeline_client), pipeline_client, results)
+    results["sentences"] = len(sentences)
+    return results
+
+
+def median_results(runs):
+    merged = {"sentences": runs[0]["sentences"]}
+    for stage in STAGES:
+        merged[stage] = {
+            key: statistics.median(run[stage][key] for run in runs)
+            for key in ("wall_seconds", "cpu_seconds", "calls", "peak_threads", "peak_in_flight")
+        }
+    return merged
+
+
+def print_report(report):
+    print(
+        f"{'문서':<12} {'단계':<11} {'경과(s)':>8} {'CPU(s)':>8} {'호출':>6} "
+        f"{'최대 스레드':>10} {'최대 동시 호출':>12}"
+    )
+    for case, results in report.items():
+        for stage in STAGES:
+            row = results[stage]
+            print(
+                f"{case:<12} {stage:<11} {row['wall_seconds']:>8.3f} {row['cpu_seconds']:>8.3f} "
+                f"{row['calls']:>6} {row['peak_threads']:>10} {row['peak_in_flight']:>12}"
+            )
+
+
+def compare(report, baseline, tolerance):
+    """기준 결과보다 경과 시간이 tolerance 비율 이상 늘어난 (문서, 단계) 목록."""
+    regressions = []
+    for case, results in report.items():
+        for stage in STAGES:
+            base = baseline.get(case, {}).get(stage)
+            if not base or base["wall_seconds"] <= 0:
+                continue
+            ratio = results[stage]["wall_seconds"] / base["wall_seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append((case, stage, base["wall_seconds"], results[stage]["wall_seconds"], ratio))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="가짜 LLM 백엔드 기반 파이프라인 벤치마크")
+    parser.add_argument("--sizes", default="small,medium", help=f"문서 크기 (쉼표 구분, {', '.join(SIZES)})")
+    parser.add_argument("--languages", default="ko,en", help="문서 언어 (쉼표 구분, ko/en)")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (단계별 중앙값 사용)")
+    parser.add_argument("--small-latency", default="lognormal:0.6,0.3", help="소형 모델 지연 시간 분포")
+    parser.add_argument("--large-latency", default="lognormal:2.5,0.3", help="대형 모델 지연 시간 분포")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="스로틀링 오류 비율")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="일시적 오류(ServiceUnavailable) 비율")
+    parser.add_argument("--important-ratio", type=float, default=0.3, help="중요도 4 이상 문장 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json-out", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단할 경과 시간 증가 비율")
+    args = parser.parse_args()
+
+    client_args = {
+        "small_latency": args.small_latency,
+        "large_latency": args.large_latency,
+        "throttle_rate": args.throttle_rate,
+        "error_rate": args.error_rate,
+        "important_ratio": args.important_ratio,
+        "seed": args.seed,
+    }
+
+    report = {}
+    for size in args.sizes.split(","):
+        for language in args.languages.split(","):
+            case = f"{language}-{size}"
+            text = make_corpus(language, SIZES[size], args.seed)
+            runs = [run_case(text, client_args) for _ in range(args.repeat)]
+            report[case] = median_results(runs)
+            print(f"{case}: {len(text)}자, 문장 {report[case]['sentences']}개", file=sys.stderr)
+
+    print_report(report)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for case, stage, before, after, ratio in regressions:
+            print(f"회귀: {case} {stage} {before:.3f}s → {after:.3f}s (x{ratio:.2f})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
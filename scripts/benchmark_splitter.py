@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+문장 분할 엔진(text_splitter._split_by_rules)과 블록 정규화(_normalize_block, StreamingNormalizer)의
+처리 시간을 측정하고, 기존 구현과 결과가 같은지 확인한다.
+
+기존 구현(문자 단위 순회, 후보마다 나머지 본문을 잘라 글머리 패턴 매칭)은 tests/baseline_splitter.py에
+그대로 두고 기준으로 사용한다. 합성 약관(일반/글머리 위주, 한국어/영어)과 지정한 샘플 파일에 대해
+두 구현의 분할 결과를 비교해, 하나라도 다르면 종료 코드 1을 반환한다.
+기존 구현은 긴 문서에서 매우 느리므로 --reference-max-bytes 이하 문서에서만 비교한다.
+
+정규화는 모든 문서(html로 감싼 변형 포함)에 대해 기존 구현(tests/baseline_normalizer.py)과 글자 단위로 같은지,
+임의 크기 조각으로 나눠 넣은 스트리밍 결과와 한글/로마자 개수도 같은지 확인하며,
+엔티티/태그/공백이 뒤섞인 짧은 임의 문자열(--fuzz)로도 비교한다.
+--memory를 지정하면 기존 정규화와 스트리밍 정규화의 최대 메모리 사용량(tracemalloc)을 함께 출력한다.
+
+사용 예:
+    python scripts/benchmark_splitter.py
+    python scripts/benchmark_splitter.py --sizes-mb 1,5,10 --reference-max-bytes 300000
+    python scripts/benchmark_splitter.py samples/ --sizes-mb 1
+    python scripts/benchmark_splitter.py --sizes-mb 10 --memory
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+from typing import List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+sys.path.insert(1, os.path.join(REPO_ROOT, "tests"))
+
+import text_splitter  # noqa: E402
+from baseline_normalizer import reference_counts, reference_normalize_block  # noqa: E402
+from baseline_splitter import reference_split  # noqa: E402
+from benchmark_pipeline import make_corpus  # noqa: E402
+
+
+# ---- 측정 ----
+
+_BULLETS = ["- ", "• ", "1. ", "2) ", "가. ", "나) ", "※ ", "a) "]
+
+
+def make_bullet_corpus(language: str, articles: int) -> str:
+    """줄마다 글머리로 시작하는 약관 (줄바꿈/글머리 후보가 많은 경우)."""
+    lines = []
+    for idx, line in enumerate(make_corpus(language, articles).splitlines()):
+        for part in re.split(r"(?<=[.!?])\s+", line):
+            lines.append(_BULLETS[idx % len(_BULLETS)] + part)
+    return "\n".join(lines)
+
+
+def make_html_corpus(language: str, articles: int) -> str:
+    """trafilatura html 출력처럼 문단/줄바꿈 태그, 엔티티, 들여쓰기, 굽은 따옴표가 섞인 약관."""
+    rng = random.Random(articles)
+    lines = []
+    for line in make_corpus(language, articles).splitlines():
+        line = line.replace(" ", rng.choice([" ", "&nbsp;", " \t", "  "]), 2).replace('"', "“", 1)
+        lines.append(rng.choice(["<p>{}</p>", "<li>{}<br/></li>", "\t<p class=\"c\">{} &amp; {}</p>\n\n\n"]).format(line, line))
+    return "<div>\n" + "\n".join(lines) + "\n</div>"
+
+
+_FUZZ_ALPHABET = list("ab가Z \t\r\f\v\n\n<>/“”‘’\u00a0\u3000") + [
+    "&amp;", "&lt;", "&gt;", "&nbsp;", "&#65;", "&#x4a;", "&amp", "&ampx;", "<br>", "<BR />", "< br/>", "<a href=x>",
+]
+
+
+def stream_normalize(text: str, rng: random.Random, max_chunk: int) -> Tuple[str, int, int]:
+    normalizer = text_splitter.StreamingNormalizer()
+    pieces = []
+    start = 0
+    while start < len(text):
+        size = rng.randint(1, max_chunk)
+        pieces.append(normalizer.feed(text[start:start + size]))
+        start += size
+    pieces.append(normalizer.close())
+    return "".join(pieces), normalizer.hangul, normalizer.latin
+
+
+def check_normalizer(text: str, rng: random.Random, max_chunk: int) -> bool:
+    """한 번에/조각 단위 정규화 결과와 문자 개수가 기존 구현과 같은지 확인한다."""
+    expected = reference_normalize_block(text)
+    streamed, hangul, latin = stream_normalize(text, rng, max_chunk)
+    return (
+        text_splitter._normalize_block(text) == expected
+        and streamed == expected
+        and (hangul, latin) == reference_counts(expected)
+    )
+
+
+def fuzz_normalizer(count: int, seed: int = 0) -> int:
+    """짧은 임의 문자열로 정규화를 비교해 결과가 다른 개수를 반환한다."""
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(count):
+        text = "".join(rng.choice(_FUZZ_ALPHABET) for _ in range(rng.randint(0, 40)))
+        if not check_normalizer(text, rng, 8):
+            mismatches += 1
+            print(f"정규화 결과가 다른 입력: {text!r}")
+    return mismatches
+
+
+def peak_memory(fn, *args) -> int:
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scale_to(text: str, size_bytes: int) -> str:
+    """text를 반복해 대략 size_bytes(UTF-8) 크기로 만든다."""
+    unit = len(text.encode("utf-8")) or 1
+    return "\n".join([text] * max(1, -(-size_bytes // unit)))
+
+
+def load_samples(paths) -> List[Tuple[str, str]]:
+    samples = []
+    for path in paths:
+        files = sorted(os.path.join(path, name) for name in os.listdir(path)) if os.path.isdir(path) else [path]
+        for file_path in files:
+            with open(file_path, encoding="utf-8") as f:
+                text = f.read()
+            if file_path.endswith((".html", ".htm")):
+                import trafilatura
+                text = trafilatura.extract(text, output_format="html") or ""
+            samples.append((os.path.basename(file_path), text))
+    return samples
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="문장 분할 엔진 성능 측정 및 기존 구현과의 결과 비교")
+    parser.add_argument("paths", nargs="*", help="추가로 비교할 샘플 약관 파일 또는 디렉터리")
+    parser.add_argument("--sizes-mb", default="1,2,5,10", help="합성 문서 크기(MB, 쉼표 구분)")
+    parser.add_argument("--reference-max-bytes", type=int, default=200_000, help="기존 구현과 비교할 최대 문서 크기")
+    parser.add_argument("--fuzz", type=int, default=20_000, help="정규화를 비교할 임의 문자열 수")
+    parser.add_argument("--memory", action="store_true", help="정규화 최대 메모리 사용량 측정 (느림)")
+    args = parser.parse_args()
+
+    documents = []
+    for language in ("ko", "en"):
+        documents.append((f"{language}-plain", make_corpus(language, 200)))
+        documents.append((f"{language}-bullets", make_bullet_corpus(language, 200)))
+        documents.append((f"{language}-html", make_html_corpus(language, 200)))
+    documents.extend(load_samples(args.paths))
+
+    mismatches = 0
+    rng = random.Random(0)
+    print(
+        f"{'문서':<24} {'크기(KB)':>9} {'문장 수':>8} {'분할(s)':>8} {'기존(s)':>8} {'일치':>4}"
+        f" {'정규화(s)':>9} {'기존(s)':>8} {'일치':>4}"
+    )
+    cases = [(name, text) for name, text in documents]
+    for size_mb in (float(value) for value in args.sizes_mb.split(",")):
+        for name, text in documents[:6]:
+            cases.append((f"{name}-{size_mb:g}MB", scale_to(text, int(size_mb * 1024 * 1024))))
+
+    for name, text in cases:
+        (normalized, hangul, latin), normalize_elapsed = timed(text_splitter._normalize_with_counts, text)
+        expected_normalized, reference_normalize_elapsed = timed(reference_normalize_block, text)
+        normalized_same = normalized == expected_normalized and check_normalizer(text, rng, 1 << 16)
+        mismatches += not normalized_same
+
+        language = "ko" if text_splitter._is_korean_counts(hangul, latin) else "en"
+        sentences, elapsed = timed(text_splitter._split_by_rules, normalized, language)
+        line = f"{name:<24} {len(normalized.encode('utf-8')) // 1024:>9} {len(sentences):>8} {elapsed:>8.3f}"
+        if len(normalized.encode("utf-8")) <= args.reference_max_bytes:
+            expected, reference_elapsed = timed(reference_split, normalized, language)
+            same = expected == sentences
+            mismatches += not same
+            line += f" {reference_elapsed:>8.3f} {'예' if same else '아니오':>4}"
+        else:
+            line += f" {'-':>8} {'-':>4}"
+        line += f" {normalize_elapsed:>9.3f} {reference_normalize_elapsed:>8.3f} {'예' if normalized_same else '아니오':>4}"
+        if args.memory:
+            reference_peak = peak_memory(reference_normalize_block, text)
+            streaming_peak = peak_memory(text_splitter._normalize_with_counts, text)
+            line += f"  메모리 기존 {reference_peak // 1024}KB / 스트리밍 {streaming_peak // 1024}KB"
+        print(line)
+
+    fuzz_mismatches = fuzz_normalizer(args.fuzz)
+    print(f"임의 문자열 {args.fuzz}개 정규화 비교: 불일치 {fuzz_mismatches}")
+    mismatches += fuzz_mismatches
+
+    if mismatches:
+        print(f"기존 구현과 결과가 다른 문서: {mismatches}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
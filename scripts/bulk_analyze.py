@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+저장된 약관 여러 건을 Bedrock 배치 추론으로 한꺼번에 다시 분석한다.
+
+입력은 약관 파일(텍스트/HTML)이나 디렉터리, 또는 한 줄에 {"url": ..., "content": ...}인 JSONL이다.
+단계(점수화 → 분류 → 요약 → 평가)마다 모든 문서의 요청을 배치 추론 작업 하나로 제출하고,
+결과를 문서별로 한 줄씩 출력 JSONL({"url", "result"})에 기록한다.
+작업 디렉터리에 남은 단계 출력(<단계>.<입력 해시>.jsonl.out)은 입력이 같으면 재실행 시 그대로 사용하므로,
+중간에 중단돼도 같은 --work-dir로 다시 실행하면 끝난 단계는 건너뛴다.
+
+--backend local은 같은 입력/출력 파일을 온라인 호출로 채운다. (배치 작업 없이 흐름 확인용)
+
+사용 예:
+    python scripts/bulk_analyze.py tos.jsonl --out results.jsonl --work-dir bulk-2026-10 \\
+        --backend bedrock --bucket my-batch-bucket --role-arn arn:aws:iam::123456789012:role/BedrockBatch
+    python scripts/bulk_analyze.py samples/ --out results.jsonl --work-dir /tmp/bulk --backend local
+"""
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from bulk_analysis import BedrockBatchBackend, LocalBatchBackend, run_bulk  # noqa: E402
+from llm_client import LLMClient  # noqa: E402
+from tos_processing import SENTENCE_ANALYSIS_MODE  # noqa: E402
+
+
+def load_documents(paths):
+    """{ 문서 id(url 또는 파일 경로): 약관 본문 }"""
+    documents = {}
+    for path in paths:
+        if path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        documents[record["url"]] = record["content"]
+            continue
+        files = sorted(os.path.join(path, name) for name in os.listdir(path)) if os.path.isdir(path) else [path]
+        for file_path in files:
+            with open(file_path, encoding="utf-8") as f:
+                text = f.read()
+            if file_path.endswith((".html", ".htm")):
+                import trafilatura
+                text = trafilatura.extract(text) or ""
+            documents[file_path] = text
+    return documents
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bedrock 배치 추론 기반 약관 대량 분석")
+    parser.add_argument("paths", nargs="+", help="약관 파일/디렉터리 또는 {url, content} JSONL")
+    parser.add_argument("--out", required=True, help="결과 JSONL 경로")
+    parser.add_argument("--work-dir", required=True, help="단계별 배치 입력/출력 파일을 둘 디렉터리")
+    parser.add_argument("--backend", choices=("bedrock", "local"), default="bedrock")
+    parser.add_argument("--bucket", help="배치 입력/출력을 둘 S3 버킷 (bedrock 백엔드)")
+    parser.add_argument("--role-arn", help="Bedrock 배치 추론 서비스 역할 ARN (bedrock 백엔드)")
+    parser.add_argument("--prefix", default="bulk", help="S3 키 접두사")
+    parser.add_argument("--poll-seconds", type=int, default=60, help="작업 상태 확인 간격")
+    parser.add_argument("--mode", default=SENTENCE_ANALYSIS_MODE, choices=("separate", "fused"))
+    args = parser.parse_args()
+
+    documents = load_documents(args.paths)
+    print(f"문서 수: {len(documents)}")
+
+    client = LLMClient(temperature=0)
+    local = LocalBatchBackend(args.work_dir, client=client)
+    if args.backend == "bedrock":
+        if not args.bucket or not args.role_arn:
+            parser.error("bedrock 백엔드는 --bucket과 --role-arn이 필요합니다.")
+        backend = BedrockBatchBackend(
+            args.bucket, args.role_arn, args.work_dir,
+            prefix=args.prefix, poll_seconds=args.poll_seconds, fallback=local,
+        )
+    else:
+        backend = local
+
+    results = run_bulk(documents, backend, client.small_model_id, client.large_model_id, mode=args.mode)
+    with open(args.out, "w", encoding="utf-8") as f:
+        for url, result in results.items():
+            f.write(json.dumps({"url": url, "result": result}, ensure_ascii=False) + "\n")
+    print(f"결과 {len(results)}건 저장: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
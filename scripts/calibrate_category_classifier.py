@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+로컬 카테고리 분류기를 과거 모델 분류 결과에 맞춰 보정한다.
+
+라벨 파일(JSONL, 한 줄에 {"sentence": ..., "category": ...})을 기준으로
+신뢰도 기준값마다 로컬 분류 비율(coverage)과 모델 라벨과의 일치율(accuracy)을 출력하고,
+목표 일치율을 만족하는 가장 낮은 기준값을 추천한다.
+--fit-out을 지정하면 라벨에서 어휘별 카테고리 가중치를 다시 계산해 JSON으로 저장한다.
+(TERMLENS_CATEGORY_WEIGHTS로 지정해 사용)
+
+라벨 파일이 없으면 --collect로 샘플 약관을 실제 모델로 분류해 만들 수 있다.
+
+사용 예:
+    python scripts/calibrate_category_classifier.py --collect samples/ --labels labels.jsonl
+    python scripts/calibrate_category_classifier.py --labels labels.jsonl --target-accuracy 0.95
+    python scripts/calibrate_category_classifier.py --labels labels.jsonl --fit-out weights.json
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from category_classifier import (  # noqa: E402
+    DEFAULT_KEYWORD_WEIGHTS,
+    MIN_SCORE,
+    KeywordCategoryClassifier,
+    load_keyword_weights,
+    normalize_keyword,
+)
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def collect_labels(paths, labels_path):
+    """샘플 약관을 문장으로 나눠 모델로 분류하고 라벨 파일로 저장한다."""
+    from llm_client import LLMClient
+    from text_splitter import split_sentences_block
+    from tos_processing import categorize_sentences
+
+    sentences = []
+    for path in paths:
+        names = sorted(os.listdir(path)) if os.path.isdir(path) else [None]
+        for name in names:
+            file_path = os.path.join(path, name) if name else path
+            with open(file_path, encoding="utf-8") as f:
+                text = f.read()
+            if file_path.endswith((".html", ".htm")):
+                import trafilatura
+                text = trafilatura.extract(text) or ""
+            sentences.extend(s.sentence for s in split_sentences_block(text) if len(s) > 10)
+
+    items = [{"id": idx, "sentence": sentence} for idx, sentence in enumerate(sentences)]
+    results = categorize_sentences(items, LLMClient(temperature=0))
+    with open(labels_path, "w", encoding="utf-8") as f:
+        for result in results:
+            sentence = sentences[result["id"]]
+            f.write(json.dumps({"sentence": sentence, "category": result["category"]}, ensure_ascii=False) + "\n")
+    print(f"라벨 {len(results)}개 저장: {labels_path}")
+
+
+def load_labels(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(classifier, labels):
+    """기준값별 (coverage, accuracy, 카테고리별 오분류 수)."""
+    predictions = [classifier.predict(label["sentence"]) for label in labels]
+    rows = []
+    for threshold in THRESHOLDS:
+        covered = correct = 0
+        confusions = Counter()
+        for (category, confidence), label in zip(predictions, labels):
+            if category is None or confidence < threshold:
+                continue
+            covered += 1
+            if category == label["category"]:
+                correct += 1
+            else:
+                confusions[(label["category"], category)] += 1
+        rows.append((threshold, covered / max(len(labels), 1), correct / covered if covered else 0.0, confusions))
+    return rows
+
+
+def fit_weights(labels, base_weights, smoothing=0.5):
+    """
+    어휘가 등장한 문장 중 각 카테고리로 분류된 비율을 기존 가중치에 곱해 다시 계산한다.
+    (다른 카테고리로 자주 분류된 어휘는 그 카테고리의 가중치로 옮겨 간다)
+    라벨에 등장하지 않은 어휘는 기존 가중치를 유지한다.
+    """
+    classifier = KeywordCategoryClassifier(base_weights)
+    categories = list(base_weights)
+    keyword_counts = defaultdict(Counter)
+    for label in labels:
+        for keyword in set(classifier.matched_keywords(label["sentence"])):
+            keyword_counts[keyword][label["category"]] += 1
+
+    fitted = {category: {} for category in categories}
+    for category, weights in base_weights.items():
+        for keyword, weight in weights.items():
+            counts = keyword_counts.get(normalize_keyword(keyword))
+            if not counts:
+                fitted[category][keyword] = weight
+                continue
+            total = sum(counts.values())
+            for label_category, count in counts.items():
+                if label_category not in fitted:
+                    continue
+                value = weight * (count + smoothing) / (total + smoothing)
+                if value >= 0.5:
+                    fitted[label_category][keyword] = round(max(value, fitted[label_category].get(keyword, 0)), 2)
+    return fitted
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="로컬 카테고리 분류기 보정")
+    parser.add_argument("--labels", required=True, help="라벨 파일(JSONL) 경로")
+    parser.add_argument("--collect", nargs="+", help="샘플 약관 파일/디렉터리를 모델로 분류해 라벨 파일 생성")
+    parser.add_argument("--weights", help="평가할 가중치 JSON (기본: 내장 가중치)")
+    parser.add_argument("--target-accuracy", type=float, default=0.95, help="추천 기준값을 고를 목표 일치율")
+    parser.add_argument("--fit-out", help="라벨로 다시 계산한 가중치를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    if args.collect:
+        collect_labels(args.collect, args.labels)
+
+    labels = load_labels(args.labels)
+    weights = load_keyword_weights(args.weights) if args.weights else DEFAULT_KEYWORD_WEIGHTS
+    if args.fit_out:
+        weights = fit_weights(labels, weights)
+        with open(args.fit_out, "w", encoding="utf-8") as f:
+            json.dump(weights, f, ensure_ascii=False, indent=2)
+        print(f"보정된 가중치 저장: {args.fit_out}")
+
+    classifier = KeywordCategoryClassifier(weights, min_score=MIN_SCORE)
+    print(f"라벨 수: {len(labels)}")
+    print(f"{'기준값':>6} {'로컬 분류 비율':>12} {'일치율':>8}  주요 오분류(모델 → 로컬)")
+    recommended = None
+    for threshold, coverage, accuracy, confusions in evaluate(classifier, labels):
+        top = ", ".join(f"{a}→{b} {n}" for (a, b), n in confusions.most_common(2))
+        print(f"{threshold:>6.1f} {coverage:>12.1%} {accuracy:>8.1%}  {top}")
+        if recommended is None and coverage > 0 and accuracy >= args.target_accuracy:
+            recommended = threshold
+
+    if recommended is None:
+        print(f"일치율 {args.target_accuracy:.0%}를 만족하는 기준값이 없습니다.")
+    else:
+        print(f"추천 기준값: TERMLENS_CATEGORY_CONFIDENCE={recommended}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
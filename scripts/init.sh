@@ -6,8 +6,17 @@
 ROLE_ARN="arn:aws:iam::010928200297:role/service-role/analyzeTermsOfServices-role-17yqexfq"
 REGION="ap-northeast-2"
 LAMBDA_NAME="analyzeTermsOfServices"
+WORKER_LAMBDA_NAME="analyzeTermsOfServicesWorker"
 BUCKET_NAME="termlens-tos-content"
 TABLE_NAME="termlens-tos-analysis"
+SENTENCE_TABLE_NAME="termlens-sentence-results"
+CHECKPOINT_TABLE_NAME="termlens-tos-checkpoints"
+JOB_QUEUE_NAME="termlens-tos-jobs"
+JOB_DLQ_NAME="termlens-tos-jobs-dlq"
+# 작업 최대 시도 횟수 (async_jobs.JOB_MAX_ATTEMPTS / TERMLENS_JOB_MAX_ATTEMPTS와 같게 유지)
+JOB_MAX_RECEIVE_COUNT=3
+LEASE_TABLE_NAME="termlens-tos-leases"
+RESPONSE_CACHE_TABLE_NAME="termlens-llm-responses"
 
 # 1. Lambda Function
 echo "[INFO] Checking Lambda Function..."
@@ -51,4 +60,130 @@ else
         --region "$REGION"
 fi
 
+# 4. DynamoDB Table (문장 단위 분석 결과 저장소)
+echo "[INFO] Checking Sentence Result Table..."
+if aws dynamodb describe-table --table-name "$SENTENCE_TABLE_NAME" --region "$REGION" > /dev/null 2>&1; then
+    echo "[INFO] DynamoDB table '$SENTENCE_TABLE_NAME' already exists. Skipping creation."
+else
+    echo "[INFO] Creating Sentence Result Table..."
+    aws dynamodb create-table \
+        --table-name "$SENTENCE_TABLE_NAME" \
+        --key-schema AttributeName=sentence_key,KeyType=HASH \
+        --attribute-definitions AttributeName=sentence_key,AttributeType=S \
+        --billing-mode PAY_PER_REQUEST \
+        --region "$REGION"
+fi
+
+# 5. DynamoDB Table (파이프라인 단계별 체크포인트, expires_at TTL)
+echo "[INFO] Checking Checkpoint Table..."
+if aws dynamodb describe-table --table-name "$CHECKPOINT_TABLE_NAME" --region "$REGION" > /dev/null 2>&1; then
+    echo "[INFO] DynamoDB table '$CHECKPOINT_TABLE_NAME' already exists. Skipping creation."
+else
+    echo "[INFO] Creating Checkpoint Table..."
+    aws dynamodb create-table \
+        --table-name "$CHECKPOINT_TABLE_NAME" \
+        --key-schema AttributeName=checkpoint_id,KeyType=HASH \
+        --attribute-definitions AttributeName=checkpoint_id,AttributeType=S \
+        --billing-mode PAY_PER_REQUEST \
+        --region "$REGION"
+    aws dynamodb wait table-exists --table-name "$CHECKPOINT_TABLE_NAME" --region "$REGION"
+    aws dynamodb update-time-to-live \
+        --table-name "$CHECKPOINT_TABLE_NAME" \
+        --time-to-live-specification "Enabled=true, AttributeName=expires_at" \
+        --region "$REGION"
+fi
+
+# 6. SQS Queue (비동기 분석 작업 큐, 가시성 타임아웃은 워커 타임아웃보다 길게)
+# 최대 시도 횟수만큼 실패한 메시지는 DLQ(보관 14일)로 옮겨 원인 확인 후 다시 보낼 수 있게 한다.
+echo "[INFO] Checking Job Dead-Letter Queue..."
+if DLQ_URL=$(aws sqs get-queue-url --queue-name "$JOB_DLQ_NAME" --region "$REGION" --query QueueUrl --output text 2> /dev/null); then
+    echo "[INFO] SQS queue '$JOB_DLQ_NAME' already exists. Skipping creation."
+else
+    echo "[INFO] Creating Job Dead-Letter Queue..."
+    DLQ_URL=$(aws sqs create-queue \
+        --queue-name "$JOB_DLQ_NAME" \
+        --attributes MessageRetentionPeriod=1209600 \
+        --region "$REGION" \
+        --query QueueUrl --output text)
+fi
+DLQ_ARN=$(aws sqs get-queue-attributes --queue-url "$DLQ_URL" --attribute-names QueueArn --region "$REGION" --query Attributes.QueueArn --output text)
+REDRIVE_POLICY="{\\\"deadLetterTargetArn\\\":\\\"$DLQ_ARN\\\",\\\"maxReceiveCount\\\":\\\"$JOB_MAX_RECEIVE_COUNT\\\"}"
+
+echo "[INFO] Checking Job Queue..."
+if QUEUE_URL=$(aws sqs get-queue-url --queue-name "$JOB_QUEUE_NAME" --region "$REGION" --query QueueUrl --output text 2> /dev/null); then
+    echo "[INFO] SQS queue '$JOB_QUEUE_NAME' already exists. Updating redrive policy."
+    aws sqs set-queue-attributes \
+        --queue-url "$QUEUE_URL" \
+        --attributes "{\"RedrivePolicy\":\"$REDRIVE_POLICY\"}" \
+        --region "$REGION"
+else
+    echo "[INFO] Creating Job Queue..."
+    QUEUE_URL=$(aws sqs create-queue \
+        --queue-name "$JOB_QUEUE_NAME" \
+        --attributes "{\"VisibilityTimeout\":\"720\",\"RedrivePolicy\":\"$REDRIVE_POLICY\"}" \
+        --region "$REGION" \
+        --query QueueUrl --output text)
+fi
+QUEUE_ARN=$(aws sqs get-queue-attributes --queue-url "$QUEUE_URL" --attribute-names QueueArn --region "$REGION" --query Attributes.QueueArn --output text)
+
+# 7. Worker Lambda Function (SQS 트리거로 비동기 작업 처리)
+echo "[INFO] Checking Worker Lambda Function..."
+if aws lambda get-function --function-name "$WORKER_LAMBDA_NAME" --region "$REGION" > /dev/null 2>&1; then
+    echo "[INFO] Lambda function '$WORKER_LAMBDA_NAME' already exists. Skipping creation."
+else
+    echo "[INFO] Creating Worker Lambda Function..."
+    aws lambda create-function \
+        --function-name "$WORKER_LAMBDA_NAME" \
+        --runtime python3.12 \
+        --timeout 120 \
+        --zip-file fileb://deploy-package.zip \
+        --handler lambda_function.job_worker_handler \
+        --role "$ROLE_ARN" \
+        --region "$REGION"
+    aws lambda create-event-source-mapping \
+        --function-name "$WORKER_LAMBDA_NAME" \
+        --event-source-arn "$QUEUE_ARN" \
+        --batch-size 1 \
+        --function-response-types ReportBatchItemFailures \
+        --region "$REGION"
+fi
+
+# 8. DynamoDB Table (동일 문서 중복 분석 방지용 임대, expires_at TTL)
+echo "[INFO] Checking Lease Table..."
+if aws dynamodb describe-table --table-name "$LEASE_TABLE_NAME" --region "$REGION" > /dev/null 2>&1; then
+    echo "[INFO] DynamoDB table '$LEASE_TABLE_NAME' already exists. Skipping creation."
+else
+    echo "[INFO] Creating Lease Table..."
+    aws dynamodb create-table \
+        --table-name "$LEASE_TABLE_NAME" \
+        --key-schema AttributeName=lease_key,KeyType=HASH \
+        --attribute-definitions AttributeName=lease_key,AttributeType=S \
+        --billing-mode PAY_PER_REQUEST \
+        --region "$REGION"
+    aws dynamodb wait table-exists --table-name "$LEASE_TABLE_NAME" --region "$REGION"
+    aws dynamodb update-time-to-live \
+        --table-name "$LEASE_TABLE_NAME" \
+        --time-to-live-specification "Enabled=true, AttributeName=expires_at" \
+        --region "$REGION"
+fi
+
+# 9. DynamoDB Table (LLM 응답 캐시, expires_at TTL)
+echo "[INFO] Checking Response Cache Table..."
+if aws dynamodb describe-table --table-name "$RESPONSE_CACHE_TABLE_NAME" --region "$REGION" > /dev/null 2>&1; then
+    echo "[INFO] DynamoDB table '$RESPONSE_CACHE_TABLE_NAME' already exists. Skipping creation."
+else
+    echo "[INFO] Creating Response Cache Table..."
+    aws dynamodb create-table \
+        --table-name "$RESPONSE_CACHE_TABLE_NAME" \
+        --key-schema AttributeName=cache_key,KeyType=HASH \
+        --attribute-definitions AttributeName=cache_key,AttributeType=S \
+        --billing-mode PAY_PER_REQUEST \
+        --region "$REGION"
+    aws dynamodb wait table-exists --table-name "$RESPONSE_CACHE_TABLE_NAME" --region "$REGION"
+    aws dynamodb update-time-to-live \
+        --table-name "$RESPONSE_CACHE_TABLE_NAME" \
+        --time-to-live-specification "Enabled=true, AttributeName=expires_at" \
+        --region "$REGION"
+fi
+
 echo "[SUCCESS] Initialization complete."
@@ -7,6 +7,7 @@ docker run --platform linux/amd64 --rm \
   /bin/sh -c "
     pip install -r requirements.txt -t build/ --upgrade && \
     cp src/*.py build/ && \
+    python scripts/profile_imports.py --path build --budget-ms 200 --forbid trafilatura --forbid boto3 && \
     cd build && \
     dnf install -y zip && \
     zip -r ../deploy-package.zip . && \
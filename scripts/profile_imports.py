@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Lambda 핸들러 모듈의 콜드 임포트 시간을 측정한다.
+
+새 파이썬 프로세스에서 `-X importtime`으로 모듈을 임포트하고,
+최상위 패키지별 누적 임포트 시간을 정리해 출력한다.
+--budget-ms를 지정하면 총 임포트 시간이 예산을 넘거나,
+--forbid로 지정한 모듈이 임포트될 경우 종료 코드 1을 반환한다.
+
+사용 예:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --path build --budget-ms 300 --forbid trafilatura --forbid boto3
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 예) "import time:       123 |        456 |   json.decoder"
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str, path: str):
+    """(모듈 이름, 자체 시간 us, 누적 시간 us, 깊이) 목록을 반환한다."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [path, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"모듈 임포트 실패: {module}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        # importtime 출력은 중첩 깊이마다 공백 2칸씩 들여쓴다.
+        depth = (len(indent) - 1) // 2
+        entries.append((name, int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="핸들러 콜드 임포트 시간 측정")
+    parser.add_argument("--module", default="lambda_function", help="측정할 모듈 (기본: lambda_function)")
+    parser.add_argument("--path", default=os.path.join(REPO_ROOT, "src"), help="모듈 검색 경로 (기본: src)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 패키지 개수")
+    parser.add_argument("--budget-ms", type=float, default=None, help="총 임포트 시간 예산(ms)")
+    parser.add_argument("--forbid", action="append", default=[], help="콜드 임포트 시 불러오면 안 되는 패키지")
+    args = parser.parse_args()
+
+    entries = measure(args.module, args.path)
+
+    # 최상위 패키지별 자체 시간 합계
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    target = next((e for e in entries if e[0] == args.module and e[3] == 0), None)
+    total_ms = (target[2] if target else sum(by_package.values())) / 1000
+
+    print(f"[{args.module}] 콜드 임포트 누적 시간: {total_ms:.1f} ms")
+    print(f"{'package':<32}{'self(ms)':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda x: x[1], reverse=True)[: args.top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}")
+
+    failed = False
+    imported = set(by_package)
+    for package in args.forbid:
+        if package in imported:
+            print(f"[FAIL] 콜드 임포트 중 '{package}'이(가) 로드되었습니다.")
+            failed = True
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"[FAIL] 임포트 시간 {total_ms:.1f} ms가 예산 {args.budget_ms:.1f} ms를 초과했습니다.")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
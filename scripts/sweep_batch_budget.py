@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+문장 분석 배치의 토큰 예산별 호출 수/토큰 수/지연 시간을 비교한다.
+
+샘플 약관(텍스트/HTML 파일 또는 디렉터리)을 문장 단위로 분할한 뒤,
+예산마다 배치를 구성해 호출 수와 추정 입력 토큰(시스템 프롬프트 포함)을 출력한다.
+--live를 지정하면 실제 Bedrock을 호출해 지연 시간과 호출별 지연 분포, 응답 파싱 실패 수도 측정한다.
+결과를 보고 TERMLENS_BATCH_TOKEN_BUDGET / TERMLENS_BATCH_MAX_ITEMS 값을 정한다.
+
+사용 예:
+    python scripts/sweep_batch_budget.py samples/
+    python scripts/sweep_batch_budget.py samples/a.html --budgets 500,1000,2000,4000 --stage fused
+    python scripts/sweep_batch_budget.py samples/ --live --max-sentences 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+import tos_processing  # noqa: E402
+from text_splitter import split_sentences_block  # noqa: E402
+from token_budget import BATCH_MAX_ITEMS, batch_by_token_budget, estimate_tokens, item_tokens  # noqa: E402
+
+STAGES = {
+    "score": (tos_processing.SCORE_SYSTEM_INSTRUCTION, tos_processing._score_batch),
+    "categorize": (tos_processing.CATEGORIZE_SYSTEM_INSTRUCTION, tos_processing._categorize_batch),
+    "fused": (tos_processing.FUSED_SYSTEM_INSTRUCTION, tos_processing._score_and_categorize_batch),
+}
+
+
+class TimingClient:
+    """LLMClient를 감싸 호출별 지연 시간을 기록한다."""
+
+    def __init__(self, client):
+        self.client = client
+        self.small_model_id = client.small_model_id
+        self.large_model_id = client.large_model_id
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def generate_response(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self.client.generate_response(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - started)
+
+
+def load_sentences(paths, max_sentences):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)))
+        else:
+            files.append(path)
+
+    sentences = []
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if path.endswith((".html", ".htm")):
+            import trafilatura
+            text = trafilatura.extract(text) or ""
+        sentences.extend(s.sentence for s in split_sentences_block(text) if len(s) > 10)
+    return sentences[:max_sentences] if max_sentences else sentences
+
+
+def run_live(batch_fn, batches, client):
+    timing = TimingClient(client)
+    failures = 0
+    started = time.perf_counter()
+    for batch in batches:
+        try:
+            batch_fn(batch, timing)
+        except Exception as err:
+            # 출력이 잘리거나 JSON 파싱에 실패한 배치
+            failures += 1
+            print(f"  배치 실패 ({len(batch)}문장): {err}")
+    return time.perf_counter() - started, timing.latencies, failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="문장 분석 배치 토큰 예산 비교")
+    parser.add_argument("paths", nargs="+", help="샘플 약관 파일 또는 디렉터리")
+    parser.add_argument("--budgets", default="250,500,1000,1500,2500,4000", help="비교할 토큰 예산 (쉼표 구분)")
+    parser.add_argument("--max-items", type=int, default=BATCH_MAX_ITEMS, help="배치당 최대 문장 수")
+    parser.add_argument("--stage", choices=sorted(STAGES), default="score", help="측정할 단계")
+    parser.add_argument("--max-sentences", type=int, default=0, help="사용할 최대 문장 수 (0이면 전체)")
+    parser.add_argument("--live", action="store_true", help="실제 Bedrock 호출로 지연 시간 측정 (배치는 순차 실행)")
+    args = parser.parse_args()
+
+    sentences = load_sentences(args.paths, args.max_sentences)
+    items = [{"id": idx, "sentence": sentence} for idx, sentence in enumerate(sentences)]
+    system_instruction, batch_fn = STAGES[args.stage]
+    system_tokens = estimate_tokens(system_instruction)
+    print(f"문장 수: {len(items)}, 시스템 프롬프트 추정 토큰: {system_tokens}")
+
+    client = None
+    if args.live:
+        from llm_client import LLMClient
+        client = LLMClient(temperature=0)
+
+    header = f"{'예산':>6} {'호출':>6} {'평균 문장':>9} {'최대 토큰':>9} {'입력 토큰':>10}"
+    if args.live:
+        header += f" {'총 시간(s)':>10} {'p50(s)':>7} {'p95(s)':>7} {'실패':>4}"
+    print(header)
+
+    for budget in (int(value) for value in args.budgets.split(",")):
+        batches = batch_by_token_budget(items, budget, args.max_items)
+        batch_tokens = [sum(item_tokens(item) for item in batch) for batch in batches]
+        input_tokens = system_tokens * len(batches) + sum(batch_tokens)
+        line = (
+            f"{budget:>6} {len(batches):>6} {len(items) / max(len(batches), 1):>9.1f} "
+            f"{max(batch_tokens, default=0):>9} {input_tokens:>10}"
+        )
+        if args.live:
+            elapsed, latencies, failures = run_live(batch_fn, batches, client)
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+            p50 = statistics.median(latencies) if latencies else 0.0
+            line += f" {elapsed:>10.1f} {p50:>7.2f} {p95:>7.2f} {failures:>4}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,4 +6,9 @@ aws lambda update-function-code \
     --zip-file fileb://deploy-package.zip \
     --region ap-northeast-2
 
+aws lambda update-function-code \
+    --function-name analyzeTermsOfServicesWorker \
+    --zip-file fileb://deploy-package.zip \
+    --region ap-northeast-2
+
 echo "[SUCCESS] Update complete."
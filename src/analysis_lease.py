@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+
+# 동일 문서 버전(url_hash + content_hash)에 대한 중복 분석 방지용 임대(lease)
+# 임대를 획득한 호출 하나만 파이프라인을 실행하고, 나머지는 결과가 저장될 때까지 기다린다.
+# 임대는 만료 시각을 가지므로 보유한 호출이 비정상 종료되어도 일정 시간 후 다시 획득할 수 있다.
+
+
+class InMemoryLeaseStore:
+    """테스트/로컬 실행용 메모리 임대 저장소."""
+
+    def __init__(self):
+        self._leases: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        now = time.time()
+        with self._lock:
+            current = self._leases.get(key)
+            if current is not None and current[1] >= now:
+                return False
+            self._leases[key] = (owner, now + ttl_seconds)
+            return True
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            current = self._leases.get(key)
+            if current is not None and current[0] == owner:
+                del self._leases[key]
+
+
+class DynamoDBLeaseStore:
+    """
+    DynamoDB 조건부 쓰기 기반 임대 저장소.
+    테이블 키: lease_key (S), expires_at 속성을 TTL로 지정해 만료된 임대를 정리한다.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def acquire(self, key: str, owner: str, ttl_seconds: int) -> bool:
+        now = int(time.time())
+        try:
+            self.table.put_item(
+                Item={"lease_key": key, "owner": owner, "expires_at": now + ttl_seconds},
+                # 임대가 없거나 만료된 경우에만 기록
+                ConditionExpression="attribute_not_exists(lease_key) OR expires_at < :now",
+                ExpressionAttributeValues={":now": now},
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+        return True
+
+    def release(self, key: str, owner: str) -> None:
+        try:
+            self.table.delete_item(
+                Key={"lease_key": key},
+                # 만료 후 다른 호출이 다시 획득한 임대는 지우지 않음
+                ConditionExpression="#owner = :owner",
+                ExpressionAttributeNames={"#owner": "owner"},
+                ExpressionAttributeValues={":owner": owner},
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            pass
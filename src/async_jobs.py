@@ -0,0 +1,216 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+# 비동기 분석 작업
+# - 요청 본문은 객체 저장소(S3)에 저장하고, 작업 id만 큐(SQS)로 전달한다.
+# - 워커가 큐 메시지를 받아 파이프라인을 실행하고, 진행 상태와 결과를 객체 저장소에 기록한다.
+# - 로컬/테스트에서는 파일 시스템 저장소와 메모리 큐를 사용한다.
+# - 예외로 실패한 작업은 retrying 상태로 두고 큐가 다시 전달하게 하며, 마지막 시도에서도 실패하면 failed로 기록한다.
+#   SQS 큐의 재전송 정책(maxReceiveCount)을 JOB_MAX_ATTEMPTS와 같게 두면 마지막 실패 메시지는 DLQ로 옮겨진다.
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_RETRYING = "retrying"
+
+# 예외로 실패한 작업의 최대 시도 횟수 (scripts/init.sh의 maxReceiveCount와 같게 유지)
+JOB_MAX_ATTEMPTS = int(os.environ.get("TERMLENS_JOB_MAX_ATTEMPTS", "3"))
+
+
+def _content_key(job_id: str) -> str:
+    return f"jobs/{job_id}/content.html"
+
+
+def _status_key(job_id: str) -> str:
+    return f"jobs/{job_id}/status.json"
+
+
+def _result_key(job_id: str) -> str:
+    return f"jobs/{job_id}/result.json"
+
+
+class S3ObjectStorage:
+    """S3 버킷 기반 객체 저장소."""
+
+    def __init__(self, bucket: str, client=None):
+        self.bucket = bucket
+        if client is None:
+            import boto3
+            client = boto3.client("s3")
+        self.client = client
+
+    def put_text(self, key: str, text: str, content_type: str = "text/plain; charset=utf-8") -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=key, Body=text.encode("utf-8"), ContentType=content_type
+        )
+
+    def get_text(self, key: str) -> Optional[str]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read().decode("utf-8")
+
+
+class LocalObjectStorage:
+    """로컬 디렉터리 기반 객체 저장소 (S3 대체)."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, *key.split("/"))
+
+    def put_text(self, key: str, text: str, content_type: str = "text/plain; charset=utf-8") -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 읽는 쪽에서 쓰다 만 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def get_text(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class SQSJobQueue:
+    """SQS 기반 작업 큐."""
+
+    def __init__(self, queue_url: str, client=None):
+        self.queue_url = queue_url
+        if client is None:
+            import boto3
+            client = boto3.client("sqs")
+        self.client = client
+
+    def send(self, message: Dict) -> None:
+        self.client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(message))
+
+
+class InMemoryJobQueue:
+    """메모리 기반 작업 큐 (SQS 대체). drain()으로 쌓인 메시지를 처리한다."""
+
+    def __init__(self):
+        self._messages = deque()
+        self._lock = threading.Lock()
+
+    def send(self, message: Dict) -> None:
+        with self._lock:
+            self._messages.append(json.dumps(message))
+
+    def drain(self, worker: Callable[[Dict], bool]) -> int:
+        """쌓인 메시지를 순서대로 처리하고 처리한 메시지 수를 반환한다."""
+        processed = 0
+        while True:
+            with self._lock:
+                if not self._messages:
+                    return processed
+                body = self._messages.popleft()
+            worker(json.loads(body))
+            processed += 1
+
+
+def _write_status(storage, job_id: str, status: str, **fields) -> None:
+    record = {"job_id": job_id, "status": status, "updated_at": int(time.time()), **fields}
+    storage.put_text(_status_key(job_id), json.dumps(record, ensure_ascii=False), "application/json")
+
+
+def submit_job(url: str, body: str, storage, queue) -> str:
+    """약관 본문을 저장하고 분석 작업을 큐에 넣은 뒤 작업 id를 반환한다."""
+    job_id = uuid.uuid4().hex
+    storage.put_text(_content_key(job_id), body, "text/html; charset=utf-8")
+    _write_status(storage, job_id, JOB_QUEUED, url=url)
+    queue.send({"job_id": job_id, "url": url})
+    return job_id
+
+
+def get_job_status(job_id: str, storage) -> Optional[Dict]:
+    """작업 상태를 반환한다. 완료된 작업은 result 필드에 분석 결과를 포함한다."""
+    status_text = storage.get_text(_status_key(job_id))
+    if status_text is None:
+        return None
+
+    status = json.loads(status_text)
+    if status.get("status") == JOB_COMPLETED:
+        result_text = storage.get_text(_result_key(job_id))
+        if result_text is not None:
+            status["result"] = json.loads(result_text)
+    return status
+
+
+def process_job(message: Dict, storage, analyze: Callable[..., tuple], max_attempts: int = JOB_MAX_ATTEMPTS) -> bool:
+    """
+    큐 메시지 하나를 처리한다.
+    analyze(url, body, on_stage, on_clause)는 (상태 코드, 응답 dict)를 반환해야 한다.
+    카테고리 평가가 끝날 때마다 partial_results에 누적해 상태 조회 시 먼저 보여준다.
+    재시도해도 결과가 같은 실패는 failed 상태와 오류 메시지를 기록한다.
+    예외로 실패하면 message["attempt"](몇 번째 전달인지, 기본값 1)가 max_attempts보다 작을 때는 retrying,
+    마지막 시도면 failed를 기록한다. 큐가 메시지를 다시 전달하거나 DLQ로 옮겨야 하는 경우에만 False를 반환한다.
+    """
+    job_id = message["job_id"]
+    url = message["url"]
+    attempt = int(message.get("attempt", 1))
+
+    body = storage.get_text(_content_key(job_id))
+    if body is None:
+        _write_status(storage, job_id, JOB_FAILED, url=url, error="작업 본문을 찾을 수 없습니다.")
+        return True
+
+    progress = {"stage": "started", "partial_results": []}
+
+    def on_stage(stage: str) -> None:
+        progress["stage"] = stage
+        _write_status(storage, job_id, JOB_RUNNING, url=url, **progress)
+
+    def on_clause(clause: Dict) -> None:
+        progress["partial_results"].append(clause)
+        _write_status(storage, job_id, JOB_RUNNING, url=url, **progress)
+
+    on_stage("started")
+    try:
+        status_code, payload = analyze(url, body, on_stage=on_stage, on_clause=on_clause)
+    except Exception as err:
+        print(f"작업 {job_id} 처리 실패 ({attempt}/{max_attempts}회): {err}")
+        status = JOB_RETRYING if attempt < max_attempts else JOB_FAILED
+        _write_status(storage, job_id, status, url=url, error=str(err), attempt=attempt, max_attempts=max_attempts)
+        return False
+
+    # 같은 문서를 다른 호출이 분석 중이면 나중에 다시 시도
+    if status_code == 202:
+        _write_status(storage, job_id, JOB_QUEUED, url=url, stage="waiting")
+        return False
+
+    # 입력 오류 등 재시도해도 결과가 같은 실패
+    if status_code != 200:
+        _write_status(storage, job_id, JOB_FAILED, url=url, error=payload.get("error"))
+        return True
+
+    storage.put_text(_result_key(job_id), json.dumps(payload, ensure_ascii=False), "application/json")
+    _write_status(storage, job_id, JOB_COMPLETED, url=url)
+    return True
+
+
+def failed_message_ids(records: List[Dict], handle: Callable[[Dict], bool]) -> List[str]:
+    """
+    SQS 이벤트 레코드를 처리하고 재시도할 메시지 id 목록을 반환한다. (부분 배치 실패 응답용)
+    메시지의 전달 횟수(ApproximateReceiveCount)는 message["attempt"]로 넘긴다.
+    """
+    failures = []
+    for record in records:
+        message = json.loads(record["body"])
+        message.setdefault("attempt", int(record.get("attributes", {}).get("ApproximateReceiveCount", 1)))
+        if not handle(message):
+            failures.append(record["messageId"])
+    return failures
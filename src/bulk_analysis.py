@@ -0,0 +1,415 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from category_classifier import LOCAL_CATEGORIZER_ENABLED, get_classifier
+from json_utils import extract_json_fragment
+from runtime import get_executor
+from sentence_dedup import DEDUP_ENABLED, representatives
+from sentence_prefilter import PREFILTER_ENABLED, prefilter_records
+from sentence_record import SentenceRecord
+from text_splitter import split_sentences_block
+from token_budget import batch_by_token_budget
+from tos_evaluate import (
+    build_evaluation_message,
+    build_evaluation_result,
+    build_system_instruction_for_category,
+    clause_from_evaluation,
+)
+from tos_processing import (
+    CATEGORIZE_SYSTEM_INSTRUCTION,
+    FUSED_SYSTEM_INSTRUCTION,
+    SCORE_SYSTEM_INSTRUCTION,
+    SENTENCE_MODE_FUSED,
+    SENTENCE_MODE_SEPARATE,
+    build_sentence_batch_message,
+    parse_category_response,
+    parse_fused_response,
+    parse_score_response,
+)
+from tos_summarize import SUMMARY_SYSTEM_INSTRUCTION, build_summary_message, clean_summary, group_by_category
+
+
+# 대량 재분석 모드 (Bedrock 배치 추론)
+# 프롬프트 변경 후 저장된 약관 수천 건을 다시 평가할 때, 온라인 경로(converse) 대신
+# 단계마다 모든 문서의 요청을 하나의 배치 추론 입력(JSONL)으로 모아 한 번에 처리한다.
+# - 단계: 문장 분할(로컬) → 점수화 → 분류 → 카테고리별 요약 → 평가
+# - 요청마다 recordId를 붙이고, 출력 JSONL의 recordId로 결과를 문서/배치에 다시 연결한다.
+# - 백엔드: BedrockBatchBackend(S3 + 배치 추론 작업), LocalBatchBackend(같은 형식의 파일을 온라인 호출로 채움)
+# 단계 출력 파일(<단계>.<입력 해시>.jsonl.out)이 작업 디렉터리에 이미 있으면 다시 제출하지 않고 그대로 사용한다.
+# recordId는 단계 안의 순번이므로, 문서나 프롬프트가 바뀐 입력에 이전 출력을 잘못 연결하지 않도록 입력 JSONL의 해시로 구분한다.
+
+# Bedrock 배치 추론 작업의 최소 레코드 수. 이보다 적은 단계는 온라인 호출로 처리한다.
+BEDROCK_MIN_RECORDS = 100
+
+_RECORD_ID_PREFIX = "TL"
+
+
+def build_model_input(model_id: str, system_instruction: str, message: str, temperature: float = 0) -> Dict:
+    """모델 계열별 배치 추론 입력(modelInput) 본문."""
+    if model_id.startswith("openai"):
+        return {
+            "messages": [
+                {"role": "system", "content": system_instruction},
+                {"role": "user", "content": message},
+            ],
+            "temperature": temperature,
+        }
+    if "anthropic" in model_id:
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 4096,
+            "system": system_instruction,
+            "messages": [{"role": "user", "content": [{"type": "text", "text": message}]}],
+            "temperature": temperature,
+        }
+    return {
+        "schemaVersion": "messages-v1",
+        "system": [{"text": system_instruction}],
+        "messages": [{"role": "user", "content": [{"text": message}]}],
+        "inferenceConfig": {"temperature": temperature},
+    }
+
+
+def parse_model_output(model_id: str, model_output: Dict) -> str:
+    """배치 추론 출력(modelOutput)에서 응답 텍스트를 꺼낸다."""
+    if model_id.startswith("openai"):
+        return model_output["choices"][0]["message"]["content"]
+    if "anthropic" in model_id:
+        return model_output["content"][0]["text"]
+    return model_output["output"]["message"]["content"][0]["text"]
+
+
+def _model_output_from_text(model_id: str, text: str) -> Dict:
+    # LocalBatchBackend가 Bedrock 출력과 같은 형식으로 기록하기 위한 역변환
+    if model_id.startswith("openai"):
+        return {"choices": [{"message": {"role": "assistant", "content": text}}]}
+    if "anthropic" in model_id:
+        return {"content": [{"type": "text", "text": text}]}
+    return {"output": {"message": {"role": "assistant", "content": [{"text": text}]}}}
+
+
+def write_batch_input(path: str, model_id: str, requests: List[Dict], temperature: float = 0) -> None:
+    """requests([{ "recordId", "system", "message" }])를 배치 추론 입력 JSONL로 기록한다."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for request in requests:
+            record = {
+                "recordId": request["recordId"],
+                "modelInput": build_model_input(model_id, request["system"], request["message"], temperature),
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def stage_paths(work_dir: str, stage: str, model_id: str, requests: List[Dict], temperature: float = 0) -> Tuple[str, str]:
+    """
+    단계 입력 JSONL을 기록하고 (입력 경로, 출력 경로)를 반환한다.
+    출력 경로에는 모델 id와 입력 파일 내용의 해시가 들어가므로, 입력이 바뀌면 이전 출력을 재사용하지 않는다.
+    """
+    input_path = os.path.join(work_dir, f"{stage}.jsonl")
+    write_batch_input(input_path, model_id, requests, temperature)
+    digest = hashlib.sha256(model_id.encode("utf-8"))
+    with open(input_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return input_path, os.path.join(work_dir, f"{stage}.{digest.hexdigest()[:16]}.jsonl.out")
+
+
+def read_batch_output(path: str, model_id: str) -> Dict[str, str]:
+    """배치 추론 출력 JSONL을 { recordId: 응답 텍스트 }로 읽는다. 실패한 레코드는 제외한다."""
+    results: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "modelOutput" not in record:
+                print(f"배치 레코드 실패 {record.get('recordId')}: {record.get('error')}")
+                continue
+            results[record["recordId"]] = parse_model_output(model_id, record["modelOutput"])
+    return results
+
+
+class LocalBatchBackend:
+    """
+    배치 추론 대체 백엔드 (로컬/테스트).
+    입력 JSONL을 작업 디렉터리에 기록하고, 같은 요청을 온라인으로 호출해 Bedrock과 같은 형식의 출력 파일을 만든다.
+    같은 입력의 출력 파일이 이미 있으면 호출 없이 그 파일로 작업을 완료한다.
+    """
+
+    def __init__(self, work_dir: str, client=None, executor: Optional[Executor] = None, temperature: float = 0):
+        self.work_dir = work_dir
+        self.client = client
+        self.executor = executor
+        self.temperature = temperature
+
+    def run(self, stage: str, model_id: str, requests: List[Dict]) -> Dict[str, str]:
+        _, output_path = stage_paths(self.work_dir, stage, model_id, requests, self.temperature)
+        if not os.path.exists(output_path):
+            self._complete(model_id, requests, output_path)
+        return read_batch_output(output_path, model_id)
+
+    def _complete(self, model_id: str, requests: List[Dict], output_path: str) -> None:
+        if self.client is None:
+            from llm_client import LLMClient
+            self.client = LLMClient(temperature=self.temperature)
+
+        def call(request: Dict) -> Dict:
+            record = {
+                "recordId": request["recordId"],
+                "modelInput": build_model_input(model_id, request["system"], request["message"], self.temperature),
+            }
+            try:
+                text = self.client.generate_response(request["system"], request["message"], model_id=model_id)
+                record["modelOutput"] = _model_output_from_text(model_id, text)
+            except Exception as err:
+                record["error"] = str(err)
+            return record
+
+        executor = self.executor or get_executor()
+        records = list(executor.map(call, requests))
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, output_path)
+
+
+class BedrockBatchBackend:
+    """
+    Bedrock 배치 추론 백엔드.
+    입력 JSONL을 S3에 올리고 배치 추론 작업을 만든 뒤, 완료될 때까지 기다려 출력 파일을 내려받는다.
+    role_arn은 Bedrock이 버킷을 읽고 쓸 수 있는 서비스 역할이어야 한다.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        role_arn: str,
+        work_dir: str,
+        prefix: str = "bulk",
+        poll_seconds: int = 60,
+        fallback: Optional[LocalBatchBackend] = None,
+        bedrock=None,
+        s3=None,
+    ):
+        import boto3
+        self.bucket = bucket
+        self.role_arn = role_arn
+        self.work_dir = work_dir
+        self.prefix = f"{prefix}/{os.path.basename(os.path.abspath(work_dir))}"
+        self.poll_seconds = poll_seconds
+        # 최소 레코드 수보다 작은 단계를 처리할 온라인 백엔드
+        self.fallback = fallback or LocalBatchBackend(work_dir)
+        self.bedrock = bedrock or boto3.client("bedrock")
+        self.s3 = s3 or boto3.client("s3")
+
+    def run(self, stage: str, model_id: str, requests: List[Dict]) -> Dict[str, str]:
+        if len(requests) < BEDROCK_MIN_RECORDS:
+            print(f"[{stage}] 레코드 {len(requests)}개로 배치 추론 최소 수 미만 → 온라인 호출")
+            return self.fallback.run(stage, model_id, requests)
+        input_path, output_path = stage_paths(self.work_dir, stage, model_id, requests)
+        if os.path.exists(output_path):
+            return read_batch_output(output_path, model_id)
+
+        input_key = f"{self.prefix}/{stage}/input.jsonl"
+        output_prefix = f"{self.prefix}/{stage}/output/"
+        self.s3.upload_file(input_path, self.bucket, input_key)
+
+        job = self.bedrock.create_model_invocation_job(
+            jobName=f"termlens-{stage}-{uuid.uuid4().hex[:12]}",
+            roleArn=self.role_arn,
+            modelId=model_id,
+            inputDataConfig={"s3InputDataConfig": {"s3Uri": f"s3://{self.bucket}/{input_key}", "s3InputFormat": "JSONL"}},
+            outputDataConfig={"s3OutputDataConfig": {"s3Uri": f"s3://{self.bucket}/{output_prefix}"}},
+        )
+        job_arn = job["jobArn"]
+        print(f"[{stage}] 배치 추론 작업 제출: {job_arn} (레코드 {len(requests)}개)")
+
+        while True:
+            status = self.bedrock.get_model_invocation_job(jobIdentifier=job_arn)
+            if status["status"] in ("Completed", "PartiallyCompleted"):
+                break
+            if status["status"] in ("Failed", "Stopped", "Expired"):
+                raise RuntimeError(f"배치 추론 작업 실패({stage}): {status['status']} {status.get('message', '')}")
+            time.sleep(self.poll_seconds)
+
+        # 출력 위치: <출력 경로>/<작업 id>/<입력 파일 이름>.out
+        job_id = job_arn.split("/")[-1]
+        tmp_path = f"{output_path}.tmp"
+        self.s3.download_file(self.bucket, f"{output_prefix}{job_id}/input.jsonl.out", tmp_path)
+        os.replace(tmp_path, output_path)
+        return read_batch_output(output_path, model_id)
+
+
+class _RecordIds:
+    """단계 안에서 고유한 11자리 recordId (입력 순서가 같으면 재실행해도 같은 값)."""
+
+    def __init__(self):
+        self._next = 0
+
+    def next(self) -> str:
+        self._next += 1
+        return f"{_RECORD_ID_PREFIX}{self._next:09d}"
+
+
+def _parse_or_empty(parse: Callable[[str], List[Dict]], text: Optional[str], record_id: str) -> List[Dict]:
+    if text is None:
+        return []
+    try:
+        return parse(text)
+    except Exception as err:
+        print(f"배치 응답 파싱 실패 {record_id}: {err}")
+        return []
+
+
+def _run_sentence_stage(
+    stage: str,
+    system_instruction: str,
+    parse: Callable[[str], List[Dict]],
+    targets: Dict[str, List[SentenceRecord]],
+    backend,
+    model_id: str,
+) -> None:
+    """문서별 레코드 목록을 배치 요청으로 묶어 처리하고, 결과를 레코드에 기록한다."""
+    ids = _RecordIds()
+    requests: List[Dict] = []
+    owners: Dict[str, Dict[int, SentenceRecord]] = {}
+    for records in targets.values():
+        by_id = {r.id: r for r in records}
+        for batch in batch_by_token_budget([{"id": r.id, "sentence": r.sentence} for r in records]):
+            record_id = ids.next()
+            owners[record_id] = by_id
+            requests.append({
+                "recordId": record_id,
+                "system": system_instruction,
+                "message": build_sentence_batch_message(batch),
+            })
+    if not requests:
+        return
+
+    outputs = backend.run(stage, model_id, requests)
+    for record_id, by_id in owners.items():
+        for item in _parse_or_empty(parse, outputs.get(record_id), record_id):
+            record = by_id.get(item.get("id"))
+            if record is None:
+                continue
+            if "importance_score" in item:
+                record.importance_score = item["importance_score"]
+            if "category" in item:
+                record.category = item["category"]
+
+
+def run_bulk(
+    documents: Dict[str, str],
+    backend,
+    small_model_id: str,
+    large_model_id: str,
+    mode: str = SENTENCE_MODE_SEPARATE,
+) -> Dict[str, Dict]:
+    """
+    documents({ 문서 id: 약관 본문 })를 단계별 배치 추론으로 분석한다.
+    반환 형식: { 문서 id: { "overall_evaluation", "evaluation_for_each_clause" } } (온라인 분석과 같은 형식)
+    """
+    # 1) 문장 분할 및 규칙 기반 사전 분류 (로컬)
+    records_by_doc: Dict[str, List[SentenceRecord]] = {}
+    for doc_id, content in documents.items():
+        records = [s for s in split_sentences_block(content) if len(s) > 10]
+        for idx, record in enumerate(records):
+            record.id = idx
+        if PREFILTER_ENABLED:
+            prefilter_records(records)
+        records_by_doc[doc_id] = records
+
+    # 2) 중요도 점수화 (융합 모드면 분류까지). 거의 같은 문장은 대표 문장만 요청에 담는다.
+    pending_by_doc = {
+        doc_id: [r for r in records if r.importance_score is None] for doc_id, records in records_by_doc.items()
+    }
+    representative_by_doc: Dict[str, List[int]] = {}
+    for doc_id, pending in pending_by_doc.items():
+        representative_of = list(range(len(pending)))
+        if DEDUP_ENABLED and len(pending) > 1:
+            representative_of = representatives([record.sentence for record in pending])
+        representative_by_doc[doc_id] = representative_of
+
+    fused = mode == SENTENCE_MODE_FUSED
+    _run_sentence_stage(
+        "score",
+        FUSED_SYSTEM_INSTRUCTION if fused else SCORE_SYSTEM_INSTRUCTION,
+        parse_fused_response if fused else parse_score_response,
+        {
+            doc_id: [r for idx, r in enumerate(pending) if representative_by_doc[doc_id][idx] == idx]
+            for doc_id, pending in pending_by_doc.items()
+        },
+        backend,
+        small_model_id,
+    )
+
+    # 대표 문장의 결과를 같은 묶음의 문장에 복사
+    for doc_id, pending in pending_by_doc.items():
+        for idx, record in enumerate(pending):
+            representative = pending[representative_by_doc[doc_id][idx]]
+            if representative is record:
+                continue
+            if representative.importance_score is not None:
+                record.importance_score = representative.importance_score
+            if representative.category is not None:
+                record.category = representative.category
+
+    # 3) 카테고리 분류 (로컬 분류기가 확신하지 못한 중요 문장만)
+    classifier = get_classifier() if LOCAL_CATEGORIZER_ENABLED else None
+    uncategorized: Dict[str, List[Dict]] = {}
+    for doc_id, records in records_by_doc.items():
+        for record in records:
+            if (record.importance_score or 0) < 4 or record.category is not None:
+                continue
+            category = classifier.classify(record.sentence) if classifier is not None else None
+            if category is not None:
+                record.category = category
+            else:
+                uncategorized.setdefault(doc_id, []).append(record)
+    _run_sentence_stage(
+        "categorize", CATEGORIZE_SYSTEM_INSTRUCTION, parse_category_response,
+        uncategorized, backend, small_model_id,
+    )
+
+    # 4) 카테고리별 요약
+    ids = _RecordIds()
+    summary_requests: List[Dict] = []
+    summary_owners: Dict[str, tuple] = {}
+    for doc_id, records in records_by_doc.items():
+        important = [r for r in records if (r.importance_score or 0) >= 4 and r.category is not None]
+        for category, items in group_by_category(important).items():
+            record_id = ids.next()
+            summary_owners[record_id] = (doc_id, category)
+            summary_requests.append({
+                "recordId": record_id,
+                "system": SUMMARY_SYSTEM_INSTRUCTION,
+                "message": build_summary_message(category, items),
+            })
+    summaries = backend.run("summarize", large_model_id, summary_requests) if summary_requests else {}
+
+    # 5) 요약 평가 (요약 recordId를 그대로 사용)
+    evaluation_requests = [
+        {
+            "recordId": record_id,
+            "system": build_system_instruction_for_category(summary_owners[record_id][1]),
+            "message": build_evaluation_message(clean_summary(summary)),
+        }
+        for record_id, summary in summaries.items()
+    ]
+    evaluations = backend.run("evaluate", large_model_id, evaluation_requests) if evaluation_requests else {}
+
+    # 6) 문서별 결과 조립
+    clauses_by_doc: Dict[str, List[Dict]] = {doc_id: [] for doc_id in documents}
+    for record_id, summary in summaries.items():
+        doc_id, category = summary_owners[record_id]
+        evaluation = _parse_or_empty(lambda text: [extract_json_fragment(text)], evaluations.get(record_id), record_id)
+        clauses_by_doc[doc_id].append(
+            clause_from_evaluation(category, clean_summary(summary), evaluation[0] if evaluation else {})
+        )
+    return {doc_id: build_evaluation_result(clauses) for doc_id, clauses in clauses_by_doc.items()}
@@ -0,0 +1,157 @@
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+# 어휘 기반 로컬 카테고리 분류기
+# 카테고리마다 뚜렷한 어휘(환불, 개인정보, 준거법, 면책 ...)의 가중치 합으로 점수를 매기고,
+# 가장 높은 카테고리의 점수 비중(신뢰도)이 기준 이상일 때만 분류를 확정한다.
+# 애매한 문장은 None을 반환해 기존대로 모델에 맡긴다.
+# 가중치는 scripts/calibrate_category_classifier.py로 과거 모델 분류 결과에 맞춰 다시 계산할 수 있다.
+
+LOCAL_CATEGORIZER_ENABLED = os.environ.get("TERMLENS_LOCAL_CATEGORIZER", "1") != "0"
+# 가장 높은 카테고리 점수가 전체 점수 합에서 차지하는 비율의 최소값
+CONFIDENCE_THRESHOLD = float(os.environ.get("TERMLENS_CATEGORY_CONFIDENCE", "0.8"))
+# 가장 높은 카테고리 점수의 최소값 (약한 단서 하나로 확정하지 않도록)
+MIN_SCORE = 3.0
+# 보정된 가중치 JSON 경로 ({ 카테고리: { 어휘: 가중치 } }), 없으면 기본 가중치 사용
+WEIGHTS_PATH = os.environ.get("TERMLENS_CATEGORY_WEIGHTS", "")
+
+DEFAULT_KEYWORD_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "계정 관리 및 가입 조건": {
+        "회원가입": 3, "가입": 2, "계정": 2, "아이디": 2, "비밀번호": 3, "로그인": 1.5,
+        "만 14세": 3, "미성년자": 2, "법정대리인": 2, "휴면": 3, "탈퇴": 1.5, "양도": 1,
+        "account": 2, "password": 3, "sign up": 2, "register": 1.5, "minor": 2, "inactive": 2, "username": 2,
+    },
+    "결제 및 환불 규정": {
+        "결제": 3, "환불": 3, "요금": 2.5, "수수료": 2.5, "청약철회": 3, "유료": 2, "무료 체험": 3,
+        "구독": 2, "정기결제": 3, "이용료": 2.5, "과금": 3, "포인트": 1.5, "쿠폰": 1.5,
+        "payment": 3, "refund": 3, "fee": 2.5, "billing": 3, "subscription": 2, "charge": 2, "price": 2, "trial": 2.5,
+    },
+    "개인정보 및 데이터 수집": {
+        "개인정보": 3, "수집": 2, "쿠키": 3, "위치정보": 3, "파기": 2.5, "보관 기간": 2.5, "열람": 1.5,
+        "처리 정지": 2, "국외 이전": 3, "맞춤형 광고": 2, "이용 기록": 2, "기기 정보": 2,
+        "personal data": 3, "personal information": 3, "privacy": 3, "cookie": 3, "collect": 2, "collection": 2,
+        "retention": 2, "tracking": 2,
+    },
+    "이용자 콘텐츠의 라이선스": {
+        "게시물": 2.5, "콘텐츠": 1, "저작권": 2.5, "라이선스": 3, "이용 허락": 3, "2차적 저작물": 3,
+        "업로드": 2, "user content": 3, "license": 3, "copyright": 2.5, "royalty-free": 3, "upload": 2,
+    },
+    "금지사항": {
+        "금지": 3, "하여서는 안": 2.5, "해서는 안": 2.5, "스팸": 3, "해킹": 3, "자동화": 2, "크롤링": 3,
+        "명예훼손": 3, "괴롭": 2, "불법": 1.5, "음란": 3, "도용": 2, "부정 이용": 2.5,
+        "prohibited": 3, "must not": 2, "spam": 3, "harass": 3, "harassment": 3, "scrape": 3, "scraping": 3, "reverse engineer": 3,
+        "unlawful": 1.5,
+    },
+    "약관 및 서비스 변경": {
+        "약관을 변경": 3, "약관의 변경": 3, "변경된 약관": 3, "개정": 2.5, "공지": 1.5, "효력": 1.5,
+        "서비스 변경": 2.5, "서비스의 변경": 2.5, "중단": 1.5, "수정할 수": 2,
+        "modify these terms": 3, "changes to these terms": 3, "amend": 2.5, "update these terms": 3,
+        "discontinue": 2,
+    },
+    "책임 제한 및 면책": {
+        "책임을 지지 않": 3, "책임지지 않": 3, "면책": 3, "손해배상": 2.5, "배상": 2, "손해": 1.5,
+        "보증하지 않": 3, "고의 또는 중과실": 3, "천재지변": 2.5, "불가항력": 2.5,
+        "liable": 3, "liability": 3, "indemnify": 3, "warranty": 2.5, "as is": 3, "damages": 2,
+    },
+    "분쟁 해결 및 준거법": {
+        "준거법": 3, "관할": 3, "법원": 2.5, "분쟁": 2.5, "중재": 3, "소송": 2.5, "집단소송": 3,
+        "governing law": 3, "jurisdiction": 3, "arbitration": 3, "court": 2.5, "dispute": 2.5,
+        "class action": 3,
+    },
+    "제3자 서비스": {
+        "제3자": 2, "외부 서비스": 3, "외부 사이트": 3, "링크": 2, "소셜 로그인": 3, "연동": 2,
+        "광고": 1.5, "제휴": 1.5, "third party": 2.5, "third-party": 2.5, "link": 1.5, "external": 1.5,
+        "advertising": 1.5, "advertisement": 1.5,
+    },
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_keyword(text: str) -> str:
+    return _WHITESPACE_RE.sub("", text).lower()
+
+
+def _keyword_pattern(keyword: str) -> str:
+    pattern = r"\s*".join(map(re.escape, keyword.split()))
+    # 영문 어휘는 단어 단위로만 일치 (fee가 feedback에 일치하지 않도록)
+    if keyword.isascii():
+        pattern = rf"\b{pattern}\b"
+    return pattern
+
+
+class KeywordCategoryClassifier:
+    """어휘 가중치 기반 분류기. 모든 어휘를 하나의 정규식으로 묶어 문장당 한 번만 훑는다."""
+
+    def __init__(
+        self,
+        keyword_weights: Optional[Dict[str, Dict[str, float]]] = None,
+        threshold: float = CONFIDENCE_THRESHOLD,
+        min_score: float = MIN_SCORE,
+    ):
+        self.keyword_weights = keyword_weights or DEFAULT_KEYWORD_WEIGHTS
+        self.threshold = threshold
+        self.min_score = min_score
+
+        # 정규화한 어휘 → [(카테고리, 가중치)]
+        self._weights: Dict[str, List[Tuple[str, float]]] = {}
+        for category, weights in self.keyword_weights.items():
+            for keyword, weight in weights.items():
+                self._weights.setdefault(normalize_keyword(keyword), []).append((category, float(weight)))
+
+        # 긴 어휘를 먼저 시도하고, 어휘 안의 공백은 임의의 공백(없음 포함)과 일치
+        keywords = sorted({kw for weights in self.keyword_weights.values() for kw in weights}, key=len, reverse=True)
+        alternation = "|".join(_keyword_pattern(keyword) for keyword in keywords)
+        self._pattern = re.compile(alternation, re.IGNORECASE) if keywords else None
+
+    def matched_keywords(self, sentence: str) -> List[str]:
+        """문장에서 찾은 어휘 목록 (normalize_keyword로 정규화된 형태)."""
+        if self._pattern is None:
+            return []
+        return [normalize_keyword(match) for match in self._pattern.findall(sentence)]
+
+    def scores(self, sentence: str) -> Dict[str, float]:
+        """카테고리별 어휘 가중치 합."""
+        totals: Dict[str, float] = {}
+        for keyword in self.matched_keywords(sentence):
+            for category, weight in self._weights.get(keyword, ()):
+                totals[category] = totals.get(category, 0.0) + weight
+        return totals
+
+    def predict(self, sentence: str) -> Tuple[Optional[str], float]:
+        """(가장 점수가 높은 카테고리, 신뢰도)를 반환한다. 일치하는 어휘가 없으면 (None, 0.0)."""
+        totals = self.scores(sentence)
+        if not totals:
+            return None, 0.0
+        category, top = max(totals.items(), key=lambda item: item[1])
+        if top < self.min_score:
+            return category, 0.0
+        return category, top / sum(totals.values())
+
+    def classify(self, sentence: str) -> Optional[str]:
+        """신뢰도가 기준 이상이면 카테고리를, 아니면 None을 반환한다."""
+        category, confidence = self.predict(sentence)
+        return category if confidence >= self.threshold else None
+
+    def classify_batch(self, sentences: List[str]) -> List[Optional[str]]:
+        return [self.classify(sentence) for sentence in sentences]
+
+
+def load_keyword_weights(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_default_classifier: Optional[KeywordCategoryClassifier] = None
+
+
+def get_classifier() -> KeywordCategoryClassifier:
+    """기본 분류기 (TERMLENS_CATEGORY_WEIGHTS가 있으면 보정된 가중치 사용)."""
+    global _default_classifier
+    if _default_classifier is None:
+        weights = load_keyword_weights(WEIGHTS_PATH) if WEIGHTS_PATH else None
+        _default_classifier = KeywordCategoryClassifier(weights)
+    return _default_classifier
@@ -0,0 +1,67 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+# 파이프라인 단계별 출력 체크포인트 저장소
+# 타임아웃/재시도 시 완료된 단계의 결과를 재사용하기 위해 content_hash + 단계 이름으로 보관한다.
+# 체크포인트는 최선 노력(best-effort)으로 저장하며, 저장하지 못해도 분석은 계속된다.
+
+# DynamoDB 항목 크기 제한(400KB)에서 키·TTL 속성 몫을 뺀 payload 최대 크기
+MAX_DYNAMODB_PAYLOAD_BYTES = 400 * 1024 - 1024
+
+
+class InMemoryCheckpointStore:
+    """테스트/로컬 실행용 메모리 저장소."""
+
+    def __init__(self):
+        self._items: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str, stage: str) -> Optional[Any]:
+        with self._lock:
+            payload = self._items.get((content_hash, stage))
+        # 저장 시점의 값이 이후 변경되지 않도록 직렬화된 형태로 보관
+        return json.loads(payload) if payload is not None else None
+
+    def put(self, content_hash: str, stage: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._items[(content_hash, stage)] = payload
+
+
+class DynamoDBCheckpointStore:
+    """
+    DynamoDB 기반 저장소.
+    테이블 키: checkpoint_id (S) = "<content_hash>#<stage>"
+    expires_at 속성을 TTL로 지정하면 오래된 체크포인트가 자동 삭제된다.
+    """
+
+    def __init__(self, table, ttl_seconds: int = 24 * 60 * 60):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, content_hash: str, stage: str) -> Optional[Any]:
+        response = self.table.get_item(
+            Key={"checkpoint_id": f"{content_hash}#{stage}"},
+            ConsistentRead=True,
+        )
+        item = response.get("Item")
+        if not item:
+            return None
+        # Decimal 변환 문제를 피하기 위해 값은 JSON 문자열로 저장
+        return json.loads(item["payload"])
+
+    def put(self, content_hash: str, stage: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > MAX_DYNAMODB_PAYLOAD_BYTES:
+            # 항목 크기 제한을 넘으면 ValidationException이 나므로 저장하지 않음 (재시도 시 단계를 다시 실행)
+            print(f"체크포인트 저장 생략 (크기 {size} bytes): {stage}")
+            return
+        self.table.put_item(Item={
+            "checkpoint_id": f"{content_hash}#{stage}",
+            "payload": payload,
+            "expires_at": int(time.time()) + self.ttl_seconds,
+        })
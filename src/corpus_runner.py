@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+# 로컬 말뭉치 분석 (디렉터리의 약관 html 수만 건)
+# - 추출(trafilatura)과 문장 분할은 CPU를 쓰므로 프로세스 풀에서 수행한다.
+# - 점수화/분류/요약/평가는 메인 프로세스의 문서 스레드에서 실행하며,
+#   모든 문서가 같은 LLMClient와 공유 스레드 풀, 모델별 동시성 조절기를 함께 사용한다.
+# - 결과는 문서가 끝날 때마다 출력 JSONL에 한 줄씩 추가하고, 재실행 시 결과가 있는 문서는 건너뛴다.
+
+HTML_SUFFIXES = (".html", ".htm")
+
+
+def iter_corpus_files(root: str, suffixes=HTML_SUFFIXES) -> List[str]:
+    """root 아래의 약관 파일 경로 목록 (정렬된 순서)."""
+    if os.path.isfile(root):
+        return [root]
+    paths = []
+    for dir_path, _, names in os.walk(root):
+        paths.extend(os.path.join(dir_path, name) for name in names if name.lower().endswith(suffixes))
+    return sorted(paths)
+
+
+def load_completed(out_path: str) -> Set[str]:
+    """출력 JSONL에서 결과가 기록된 문서 경로 목록. (오류 줄은 재실행 대상)"""
+    completed: Set[str] = set()
+    if not os.path.exists(out_path):
+        return completed
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 중단 시 마지막 줄이 잘렸을 수 있음
+                continue
+            if "result" in record:
+                completed.add(record["path"])
+    return completed
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def prepare_document(path: str) -> Dict:
+    """
+    (프로세스 풀 작업) 약관 html을 추출하고 문장으로 분할한다.
+    반환 형식: { "path", "raw_hash", "content_hash", "sentences" } 또는 { "path", "error" }
+    해시는 온라인 분석(lambda_function)과 같은 방식으로 계산한다.
+    """
+    from trafilatura import extract
+    from tos_pipeline import split_document
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        body = f.read()
+    tos_content = extract(body, output_format="html")
+    if not tos_content:
+        return {"path": path, "error": "약관 전처리에 실패했습니다."}
+    return {
+        "path": path,
+        "raw_hash": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+        "content_hash": hashlib.sha256(tos_content.encode("utf-8")).hexdigest(),
+        "sentences": split_document(tos_content),
+    }
+
+
+def analyze_prepared(prepared: Dict, client, sentence_store=None) -> Dict:
+    """분할된 문서를 분석해 출력 레코드 { "path", "raw_hash", "content_hash", "result" }를 만든다."""
+    from tos_evaluate import sort_clause_results
+    from tos_pipeline import _clause_from_event, iter_pipeline_events
+
+    clause_results = []
+    overall_evaluation = None
+    for event in iter_pipeline_events(
+        "",
+        prepared["content_hash"],
+        client,
+        sentence_store=sentence_store,
+        sentences=prepared["sentences"],
+    ):
+        if event["type"] == "clause":
+            clause_results.append(_clause_from_event(event))
+        elif event["type"] == "overall":
+            overall_evaluation = event["overall_evaluation"]
+    return {
+        "path": prepared["path"],
+        "raw_hash": prepared["raw_hash"],
+        "content_hash": prepared["content_hash"],
+        "result": {
+            "overall_evaluation": overall_evaluation,
+            "evaluation_for_each_clause": sort_clause_results(clause_results),
+        },
+    }
+
+
+def run_corpus(
+    paths: Iterable[str],
+    out_path: str,
+    client,
+    sentence_store=None,
+    processes: Optional[int] = None,
+    documents: int = 4,
+    prepare: Callable[[str], Dict] = prepare_document,
+    on_record: Optional[Callable[[Dict], None]] = None,
+) -> Dict[str, int]:
+    """
+    paths의 문서를 분석해 out_path(JSONL)에 한 줄씩 추가한다. 이미 결과가 있는 문서는 건너뛴다.
+    processes: 추출/분할 프로세스 수 (기본값: CPU 수), documents: 동시에 분석할 문서 수
+    동시에 진행 중인 추출/분석 작업 수를 제한해, 문서 수가 많아도 분할 결과가 메모리에 쌓이지 않게 한다.
+    반환 형식: { "skipped", "completed", "failed" }
+    """
+    completed = load_completed(out_path)
+    paths = list(paths)
+    todo = [path for path in paths if path not in completed]
+    # 출력 파일에는 이번 실행에서 요청하지 않은 문서의 결과도 있을 수 있음
+    counts = {"skipped": len(completed.intersection(paths)), "completed": 0, "failed": 0}
+    processes = processes or os.cpu_count() or 1
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+
+    write_lock = threading.Lock()
+    out = open(out_path, "a", encoding="utf-8")
+    # 중단으로 잘린 마지막 줄 뒤에 이어 쓰면 새 결과 줄까지 깨지므로 줄을 바꾼 뒤 기록
+    if out.tell() and not _ends_with_newline(out_path):
+        out.write("\n")
+
+    def write(record: Dict) -> None:
+        with write_lock:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            counts["completed" if "result" in record else "failed"] += 1
+        if on_record is not None:
+            on_record(record)
+
+    def analyze(prepared: Dict) -> None:
+        started = time.perf_counter()
+        try:
+            record = analyze_prepared(prepared, client, sentence_store)
+        except Exception as err:
+            record = {"path": prepared["path"], "error": str(err)}
+        record["seconds"] = round(time.perf_counter() - started, 3)
+        write(record)
+
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as process_pool, \
+                ThreadPoolExecutor(max_workers=documents, thread_name_prefix="termlens-doc") as document_pool:
+            remaining = iter(todo)
+            preparing: Dict[Future, str] = {}
+            analyzing: Set[Future] = set()
+            exhausted = False
+            while True:
+                # 분석 대기열이 차 있으면 추출을 더 제출하지 않음
+                while not exhausted and len(preparing) < processes * 2 and len(analyzing) < documents * 2:
+                    path = next(remaining, None)
+                    if path is None:
+                        exhausted = True
+                        break
+                    preparing[process_pool.submit(prepare, path)] = path
+                if not preparing and not analyzing:
+                    break
+
+                done, _ = wait(set(preparing) | analyzing, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in analyzing:
+                        analyzing.discard(future)
+                        future.result()
+                        continue
+                    path = preparing.pop(future)
+                    try:
+                        prepared = future.result()
+                    except Exception as err:
+                        prepared = {"path": path, "error": str(err)}
+                    if "error" in prepared:
+                        write(prepared)
+                    else:
+                        analyzing.add(document_pool.submit(analyze, prepared))
+    finally:
+        out.close()
+    return counts
@@ -0,0 +1,45 @@
+import queue
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Optional
+
+
+# 단계 사이의 장벽(barrier) 없이 작업을 이어 붙이는 소형 데이터플로 스케줄러
+# - submit()으로 제출한 작업이 끝나면 on_done 콜백을 드라이버 스레드(run()을 호출한 스레드)에서 실행한다.
+# - 콜백 안에서 후속 작업을 바로 submit()할 수 있어, 이전 단계의 가장 느린 작업을 기다리지 않는다.
+# - 작업 스레드는 post()로 중간 결과를 드라이버 스레드에 전달할 수 있다.
+# 콜백과 submit()은 모두 드라이버 스레드에서만 실행되므로 별도의 잠금 없이 상태를 다룰 수 있고,
+# 작업이 풀 안에서 다시 풀에 제출하고 기다리는 교착도 생기지 않는다.
+
+_DONE = "done"
+_POST = "post"
+
+
+class Dataflow:
+    def __init__(self, executor: Executor):
+        self._executor = executor
+        self._events: "queue.Queue" = queue.Queue()
+        self._outstanding = 0
+
+    def submit(self, fn: Callable, *args, on_done: Optional[Callable[[Any], None]] = None) -> None:
+        """작업을 제출한다. 드라이버 스레드에서만 호출한다."""
+        self._outstanding += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda f: self._events.put((_DONE, on_done, f)))
+
+    def post(self, handler: Callable, *args) -> None:
+        """작업 스레드에서 호출해 handler(*args)를 드라이버 스레드에서 실행하도록 예약한다."""
+        self._events.put((_POST, handler, args))
+
+    def run(self) -> None:
+        """제출된 작업과 그 후속 작업이 모두 끝날 때까지 콜백을 처리한다. 작업 예외는 그대로 전파된다."""
+        while self._outstanding:
+            kind, handler, payload = self._events.get()
+            if kind == _POST:
+                handler(*payload)
+                continue
+
+            self._outstanding -= 1
+            future: Future = payload
+            result = future.result()
+            if handler is not None:
+                handler(result)
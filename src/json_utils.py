@@ -1,10 +1,12 @@
 import json
 import re
-from typing import Any
+from typing import Any, List, Optional
 
 
 _CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
 _INVALID_ESCAPE_RE = re.compile(r'(?<!\\)\\(?!["\\/bfnrtu])')
+_ITEM_GAP_RE = re.compile(r"[\s,]*")
+_DECODER = json.JSONDecoder()
 
 
 def _strip_code_block(text: str) -> str:
@@ -80,13 +82,30 @@ def _escape_invalid_backslashes(text: str) -> str:
 def extract_json_fragment(text: str) -> Any:
     """
     LLM 응답에서 첫 번째 JSON 조각(객체 또는 배열)을 추출해 파싱한다.
-    - 코드블록(`````, ```json````) 제거
-    - 괄호 균형을 맞추어 닫힘 기호가 빠진 경우 보정
-    - 잘못된 역슬래시 시퀀스를 보정
+    응답 전체가 올바른 JSON 객체/배열이면(구조화 출력, 지시를 지킨 응답) 바로 파싱하고,
+    그렇지 않을 때만 repair_json_fragment로 보정한다.
     """
     if text is None:
         raise ValueError("LLM 응답이 비어 있어 JSON을 찾지 못했습니다.")
 
+    stripped = text.strip()
+    # 코드블록 표시가 있으면 보정 경로와 결과가 달라질 수 있고, 닫는 기호가 맞지 않으면(잘린 응답) 실패가 뻔하므로
+    # 바로 파싱하지 않음
+    if stripped[:1] + stripped[-1:] in ("{}", "[]") and "```" not in stripped:
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+    return repair_json_fragment(stripped)
+
+
+def repair_json_fragment(text: str) -> Any:
+    """
+    응답에서 JSON 조각을 찾아 보정한 뒤 파싱한다.
+    - 코드블록(`````, ```json````) 제거
+    - 괄호 균형을 맞추어 닫힘 기호가 빠진 경우 보정
+    - 잘못된 역슬래시 시퀀스를 보정
+    """
     cleaned = _strip_code_block(text.strip())
     fragment = _find_json_fragment(cleaned)
 
@@ -102,4 +121,62 @@ def extract_json_fragment(text: str) -> Any:
     print("FRAGMENT:", fragment)
     print("FRAGMENT repr:", repr(fragment))
     print("Failed JSON text:", text) # 디버깅용 출력
-    raise ValueError(f"JSON 파싱에 실패했습니다: {last_error}")
\ No newline at end of file
+    raise ValueError(f"JSON 파싱에 실패했습니다: {last_error}")
+
+
+class JsonArrayItemParser:
+    """
+    스트리밍 응답에서 최상위 JSON 배열의 항목을 완성되는 대로 꺼낸다.
+    feed()에는 지금까지 받은 응답 전체를 넘기며, 새로 완성된 항목 목록을 반환한다.
+    응답이 이전과 다른 내용으로 다시 시작되면(재시도) 처음부터 다시 파싱한다.
+
+    extract_json_fragment와 같이 첫 번째 '{' 또는 '['에서 시작하는 조각을 대상으로 하며,
+    배열이 아니거나 보정이 필요한 항목을 만나면 그 뒤 항목은 꺼내지 않는다. (응답 전체를 다시 파싱해 처리)
+    closed는 닫는 ']'까지 정상적으로 파싱했는지 여부다.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        self._text = ""
+        self._pos: Optional[int] = None
+        self._stopped = False
+        self.closed = False
+
+    def feed(self, text: str) -> List[Any]:
+        if not text.startswith(self._text):
+            self._reset()
+        self._text = text
+        items: List[Any] = []
+        if self._stopped:
+            return items
+
+        if self._pos is None:
+            arr_start = text.find("[")
+            obj_start = text.find("{")
+            if obj_start != -1 and (arr_start == -1 or obj_start < arr_start):
+                self._stopped = True
+                return items
+            if arr_start == -1:
+                return items
+            self._pos = arr_start + 1
+
+        while True:
+            pos = _ITEM_GAP_RE.match(text, self._pos).end()
+            if pos >= len(text):
+                break
+            if text[pos] == "]":
+                self._stopped = self.closed = True
+                break
+            try:
+                item, end = _DECODER.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                # 아직 덜 받았거나 보정이 필요한 항목
+                break
+            if end >= len(text) and not isinstance(item, (dict, list)):
+                # 숫자/리터럴은 뒤에 글자가 더 올 수 있음
+                break
+            items.append(item)
+            self._pos = end
+        return items
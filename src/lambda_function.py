@@ -1,152 +1,246 @@
 import json
 import hashlib
-from trafilatura import extract
-import boto3
+import os
+import time
+import uuid
 
-from llm_client import LLMClient
-from text_splitter import split_sentences_block
-from tos_evaluate import evaluate_category_summaries
-from tos_processing import categorize_sentences, score_sentence_importance
-from tos_summarize import summarize_by_category
+from async_jobs import JOB_QUEUED, failed_message_ids, get_job_status, process_job, submit_job
+from runtime import ANALYSIS_TABLE_NAME, get_runtime
 
-def lambda_handler(event, context):
-    # url이 없거나 빈 문자열인 경우
-    if ('queryStringParameters' not in event
-        or 'url' not in event['queryStringParameters']
-        or not event['queryStringParameters']['url']):
-
-        return {
-            'statusCode': 400,
-            'body': json.dumps({
-                'error': 'url 파라미터가 필요합니다.'
-            }, ensure_ascii=False)
-        }
+# 동일 문서를 다른 호출이 분석 중일 때 결과를 기다리는 최대 시간(초)과 조회 간격
+RESULT_WAIT_SECONDS = float(os.environ.get("TERMLENS_RESULT_WAIT_SECONDS", "20"))
+RESULT_POLL_INTERVAL_SECONDS = 1.0
+# 분석 임대 유효 시간(초), Lambda 타임아웃(120초)보다 길게 유지
+ANALYSIS_LEASE_SECONDS = 150
 
-    # body가 없거나 빈 문자열인 경우
-    if 'body' not in event or not event['body']:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({
-                'error': '분석할 약관이 없습니다.'
-            }, ensure_ascii=False)
-        }
+# trafilatura(lxml, justext 등 포함)와 분석 파이프라인은 임포트 비용이 커서
+# 모듈 로드 시점이 아니라 실제로 필요한 경로에서만 불러온다.
 
-    url = event['queryStringParameters']['url']
-    tos_content = extract(event['body'], output_format='html')
 
-    if not tos_content:
-        return {
-            'statusCode': 400,
-            'body': json.dumps({
-                'error': '약관 전처리에 실패했습니다.'
-            }, ensure_ascii=False)
-        }
+def _extract_content(body: str):
+    from trafilatura import extract
+    return extract(body, output_format='html')
+
+
+def _response(status_code: int, payload) -> dict:
+    return {
+        'statusCode': status_code,
+        'body': json.dumps(payload, ensure_ascii=False)
+    }
+
+
+def _clause_from_event(event) -> dict:
+    return {key: value for key, value in event.items() if key != 'type'}
+
+
+def _cached_events(item):
+    for clause in item.get("evaluation_for_each_clause") or []:
+        yield {'type': 'clause', **clause}
+    yield {'type': 'overall', 'overall_evaluation': item.get("overall_evaluation")}
 
-    # 바이트 기준으로 길이 및 감소율 계산
-    original_length = len(event['body'].encode('utf-8'))
-    processed_length = len(tos_content.encode('utf-8'))
-    
-    print(f"원본 html 길이: {original_length} bytes")
-    print(f"trafilatura 전처리 후 길이: {processed_length} bytes")
 
+def _wait_for_result(table, url_hash: str, content_hash: str):
+    """다른 호출이 저장할 분석 결과를 제한 시간 동안 조회한다."""
+    deadline = time.monotonic() + RESULT_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(RESULT_POLL_INTERVAL_SECONDS)
+        item = table.get_item(Key={'url': url_hash}, ConsistentRead=True).get('Item')
+        if item and item.get('content_hash') == content_hash:
+            return item
+    return None
+
+
+def iter_analysis_events(url: str, body: str, on_stage=None):
+    """
+    약관 html을 분석하며 결과를 이벤트(dict)로 하나씩 반환한다.
+    - { "type": "clause", "category", "summarized_clause", "reasoning", "evaluation" }: 카테고리 평가 완료 시마다
+    - { "type": "overall", "overall_evaluation" }: 마지막 이벤트
+    - { "type": "error", "status", "error" } / { "type": "in_progress", "status", "message" }: 분석하지 못한 경우
+    """
     # url에서 쿼리 파라미터(?), 해시(#) 제거
     url = url.split('?')[0].split('#')[0]
     # URL 해시: DynamoDB 조회용 키
     url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
-    # 콘텐츠 해시: 페이지 본문 변경 여부 확인용
-    content_hash = hashlib.sha256(tos_content.encode('utf-8')).hexdigest()
+    # 원본 해시: 요청 본문(html) 그대로의 해시, 동일한 페이지 재요청 시 추출 없이 캐시 확인용
+    raw_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
 
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table('termlens-tos-analysis')
+    # 웜 컨테이너에서는 이전 호출에서 만든 클라이언트/스레드 풀을 재사용
+    runtime = get_runtime()
+    table = runtime.table(ANALYSIS_TABLE_NAME)
 
     # DynamoDB에서 URL 해시로 기존 분석 결과 조회
     db_response = table.get_item(Key={'url': url_hash})
+    cached_item = db_response.get('Item')
+
+    # 원본 해시가 일치하면 trafilatura 추출 없이 바로 캐시 반환
+    if cached_item and cached_item.get('raw_hash') == raw_hash:
+        print("원본 해시 일치, 이전 분석 결과 반환")
+        yield from _cached_events(cached_item)
+        return
+
+    tos_content = _extract_content(body)
+
+    if not tos_content:
+        yield {'type': 'error', 'status': 400, 'error': '약관 전처리에 실패했습니다.'}
+        return
+
+    # 바이트 기준으로 길이 및 감소율 계산
+    original_length = len(body.encode('utf-8'))
+    processed_length = len(tos_content.encode('utf-8'))
+    
+    print(f"원본 html 길이: {original_length} bytes")
+    print(f"trafilatura 전처리 후 길이: {processed_length} bytes")
+
+    # 콘텐츠 해시: 페이지 본문 변경 여부 확인용
+    content_hash = hashlib.sha256(tos_content.encode('utf-8')).hexdigest()
 
     # 기존 분석 결과가 있고, 콘텐츠 해시가 일치하면 캐시 반환
-    if 'Item' in db_response and db_response['Item'].get('content_hash') == content_hash:
-        evaluation_result = db_response['Item']
+    if cached_item and cached_item.get('content_hash') == content_hash:
         print("캐시 존재, 이전 분석 결과 반환")
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                "overall_evaluation": evaluation_result.get("overall_evaluation"),
-                "evaluation_for_each_clause": evaluation_result.get("evaluation_for_each_clause")
-            }, ensure_ascii=False)
-        }
+        # 다음 요청부터는 원본 해시로 바로 찾을 수 있도록 갱신
+        table.update_item(
+            Key={'url': url_hash},
+            UpdateExpression='SET raw_hash = :raw_hash',
+            ExpressionAttributeValues={':raw_hash': raw_hash},
+        )
+        yield from _cached_events(cached_item)
+        return
 
     # 캐시가 없거나 콘텐츠가 변경된 경우 새로 분석
-    if 'Item' in db_response:
+    if cached_item:
         print("캐시 내용 불일치, 새로 분석")
     else:
         print("캐시 없음, 새로 분석")
 
-    client = LLMClient(temperature=0)
-
-    # 1) 문장 단위 분할
-    sentences = split_sentences_block(tos_content, client)
-    print(f"문장 분할 개수: {len(sentences)}")
-    print(f"문장들 길이 합: {sum(len(s) for s in sentences)}")
-
-    # 1-1) 짧은 문장 필터링 (10자 이하 제거)
-    sentences = [s for s in sentences if len(s) > 10]
-    print(f"10자 이하 제거 후 문장 개수: {len(sentences)}")
-
-    # 2) 중요도 점수화
-    scored_sentences = score_sentence_importance(sentences, client)
-    # 중요도 결과에 원문 문장 재결합 (모델 출력에 sentence 포함 안 함)
-    index_to_sentence = {idx: sentences[idx].strip() for idx in range(len(sentences))}
-    for item in scored_sentences:
-        idx = item.get("id")
-        if idx in index_to_sentence:
-            item["sentence"] = index_to_sentence[idx]
-
-    important_sentences = [
-        item for item in scored_sentences if item.get("importance_score", 0) >= 4
-    ]
-    print(f"중요도 4 이상 문장 수: {len(important_sentences)}")
-    print(f"중요도 4 이상 문장들 길이 합: {sum(len(item.get('sentence', '')) for item in important_sentences)}")
-
-    # 3) 카테고리 분류
-    categorize_input = [
-        {"id": item.get("id"), "sentence": item.get("sentence", "")}
-        for item in important_sentences
-    ]
-    categorized_raw = categorize_sentences(categorize_input, client)
-    index_to_important = {item.get("id"): item for item in important_sentences}
-    categorized = []
-    for item in categorized_raw:
-        idx = item.get("id")
-        base = index_to_important.get(idx)
-        if base:
-            categorized.append({**base, "category": item.get("category", "기타")})
-
-    # 카테고리별 문장 수 계산 후 출력 (디버깅 용도)
-    category_counts = {}
-    for item in categorized:
-        category = item.get("category", "UNKNOWN")
-        category_counts[category] = category_counts.get(category, 0) + 1
-    print("카테고리별 문장 수:")
-    for category, count in category_counts.items():
-        print(f"{category}: {count}")
-
-    # 4) 카테고리별 요약
-    category_summaries = summarize_by_category(categorized, client)
-
-    # 5) 요약 평가
-    evaluation_result = evaluate_category_summaries(category_summaries, client)
-
-    # DynamoDB에 분석 결과와 콘텐츠 해시 저장
-    table.put_item(Item={
-        'url': url_hash,
-        'content_hash': content_hash,
-        'overall_evaluation': evaluation_result.get("overall_evaluation"),
-        'evaluation_for_each_clause': evaluation_result.get("evaluation_for_each_clause")
-    })
-
-    return {
-        'statusCode': 200,
-        'body': json.dumps({
-            "overall_evaluation": evaluation_result.get("overall_evaluation"),
-            "evaluation_for_each_clause": evaluation_result.get("evaluation_for_each_clause")
-        }, ensure_ascii=False)
+    # 같은 문서 버전은 임대를 획득한 호출 하나만 분석하고, 나머지는 결과를 기다림
+    lease_key = f"{url_hash}#{content_hash}"
+    lease_owner = uuid.uuid4().hex
+    if not runtime.lease_store.acquire(lease_key, lease_owner, ANALYSIS_LEASE_SECONDS):
+        print("다른 호출에서 분석 중, 결과 대기")
+        item = _wait_for_result(table, url_hash, content_hash)
+        if item:
+            yield from _cached_events(item)
+            return
+        yield {
+            'type': 'in_progress',
+            'status': 202,
+            'message': '약관을 분석 중입니다. 잠시 후 다시 요청해주세요.'
+        }
+        return
+
+    try:
+        # 이전 임대 보유자가 결과를 저장하고 임대를 놓은 직후에 획득했을 수 있으므로 결과를 다시 확인
+        item = table.get_item(Key={'url': url_hash}, ConsistentRead=True).get('Item')
+        if item and item.get('content_hash') == content_hash:
+            print("임대 획득 전 저장된 분석 결과 반환")
+            yield from _cached_events(item)
+            return
+
+        from tos_pipeline import iter_pipeline_events
+
+        # 분할 → 점수화/분류 → 요약 → 평가 (단계별 체크포인트 저장)
+        # 카테고리 평가가 끝날 때마다 바로 전달
+        clause_results = []
+        for event in iter_pipeline_events(
+            tos_content,
+            content_hash,
+            runtime.llm_client,
+            sentence_store=runtime.sentence_store,
+            checkpoints=runtime.checkpoint_store,
+            on_stage=on_stage,
+        ):
+            if event['type'] == 'clause':
+                clause_results.append(_clause_from_event(event))
+            else:
+                # DynamoDB에 분석 결과와 콘텐츠 해시 저장 후 마지막 이벤트 전달
+                from tos_evaluate import sort_clause_results
+
+                table.put_item(Item={
+                    'url': url_hash,
+                    'content_hash': content_hash,
+                    'raw_hash': raw_hash,
+                    'overall_evaluation': event['overall_evaluation'],
+                    'evaluation_for_each_clause': sort_clause_results(clause_results)
+                })
+            yield event
+    finally:
+        runtime.lease_store.release(lease_key, lease_owner)
+
+
+def analyze_tos(url: str, body: str, on_stage=None, on_clause=None):
+    """
+    약관 html을 분석해 (상태 코드, 응답 dict)를 반환한다.
+    동기 요청과 비동기 작업 워커가 함께 사용한다.
+    on_clause는 카테고리 평가가 끝날 때마다 해당 결과로 호출된다.
+    """
+    clause_results = []
+    overall_evaluation = None
+    for event in iter_analysis_events(url, body, on_stage):
+        if event['type'] == 'error':
+            return event['status'], {'error': event['error']}
+        if event['type'] == 'in_progress':
+            return event['status'], {'status': 'in_progress', 'message': event['message']}
+        if event['type'] == 'clause':
+            clause = _clause_from_event(event)
+            clause_results.append(clause)
+            if on_clause is not None:
+                on_clause(clause)
+        elif event['type'] == 'overall':
+            overall_evaluation = event['overall_evaluation']
+
+    from tos_evaluate import sort_clause_results
+
+    return 200, {
+        "overall_evaluation": overall_evaluation,
+        "evaluation_for_each_clause": sort_clause_results(clause_results)
     }
+
+
+def iter_analysis_ndjson(url: str, body: str):
+    """
+    스트리밍 응답용 NDJSON 생성기.
+    카테고리 평가가 끝날 때마다 한 줄씩, 마지막에 overall_evaluation 한 줄을 내보낸다.
+    """
+    for event in iter_analysis_events(url, body):
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def lambda_handler(event, context):
+    params = event.get('queryStringParameters') or {}
+    runtime = get_runtime()
+
+    # 비동기 작업 상태 조회: ?job_id=<작업 id>
+    if params.get('job_id'):
+        status = get_job_status(params['job_id'], runtime.object_storage)
+        if status is None:
+            return _response(404, {'error': '작업을 찾을 수 없습니다.'})
+        return _response(200, status)
+
+    # url이 없거나 빈 문자열인 경우
+    if not params.get('url'):
+        return _response(400, {'error': 'url 파라미터가 필요합니다.'})
+
+    # body가 없거나 빈 문자열인 경우
+    if not event.get('body'):
+        return _response(400, {'error': '분석할 약관이 없습니다.'})
+
+    # 비동기 모드: ?mode=async, 본문은 S3에 저장하고 작업 id를 즉시 반환
+    if params.get('mode') == 'async':
+        job_id = submit_job(params['url'], event['body'], runtime.object_storage, runtime.job_queue)
+        return _response(202, {'job_id': job_id, 'status': JOB_QUEUED})
+
+    status_code, payload = analyze_tos(params['url'], event['body'])
+    return _response(status_code, payload)
+
+
+def job_worker_handler(event, context):
+    """
+    비동기 작업 워커. (SQS 트리거, ReportBatchItemFailures 사용)
+    실패한 메시지만 재시도되도록 batchItemFailures를 반환한다.
+    """
+    storage = get_runtime().object_storage
+    failures = failed_message_ids(
+        event.get('Records', []),
+        lambda message: process_job(message, storage, analyze_tos),
+    )
+    return {'batchItemFailures': [{'itemIdentifier': message_id} for message_id in failures]}
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+# LLM 응답 캐시
+# temperature=0 호출은 (모델, 추론 설정, 시스템 프롬프트, 메시지)가 같으면 같은 응답을 재사용할 수 있다.
+# - 1단계: 컨테이너 메모리의 LRU (크기 제한)
+# - 2단계: 영속 저장소 (로컬/테스트는 SQLite, 운영은 DynamoDB)
+# 메모리에 없으면 영속 저장소를 조회하고, 적중하면 메모리에도 올린다.
+
+
+def response_cache_key(model_id: str, inference_config: Dict[str, Any], system_instruction: str, message: str) -> str:
+    source = json.dumps(
+        {"model": model_id, "inference": inference_config, "system": system_instruction, "message": message},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class SQLiteResponseStore:
+    """로컬 파일(SQLite) 기반 영속 저장소. ":memory:"를 넘기면 테스트용 메모리 DB를 사용한다."""
+
+    def __init__(self, path: str):
+        import sqlite3
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (cache_key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE cache_key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, response) VALUES (?, ?)", (key, response)
+            )
+            self._conn.commit()
+
+
+class DynamoDBResponseStore:
+    """
+    DynamoDB 기반 영속 저장소.
+    테이블 키: cache_key (S), expires_at 속성을 TTL로 지정해 오래된 응답을 정리한다.
+    """
+
+    def __init__(self, table, ttl_seconds: int = 30 * 24 * 60 * 60):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        item = self.table.get_item(Key={"cache_key": key}).get("Item")
+        return item["response"] if item else None
+
+    def put(self, key: str, response: str) -> None:
+        self.table.put_item(Item={
+            "cache_key": key,
+            "response": response,
+            "expires_at": int(time.time()) + self.ttl_seconds,
+        })
+
+
+class ResponseCache:
+    """메모리 LRU + 선택적 영속 저장소로 구성된 응답 캐시. 적중/미스 횟수를 집계한다."""
+
+    def __init__(self, max_entries: int = 2048, persistent=None):
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, response: str) -> None:
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return response
+
+        if self.persistent is not None:
+            try:
+                response = self.persistent.get(key)
+            except Exception as err:
+                # 캐시 조회 실패는 분석 실패로 이어지지 않도록 미스로 처리
+                print(f"응답 캐시 조회 실패: {err}")
+                response = None
+            if response is not None:
+                self._remember(key, response)
+                with self._lock:
+                    self.persistent_hits += 1
+                return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, response: str) -> None:
+        self._remember(key, response)
+        if self.persistent is not None:
+            try:
+                self.persistent.put(key, response)
+            except Exception as err:
+                print(f"응답 캐시 저장 실패: {err}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.persistent_hits
+            total = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+            }
@@ -3,49 +3,337 @@
 # temperature, top_p는 기본값 temperature 0.2, top_p 0.9로 사용
 # 환각 억제 목적
 
-from typing import Any, Dict, List
-import boto3
-from botocore.config import Config
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from llm_cache import response_cache_key
+from llm_governor import error_code, get_limiter
+
+# 시스템 프롬프트 캐시(cachePoint) 사용 여부
+PROMPT_CACHE_ENABLED = os.environ.get("TERMLENS_PROMPT_CACHE", "1") != "0"
+
+# 프롬프트 캐시를 지원하는 모델 ID 접두사
+PROMPT_CACHE_MODEL_PREFIXES = ("amazon.nova", "anthropic.claude")
+
+# 응답 usage에서 누적하는 토큰 항목
+USAGE_KEYS = ("inputTokens", "outputTokens", "cacheReadInputTokens", "cacheWriteInputTokens")
+
+# 스트리밍 호출에서 누적하는 지연 시간 항목 (밀리초 합계, 평균은 streamCalls로 나눠 계산)
+STREAM_METRIC_KEYS = ("streamCalls", "firstTokenMs", "streamLatencyMs")
+
+# 소형 모델 배치(점수화/분류)를 converse_stream으로 받아 완성된 항목부터 처리할지 여부
+STREAM_RESPONSES_ENABLED = os.environ.get("TERMLENS_STREAM_RESPONSES", "1") != "0"
+
+
+# 출력 스키마가 주어진 호출을 도구 사용(toolConfig)으로 요청해 스키마에 맞는 JSON을 받을지 여부
+STRUCTURED_OUTPUT_ENABLED = os.environ.get("TERMLENS_STRUCTURED_OUTPUT", "1") != "0"
+
+# 도구 사용을 지원하는 모델 ID 접두사 (거부되면 해당 모델은 일반 텍스트 응답으로 전환)
+STRUCTURED_OUTPUT_MODEL_PREFIXES = ("amazon.nova", "anthropic.claude", "openai.gpt-oss")
+
+
+# 리전 간 추론 프로필 접두사 (예: "us.amazon.nova-micro-v1:0")
+INFERENCE_PROFILE_PREFIXES = ("us", "eu", "apac", "global")
+
+
+def _base_model_id(model_id: str) -> str:
+    prefix, _, rest = model_id.partition(".")
+    return rest if prefix in INFERENCE_PROFILE_PREFIXES else model_id
+
+
+def supports_prompt_cache(model_id: str) -> bool:
+    return _base_model_id(model_id).startswith(PROMPT_CACHE_MODEL_PREFIXES)
+
+
+def supports_structured_output(model_id: str) -> bool:
+    return _base_model_id(model_id).startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES)
+
+
+def list_output_schema(name: str, description: str, item_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON 배열을 출력하는 호출의 출력 스키마.
+    도구 입력은 객체여야 하므로 배열을 "results" 필드로 감싸고, 응답에서는 배열만 꺼내 돌려준다.
+    """
+    return {
+        "name": name,
+        "description": description,
+        "schema": {
+            "type": "object",
+            "properties": {"results": {"type": "array", "items": item_schema}},
+            "required": ["results"],
+        },
+        "result_key": "results",
+    }
+
+
+def object_output_schema(name: str, description: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON 객체를 출력하는 호출의 출력 스키마."""
+    return {"name": name, "description": description, "schema": schema, "result_key": None}
+
+
+def _tool_config(output_schema: Dict[str, Any]) -> Dict[str, Any]:
+    # 도구를 하나만 두고 반드시 그 도구를 호출하게 해, 응답이 스키마에 맞는 도구 입력으로만 오게 함
+    return {
+        "tools": [{
+            "toolSpec": {
+                "name": output_schema["name"],
+                "description": output_schema["description"],
+                "inputSchema": {"json": output_schema["schema"]},
+            }
+        }],
+        "toolChoice": {"tool": {"name": output_schema["name"]}},
+    }
+
+
+def _tool_result_text(output_schema: Dict[str, Any], tool_input: Any) -> str:
+    """도구 입력을 기존 프롬프트가 요구하던 형식(배열 또는 객체)의 JSON 문자열로 바꾼다."""
+    result_key = output_schema.get("result_key")
+    if result_key and isinstance(tool_input, dict) and result_key in tool_input:
+        tool_input = tool_input[result_key]
+    return json.dumps(tool_input, ensure_ascii=False)
+
 
 class LLMClient:
     
     # Bedrock 클라이언트 초기화
-    def __init__(self, temperature: float = 0.2, top_p: float = 0.9, small_model_id: str = "us.amazon.nova-micro-v1:0", large_model_id: str = "openai.gpt-oss-20b-1:0"):
+    def __init__(self, temperature: float = 0.2, top_p: float = 0.9, small_model_id: str = "us.amazon.nova-micro-v1:0", large_model_id: str = "openai.gpt-oss-20b-1:0", prompt_cache: bool = PROMPT_CACHE_ENABLED, response_cache=None, structured_output: bool = STRUCTURED_OUTPUT_ENABLED):
         
         self.temperature = temperature
         self.top_p = top_p
+        self.prompt_cache = prompt_cache
+        self.structured_output = structured_output
+
+        # 도구 사용을 거부한 모델 (이후 스키마 없이 호출)
+        self._schema_rejected = set()
+
+        # 응답 캐시 (llm_cache.ResponseCache, 지정한 경우에만 사용)
+        self.response_cache = response_cache
+
+        # 모델별 누적 토큰 사용량 (캐시 적중/기록 토큰 포함)
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._usage_lock = threading.Lock()
 
         # Bedrock 모델 ID를 소형/대형으로 분리해 보관
         self.small_model_id = small_model_id
         self.large_model_id = large_model_id
         
         # Bedrock 클라이언트 생성
+        # boto3/botocore는 임포트 비용이 커서 콜드 스타트 시 모듈 로드 단계가 아닌 실제 사용 시점에 불러옴
+        import boto3
+        from botocore.config import Config
+
         self.client = boto3.client(
             service_name="bedrock-runtime",
             region_name="us-west-2",
-            config=Config(max_pool_connections=50)
+            # 재시도는 모델별 동시성 조절기(llm_governor)가 담당하므로 botocore 자체 재시도는 끔
+            # (스로틀링 신호를 조절기가 직접 받아 동시성 한도를 줄이기 위함)
+            config=Config(max_pool_connections=50, retries={"total_max_attempts": 1, "mode": "standard"})
         )
 
     # Bedrock으로부터 응답 생성
     # 기본은 소형 모델, model_size="large" 전달 시 대형 모델 사용
-    def generate_response(self, system_instruction: str, message: str, model_size: str = "small", model_id: str = None) -> str:    
+    # output_schema(list_output_schema/object_output_schema)가 주어지면 도구 사용으로 스키마에 맞는 JSON을 요청하고,
+    # 응답은 스키마 없이 호출했을 때와 같은 형식의 JSON 문자열로 돌려줌
+    # validate(응답)가 주어지면 예외 없이 끝난 응답만 캐시에 넣음 (잘리거나 깨진 응답을 캐시해 같은 실패를 반복하지 않도록)
+    def generate_response(self, system_instruction: str, message: str, model_size: str = "small", model_id: str = None, output_schema: Optional[Dict[str, Any]] = None, validate: Optional[Callable[[str], Any]] = None) -> str:    
         
         selected_model = model_id
         if selected_model is None:
             selected_model = self.large_model_id if model_size == "large" else self.small_model_id
 
-        response = self.client.converse(
-            modelId=selected_model,
-            inferenceConfig={
-                "temperature": self.temperature,
-                # "topP": self.top_p
-            },
-            system=[{"text": system_instruction}],
-            messages=[{"role": "user", "content": [{"text": message}]}]
-        )
+        output_schema = self._output_schema(selected_model, output_schema)
+
+        # 같은 모델/설정/프롬프트/메시지로 받은 응답이 캐시에 있으면 재사용
+        cache_key = self._cache_key(selected_model, system_instruction, message, output_schema)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
+        # 모델별 동시성 한도 안에서 호출하고, 스로틀링 시 백오프 후 재시도
+        try:
+            response = get_limiter(selected_model).call(lambda: self.client.converse(
+                **self._request(selected_model, system_instruction, message, output_schema)
+            ))
+        except Exception as err:
+            if not self._reject_schema(selected_model, output_schema, err):
+                raise
+            return self.generate_response(system_instruction, message, model_id=selected_model, validate=validate)
+        self._record_usage(selected_model, response.get("usage", {}))
+
+        content = response['output']['message']['content']
+        tool_use = next((block["toolUse"] for block in content if "toolUse" in block), None)
+        if output_schema is not None and tool_use is not None:
+            text = _tool_result_text(output_schema, tool_use.get("input"))
         # 모델에 따라 응답 구조 처리
-        if selected_model.startswith("openai"):
-             return response['output']['message']['content'][-1]['text']
+        elif selected_model.startswith("openai"):
+             text = content[-1]['text']
         else:
-             return response['output']['message']['content'][0]['text']
\ No newline at end of file
+             text = content[0]['text']
+
+        self._store_response(cache_key, text, validate)
+        return text
+
+    # converse_stream으로 응답을 받으며, 텍스트 조각이 올 때마다 on_text(지금까지 받은 응답 전체)를 호출
+    # 스로틀링/일시적 오류로 다시 시도하면 on_text는 새 응답으로 처음부터 다시 호출됨
+    # 캐시된 응답은 on_text를 한 번만 호출하고, 반환값은 generate_response와 같은 전체 응답
+    # output_schema가 배열 스키마면 도구 입력 조각에서 감싼 객체를 벗긴 배열 부분만 on_text로 넘김 (텍스트 조각은 넘기지 않음)
+    def generate_response_stream(self, system_instruction: str, message: str, on_text: Callable[[str], None], model_size: str = "small", model_id: str = None, output_schema: Optional[Dict[str, Any]] = None, validate: Optional[Callable[[str], Any]] = None) -> str:
+
+        selected_model = model_id
+        if selected_model is None:
+            selected_model = self.large_model_id if model_size == "large" else self.small_model_id
+
+        output_schema = self._output_schema(selected_model, output_schema)
+
+        cache_key = self._cache_key(selected_model, system_instruction, message, output_schema)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                on_text(cached)
+                return cached
+
+        result_prefix = None
+        if output_schema is not None and output_schema.get("result_key"):
+            result_prefix = re.compile(r'\s*\{\s*"%s"\s*:\s*' % re.escape(output_schema["result_key"]))
+
+        def stream():
+            started = time.monotonic()
+            response = self.client.converse_stream(
+                **self._request(selected_model, system_instruction, message, output_schema)
+            )
+            text = ""
+            tool_text = None
+            first_token = None
+            usage: Dict[str, Any] = {}
+            for event in response["stream"]:
+                if "contentBlockDelta" in event:
+                    delta = event["contentBlockDelta"]["delta"]
+                    if "toolUse" in delta:
+                        tool_text = (tool_text or "") + delta["toolUse"].get("input", "")
+                        if first_token is None:
+                            first_token = time.monotonic() - started
+                        match = result_prefix.match(tool_text) if result_prefix else None
+                        if match:
+                            on_text(tool_text[match.end():])
+                        continue
+                    # 추론 모델(openai)의 reasoningContent 조각은 건너뛰고 답변 텍스트만 사용
+                    delta = delta.get("text")
+                    if not delta:
+                        continue
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                    text += delta
+                    # 도구 사용을 요청했다면 텍스트 조각은 도구 호출 전의 설명(<thinking> 등)이므로 넘기지 않음
+                    if output_schema is None:
+                        on_text(text)
+                elif "metadata" in event:
+                    usage = event["metadata"].get("usage", {})
+            elapsed = time.monotonic() - started
+            if tool_text is not None:
+                try:
+                    text = _tool_result_text(output_schema, json.loads(tool_text))
+                except ValueError:
+                    # 도구 입력이 잘려 있으면 보정 파싱에 맡김
+                    text = tool_text
+            return text, usage, elapsed if first_token is None else first_token, elapsed
+
+        try:
+            text, usage, first_token, elapsed = get_limiter(selected_model).call(stream)
+        except Exception as err:
+            if not self._reject_schema(selected_model, output_schema, err):
+                raise
+            return self.generate_response_stream(system_instruction, message, on_text, model_id=selected_model, validate=validate)
+        self._record_usage(selected_model, usage)
+        self._record_stream(selected_model, first_token, elapsed)
+
+        self._store_response(cache_key, text, validate)
+        return text
+
+    def _store_response(self, cache_key: Optional[str], text: str, validate: Optional[Callable[[str], Any]]) -> None:
+        """응답을 캐시에 넣는다. validate가 예외를 던지면 넣지 않는다. (예외는 호출한 쪽의 파싱에서 다시 발생)"""
+        if cache_key is None:
+            return
+        if validate is not None:
+            try:
+                validate(text)
+            except Exception as err:
+                print(f"응답 파싱 실패, 캐시하지 않음: {err}")
+                return
+        self.response_cache.put(cache_key, text)
+
+    def _output_schema(self, model_id: str, output_schema: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """이 모델에 실제로 적용할 출력 스키마 (사용하지 않으면 None)"""
+        if (
+            output_schema is None
+            or not self.structured_output
+            or not supports_structured_output(model_id)
+            or model_id in self._schema_rejected
+        ):
+            return None
+        return output_schema
+
+    def _reject_schema(self, model_id: str, output_schema: Optional[Dict[str, Any]], err: Exception) -> bool:
+        """도구 설정이 거부(ValidationException)되면 이 모델은 이후 스키마 없이 호출하도록 기록한다."""
+        if output_schema is None or error_code(err) != "ValidationException" or "tool" not in str(err).lower():
+            return False
+        self._schema_rejected.add(model_id)
+        print(f"[{model_id}] 구조화 출력(도구 사용) 거부, 일반 응답으로 전환: {err}")
+        return True
+
+    def _cache_key(self, model_id: str, system_instruction: str, message: str, output_schema: Optional[Dict[str, Any]]) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        inference_config = self._inference_config()
+        if output_schema is not None:
+            inference_config["outputSchema"] = output_schema["schema"]
+        return response_cache_key(model_id, inference_config, system_instruction, message)
+
+    def _request(self, model_id: str, system_instruction: str, message: str, output_schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        request = {
+            "modelId": model_id,
+            "inferenceConfig": self._inference_config(),
+            "system": self._system_blocks(system_instruction, model_id),
+            "messages": [{"role": "user", "content": [{"text": message}]}],
+        }
+        if output_schema is not None:
+            request["toolConfig"] = _tool_config(output_schema)
+        return request
+
+    def _inference_config(self) -> Dict[str, Any]:
+        return {
+            "temperature": self.temperature,
+            # "topP": self.top_p
+        }
+
+    # 시스템 프롬프트는 호출마다 동일하므로, 지원 모델이면 그 뒤에 캐시 지점을 둬 재사용
+    def _system_blocks(self, system_instruction: str, model_id: str) -> List[Dict[str, Any]]:
+        system = [{"text": system_instruction}]
+        if self.prompt_cache and supports_prompt_cache(model_id):
+            system.append({"cachePoint": {"type": "default"}})
+        return system
+
+    def _record_usage(self, model_id: str, usage: Dict[str, Any]) -> None:
+        with self._usage_lock:
+            totals = self._usage.setdefault(model_id, {key: 0 for key in ("calls",) + USAGE_KEYS + STREAM_METRIC_KEYS})
+            totals["calls"] += 1
+            for key in USAGE_KEYS:
+                totals[key] += int(usage.get(key, 0) or 0)
+
+    def _record_stream(self, model_id: str, first_token_seconds: float, elapsed_seconds: float) -> None:
+        with self._usage_lock:
+            totals = self._usage[model_id]
+            totals["streamCalls"] += 1
+            totals["firstTokenMs"] += int(first_token_seconds * 1000)
+            totals["streamLatencyMs"] += int(elapsed_seconds * 1000)
+
+    # 모델별 누적 토큰 사용량
+    # { model_id: { "calls", "inputTokens", "outputTokens", "cacheReadInputTokens", "cacheWriteInputTokens",
+    #               "streamCalls", "firstTokenMs", "streamLatencyMs" } }
+    def usage_snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._usage_lock:
+            return {model_id: dict(totals) for model_id, totals in self._usage.items()}
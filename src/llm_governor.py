@@ -0,0 +1,198 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+
+# Bedrock 호출 동시성 조절기 (프로세스 전역, 모델별)
+# - 모델별로 동시에 진행 중인 호출 수를 제한하고, 한도를 넘는 호출은 자리가 날 때까지 기다린다.
+# - 한도는 AIMD로 조절한다: 성공하면 한도만큼 성공할 때마다 1씩 늘리고,
+#   스로틀링(또는 지연 시간 목표 초과)이 발생하면 절반으로 줄인다.
+# - 스로틀링/일시적 오류는 지터를 섞은 지수 백오프 후 다시 시도한다.
+# 단계별 스레드 풀 크기와 관계없이 계정의 실제 할당량 근처에서 처리량을 유지하기 위함
+
+T = TypeVar("T")
+
+INITIAL_CONCURRENCY = int(os.environ.get("TERMLENS_LLM_INITIAL_CONCURRENCY", "8"))
+# LLMClient의 max_pool_connections=50 이하로 유지
+MAX_CONCURRENCY = int(os.environ.get("TERMLENS_LLM_MAX_CONCURRENCY", "48"))
+MAX_RETRIES = int(os.environ.get("TERMLENS_LLM_MAX_RETRIES", "6"))
+# 0이면 지연 시간 신호는 사용하지 않음
+LATENCY_TARGET_SECONDS = float(os.environ.get("TERMLENS_LLM_LATENCY_TARGET_SECONDS", "0"))
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 20.0
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+}
+TRANSIENT_ERROR_CODES = {
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelNotReadyException",
+    "ModelTimeoutException",
+    "ModelStreamErrorException",
+}
+# 응답 전에 연결이 끊기거나 읽기 시간이 초과된 경우 (ClientError가 아니어서 오류 코드가 없음)
+# botocore는 임포트 비용이 커서 여기서 불러오지 않고 예외 클래스 이름으로 판별한다.
+TRANSIENT_NETWORK_ERRORS = {
+    "ConnectionError",
+    "EndpointConnectionError",
+    "ConnectTimeoutError",
+    "ConnectionClosedError",
+    "ReadTimeoutError",
+}
+
+
+def error_code(err: Exception) -> Optional[str]:
+    """
+    botocore ClientError에서 오류 코드를 꺼낸다. (그 외 예외는 None)
+    스트리밍 응답 중의 오류(EventStreamError)는 "throttlingException"처럼 첫 글자가 소문자이므로 맞춰 준다.
+    """
+    response = getattr(err, "response", None)
+    if not isinstance(response, dict):
+        return None
+    code = response.get("Error", {}).get("Code")
+    return code[:1].upper() + code[1:] if code else code
+
+
+def is_transient_network_error(err: Exception) -> bool:
+    """botocore의 연결 오류(ConnectionError 계열)나 읽기 시간 초과(ReadTimeoutError)인지 확인한다."""
+    return any(
+        cls.__module__.startswith("botocore") and cls.__name__ in TRANSIENT_NETWORK_ERRORS
+        for cls in type(err).__mro__
+    )
+
+
+def is_retryable(err: Exception) -> bool:
+    """다시 시도할 오류: 스로틀링, 일시적 서비스 오류, 일시적 네트워크 오류"""
+    code = error_code(err)
+    return code in THROTTLING_ERROR_CODES or code in TRANSIENT_ERROR_CODES or is_transient_network_error(err)
+
+
+class AdaptiveConcurrencyLimiter:
+    """모델 하나에 대한 AIMD 동시성 한도."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = INITIAL_CONCURRENCY,
+        max_limit: int = MAX_CONCURRENCY,
+        min_limit: int = 1,
+        latency_target_seconds: float = LATENCY_TARGET_SECONDS,
+        max_retries: int = MAX_RETRIES,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.latency_target_seconds = latency_target_seconds
+        self.max_retries = max_retries
+        self._sleep = sleep
+
+        self._limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def _decrease(self, reason: str, started: float) -> None:
+        # 한 번의 스로틀링 폭주로 동시에 실패한 호출들이 한도를 여러 번 줄이지 않도록
+        # 마지막 감소 이후에 시작한 호출의 신호만 반영
+        if started < self._last_decrease:
+            return
+        self._last_decrease = time.monotonic()
+        self._limit = max(float(self.min_limit), self._limit / 2)
+        print(f"[{self.name}] 동시성 한도 감소({reason}): {int(self._limit)}")
+
+    def _release(self, started: float, throttled: bool = False, succeeded: bool = False) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            latency = time.monotonic() - started
+            if succeeded:
+                self.calls += 1
+            if throttled:
+                self.throttled += 1
+                self._decrease("스로틀링", started)
+            elif succeeded and 0 < self.latency_target_seconds < latency:
+                self._decrease("지연 시간", started)
+            elif succeeded:
+                # 한도만큼 성공할 때마다 1씩 증가
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(최대값, 기본값 * 2^attempt)
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """한도 안에서 fn을 실행하고, 스로틀링/일시적 오류는 백오프 후 다시 시도한다."""
+        attempt = 0
+        while True:
+            self._acquire()
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as err:
+                throttled = error_code(err) in THROTTLING_ERROR_CODES
+                self._release(started, throttled=throttled)
+                if not is_retryable(err) or attempt >= self.max_retries:
+                    raise
+                with self._cond:
+                    self.retries += 1
+                self._sleep(self._backoff_seconds(attempt))
+                attempt += 1
+                continue
+
+            self._release(started, succeeded=True)
+            return result
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "retries": self.retries,
+            }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(model_id: str) -> AdaptiveConcurrencyLimiter:
+    """모델별 동시성 조절기를 반환한다. (프로세스 전역에서 공유)"""
+    with _limiters_lock:
+        limiter = _limiters.get(model_id)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(model_id)
+            _limiters[model_id] = limiter
+        return limiter
+
+
+def reset_limiters() -> None:
+    """모든 조절기를 버린다. (테스트/벤치마크용)"""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,172 @@
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from analysis_lease import DynamoDBLeaseStore
+from async_jobs import S3ObjectStorage, SQSJobQueue
+from checkpoint_store import DynamoDBCheckpointStore
+from llm_cache import DynamoDBResponseStore, ResponseCache, SQLiteResponseStore
+from llm_client import LLMClient
+from sentence_store import DynamoDBSentenceStore
+
+
+# Lambda 컨테이너(웜 스타트) 단위로 재사용하는 런타임 자원
+# - DynamoDB 리소스/테이블, Bedrock 클라이언트(LLMClient)와 응답 캐시, 공유 스레드 풀
+# - 최초 사용 시점에 한 번만 생성하고, 이후 호출에서는 TLS 연결과 스레드를 그대로 재사용한다.
+# - 테스트에서는 set_runtime(RuntimeContext(...))으로 가짜 객체를 주입한다.
+
+ANALYSIS_TABLE_NAME = "termlens-tos-analysis"
+CONTENT_BUCKET_NAME = os.environ.get("TERMLENS_CONTENT_BUCKET", "termlens-tos-content")
+JOB_QUEUE_NAME = "termlens-tos-jobs"
+SENTENCE_TABLE_NAME = "termlens-sentence-results"
+CHECKPOINT_TABLE_NAME = "termlens-tos-checkpoints"
+LEASE_TABLE_NAME = "termlens-tos-leases"
+RESPONSE_CACHE_TABLE_NAME = "termlens-llm-responses"
+
+# LLM 응답 캐시: ""(사용 안 함), "memory", "dynamodb", "sqlite:<파일 경로>"
+RESPONSE_CACHE_MODE = os.environ.get("TERMLENS_RESPONSE_CACHE", "")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("TERMLENS_RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+
+# 공유 스레드 풀 크기 (LLMClient의 max_pool_connections=50 이하로 유지)
+DEFAULT_MAX_WORKERS = int(os.environ.get("TERMLENS_MAX_WORKERS", "32"))
+
+
+class RuntimeContext:
+    """
+    지연 생성되는 런타임 자원 모음.
+    생성자 인자로 넘긴 객체는 그대로 사용하고, 넘기지 않은 객체는 처음 접근할 때 만든다.
+    """
+
+    def __init__(
+        self,
+        dynamodb=None,
+        llm_client: Optional[LLMClient] = None,
+        executor: Optional[Executor] = None,
+        sentence_store=None,
+        checkpoint_store=None,
+        object_storage=None,
+        job_queue=None,
+        lease_store=None,
+        tables: Optional[Dict[str, object]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self._dynamodb = dynamodb
+        self._llm_client = llm_client
+        self._executor = executor
+        self._sentence_store = sentence_store
+        self._checkpoint_store = checkpoint_store
+        self._object_storage = object_storage
+        self._job_queue = job_queue
+        self._lease_store = lease_store
+        self._tables: Dict[str, object] = dict(tables or {})
+        self.max_workers = max_workers
+        self._lock = threading.RLock()
+
+    @property
+    def dynamodb(self):
+        with self._lock:
+            if self._dynamodb is None:
+                import boto3
+                self._dynamodb = boto3.resource("dynamodb")
+            return self._dynamodb
+
+    def table(self, name: str):
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = self.dynamodb.Table(name)
+            return self._tables[name]
+
+    @property
+    def llm_client(self) -> LLMClient:
+        with self._lock:
+            if self._llm_client is None:
+                self._llm_client = LLMClient(temperature=0, response_cache=self._build_response_cache())
+            return self._llm_client
+
+    def _build_response_cache(self) -> Optional[ResponseCache]:
+        if not RESPONSE_CACHE_MODE:
+            return None
+        persistent = None
+        if RESPONSE_CACHE_MODE == "dynamodb":
+            persistent = DynamoDBResponseStore(self.table(RESPONSE_CACHE_TABLE_NAME))
+        elif RESPONSE_CACHE_MODE.startswith("sqlite:"):
+            persistent = SQLiteResponseStore(RESPONSE_CACHE_MODE[len("sqlite:"):])
+        return ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, persistent)
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="termlens"
+                )
+            return self._executor
+
+    @property
+    def sentence_store(self):
+        with self._lock:
+            if self._sentence_store is None:
+                self._sentence_store = DynamoDBSentenceStore(self.table(SENTENCE_TABLE_NAME))
+            return self._sentence_store
+
+    @property
+    def checkpoint_store(self):
+        with self._lock:
+            if self._checkpoint_store is None:
+                self._checkpoint_store = DynamoDBCheckpointStore(self.table(CHECKPOINT_TABLE_NAME))
+            return self._checkpoint_store
+
+    @property
+    def object_storage(self):
+        with self._lock:
+            if self._object_storage is None:
+                self._object_storage = S3ObjectStorage(CONTENT_BUCKET_NAME)
+            return self._object_storage
+
+    @property
+    def job_queue(self):
+        with self._lock:
+            if self._job_queue is None:
+                queue_url = os.environ.get("TERMLENS_JOB_QUEUE_URL")
+                if not queue_url:
+                    import boto3
+                    queue_url = boto3.client("sqs").get_queue_url(QueueName=JOB_QUEUE_NAME)["QueueUrl"]
+                self._job_queue = SQSJobQueue(queue_url)
+            return self._job_queue
+
+    @property
+    def lease_store(self):
+        with self._lock:
+            if self._lease_store is None:
+                self._lease_store = DynamoDBLeaseStore(self.table(LEASE_TABLE_NAME))
+            return self._lease_store
+
+
+_runtime: Optional[RuntimeContext] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> RuntimeContext:
+    """현재 컨테이너의 런타임 컨텍스트를 반환한다. (없으면 생성)"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = RuntimeContext()
+        return _runtime
+
+
+def set_runtime(runtime: Optional[RuntimeContext]) -> None:
+    """런타임 컨텍스트를 교체한다. None을 넘기면 다음 접근 시 새로 생성된다."""
+    global _runtime
+    with _runtime_lock:
+        _runtime = runtime
+
+
+def get_executor() -> Executor:
+    """
+    단계 간 공유하는 스레드 풀.
+    풀 안에서 실행 중인 작업이 다시 이 풀에 작업을 제출하고 기다리면 교착될 수 있으므로,
+    단계 함수는 풀 바깥(핸들러 스레드)에서 호출한다.
+    """
+    return get_runtime().executor
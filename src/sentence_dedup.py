@@ -0,0 +1,95 @@
+import os
+import zlib
+from typing import Dict, List, Set
+
+from sentence_store import normalize_sentence
+
+
+# 문서 내 유사 문장 중복 제거
+# 유료/무료 서비스 장 등에 거의 같은 조항이 반복되면 대표 문장 하나만 모델에 보내고,
+# 결과는 id로 같은 묶음의 나머지 문장에 그대로 복사한다.
+# - 문장을 문자 n-gram(shingle) 집합으로 바꾸고, 한 번의 해시로 MinHash 서명을 만든다. (one permutation hashing)
+# - 서명을 band로 나눠 같은 band 값을 가진 문장만 후보로 보고, 실제 Jaccard 유사도로 확인한다.
+# 문장마다 shingle 수에 비례하는 시간만 쓰므로 문장 수에 대해 선형이다.
+
+DEDUP_ENABLED = os.environ.get("TERMLENS_DEDUP", "1") != "0"
+# 이 값 이상의 Jaccard 유사도(shingle 기준)를 가진 문장을 같은 묶음으로 본다
+DEDUP_THRESHOLD = float(os.environ.get("TERMLENS_DEDUP_THRESHOLD", "0.85"))
+
+SHINGLE_SIZE = 5
+NUM_BINS = 32
+BANDS = 4
+ROWS_PER_BAND = NUM_BINS // BANDS
+
+_EMPTY = -1
+
+
+def _shingles(text: str) -> Set[str]:
+    # 공백 차이는 무시
+    text = normalize_sentence(text).replace(" ", "")
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _signature(shingles: Set[str]) -> List[int]:
+    # shingle마다 해시 한 번: 하위 비트로 bin을 고르고 나머지 비트의 최솟값을 기록
+    # 내장 hash()는 프로세스마다 값이 달라지므로(PYTHONHASHSEED) 실행마다 같은 묶음이 나오도록 CRC32를 사용
+    bins = [_EMPTY] * NUM_BINS
+    for shingle in shingles:
+        value = zlib.crc32(shingle.encode("utf-8"))
+        index = value % NUM_BINS
+        value //= NUM_BINS
+        if bins[index] == _EMPTY or value < bins[index]:
+            bins[index] = value
+    # 빈 bin은 오른쪽으로 가장 가까운 채워진 bin 값으로 채운다 (rotation densification)
+    filled = [value for value in bins if value != _EMPTY]
+    if len(filled) < NUM_BINS and filled:
+        for index in range(NUM_BINS):
+            if bins[index] != _EMPTY:
+                continue
+            offset = 1
+            while bins[(index + offset) % NUM_BINS] == _EMPTY:
+                offset += 1
+            bins[index] = bins[(index + offset) % NUM_BINS] + offset
+    return bins
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _find(parent: List[int], index: int) -> int:
+    while parent[index] != index:
+        parent[index] = parent[parent[index]]
+        index = parent[index]
+    return index
+
+
+def representatives(sentences: List[str], threshold: float = DEDUP_THRESHOLD) -> List[int]:
+    """
+    문장마다 같은 묶음의 대표 문장 위치를 반환한다. (대표는 묶음에서 가장 앞선 문장)
+    대표 문장 자신은 자기 위치를 가리킨다.
+    """
+    parent = list(range(len(sentences)))
+    shingle_sets = [_shingles(sentence) for sentence in sentences]
+
+    def union(a: int, b: int) -> None:
+        root_a, root_b = _find(parent, a), _find(parent, b)
+        if root_a != root_b:
+            # 앞선 문장이 대표가 되도록
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    buckets: List[Dict[tuple, int]] = [{} for _ in range(BANDS)]
+    for index, shingles in enumerate(shingle_sets):
+        signature = _signature(shingles)
+        for band in range(BANDS):
+            band_key = tuple(signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND])
+            first = buckets[band].setdefault(band_key, index)
+            # 같은 band 값을 가진 첫 문장과만 비교해 선형 시간을 유지
+            if first != index and _jaccard(shingle_sets[first], shingles) >= threshold:
+                union(first, index)
+
+    return [_find(parent, index) for index in range(len(sentences))]
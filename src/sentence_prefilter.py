@@ -0,0 +1,153 @@
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sentence_record import SentenceRecord
+
+
+# 규칙 기반 문장 사전 분류
+# 조항 제목, 목차, 연락처, 용어 정의, 시행일 같은 구조적 문장은 확실히 낮은 점수로,
+# 면책·자동 갱신·환불 불가 등 명백한 위험 조항은 확실히 높은 점수로 먼저 정하고
+# 나머지 애매한 문장만 모델에 보낸다.
+# 낮은 점수 규칙은 위에서부터 순서대로 검사하며, 먼저 일치한 규칙의 점수를 사용한다.
+# 위험 규칙과 낮은 점수 규칙이 함께 일치하는 문장(번호 붙은 짧은 위험 조항 등)은 모델에 맡긴다.
+
+PREFILTER_ENABLED = os.environ.get("TERMLENS_PREFILTER", "1") != "0"
+
+# 위험 어휘가 있어도 이 길이보다 짧으면 제목일 가능성이 커 모델에 맡김
+MIN_HIGH_RISK_LENGTH = 20
+
+# 제목 판별: 줄 전체가 번호/제N조와 짧은 명사형 제목일 때만 제목으로 본다.
+# 주어·목적어 조사(은/는/을/를)가 있거나 서술어(~다, ~음, ~함, ~됨, 아님)로 끝나면 본문 문장이므로 제외
+_NOT_CLAUSE = r"(?!.*[가-힣](?:은|는|을|를)(?:\s|$))(?!.*(?:다|음|함|됨|아님)\s*[.。]?\s*$)"
+_PAREN_TITLE = r"[\(\[【<「][^\)\]】>」]{0,40}[\)\]】>」]"
+_KO_TITLE = r"[가-힣0-9·ㆍ/&\s-]{1,30}"
+# 영어 제목은 각 단어가 대문자로 시작 (관사·전치사·접속사 제외): "Payment Terms", "Limitation of Liability"
+_EN_TITLE = (
+    r"[A-Z0-9][\w'’&/-]*"
+    r"(?:\s+(?:[A-Z0-9][\w'’&/-]*|and|or|of|the|for|to|in|on|with|by|a|an|&)){0,7}"
+)
+_HEADING_NUMBER = r"(?:제\s*\d+\s*(?:조|장|절|관)(?:\s*의\s*\d+)?|(?i:Article|Section|Chapter)\s+[\dIVX]+)"
+
+_LOW_SCORE_RULES: List[Tuple[str, int, "re.Pattern"]] = [
+    # 제1조 (목적) / 제3조의2【정의】 / 제5조 요금 / Article 5. Termination
+    ("heading", 1, re.compile(
+        rf"^\s*{_NOT_CLAUSE}{_HEADING_NUMBER}\s*[.:]?\s*(?:{_PAREN_TITLE}|{_KO_TITLE}|{_EN_TITLE})?\s*$"
+    )),
+    # 1. 개요 / 2.3 Payment Terms (문장 부호 없이 짧은 번호 제목)
+    ("heading", 1, re.compile(rf"^\s*{_NOT_CLAUSE}\d+(?:\.\d+)*\.?\s+(?:{_KO_TITLE}|{_EN_TITLE})\s*$")),
+    # 목차: 점선 뒤 쪽 번호, 또는 줄 전체가 조항 제목 나열 (본문에서 조항을 인용하는 문장은 제외)
+    ("toc", 1, re.compile(r"(?:\.{4,}|…{2,}|·{4,})\s*\d+\s*$")),
+    ("toc", 1, re.compile(
+        rf"^\s*{_NOT_CLAUSE}(?:제\s*\d+\s*조(?:\s*의\s*\d+)?\s*(?:{_PAREN_TITLE}|{_KO_TITLE})?\s*[,·|/]?\s*){{3,}}$"
+    )),
+    # 연락처/사업자 정보: 문장 전체가 연락처이거나 사업자 정보 항목으로 시작할 때만
+    ("contact", 1, re.compile(
+        r"^\s*(?:(?:E-?mail|이메일|문의)\s*[:：]?\s*)?[\w.+-]+@[\w-]+\.[\w.-]+\s*$",
+        re.IGNORECASE,
+    )),
+    ("contact", 1, re.compile(
+        r"^\s*(?:(?:Tel|Fax|Phone|전화(?:\s*번호)?|팩스|문의)\s*[:：]?\s*)?"
+        r"(?:\+?\d{1,3}[-.\s])?\(?\d{2,4}\)?[-.\s]\d{3,4}[-.\s]\d{4}\s*$",
+        re.IGNORECASE,
+    )),
+    ("contact", 1, re.compile(
+        r"^\s*(?:사업자\s*등록\s*번호|통신\s*판매업\s*신고|대표\s*(?:이사|자)\s*[:：]|고객\s*센터\s*[:：]|주\s*소\s*[:：]|"
+        r"(?:Tel|Fax|Phone|E-?mail)\s*[:：])",
+        re.IGNORECASE,
+    )),
+    # 시행일/부칙: 날짜 뒤에 다른 내용이 이어지지 않는 독립된 줄만 ("…부터 적용되며, 이의를 …"는 동의 간주 조항)
+    ("effective_date", 1, re.compile(r"^\s*\[?\s*부\s*칙\s*\]?\s*$")),
+    ("effective_date", 1, re.compile(
+        r"^\s*(?:(?:이|본)\s*(?:약관|방침|정책)은\s*)?\d{4}\s*년\s*\d{1,2}\s*월\s*\d{1,2}\s*일\s*(?:부터|자로)?\s*"
+        r"(?:시행|적용)(?:합니다|한다|됩니다|된다)?\s*[.。]?\s*$"
+    )),
+    ("effective_date", 1, re.compile(
+        r"^\s*(?:시행|공고|적용)\s*일(?:자)?\s*[:：]?\s*\d{4}\s*(?:년\s*\d{1,2}\s*월\s*\d{1,2}\s*일|[.\-/]\s*\d{1,2}\s*[.\-/]\s*\d{1,2}\.?)\s*$"
+    )),
+    ("effective_date", 1, re.compile(
+        r"^\s*(?:effective|last\s+updated|last\s+modified)(?:\s+date|\s+as\s+of|\s+on)?\s*[:：]?\s*"
+        r"(?:[A-Za-z]+\s+\d{1,2},?\s+\d{4}|\d{4}-\d{2}-\d{2})\s*\.?\s*$",
+        re.IGNORECASE,
+    )),
+    # 용어 정의: "회원"이란 ... / "Service" means ...
+    ("definition", 2, re.compile(r"^\s*\d*[.)]?\s*[\"'“‘「『][^\"'”’」』]{1,30}[\"'”’」』]\s*(?:이?란|(?:이)?라\s*함은|means|refers\s+to)\s", re.IGNORECASE)),
+    ("definition", 2, re.compile(r"(?:용어의\s*정의는\s*다음과\s*같|the\s+following\s+definitions\s+apply)", re.IGNORECASE)),
+]
+
+# 위험 규칙
+# - 그 자체가 부정형인 위험 표현(책임을 지지 않음, 환불 불가 등)은 그대로 위험으로 본다.
+# - 그 외 위험 표현(면책, 자동 갱신, 사전 동의 없이, 제3자 제공 등)은 문장에 부정 표현이 있으면
+#   ("면책되지 않습니다", "제공하지 않습니다", "never sell") 보호 조항일 수 있으므로 모델에 맡긴다.
+_NEGATIVE_RISK_RULE = re.compile(
+    r"(?:책임을?\s*(?:지지|부담하지)\s*(?:않|아니)|책임이\s*없|"
+    r"환불(?:이|은)?\s*(?:불가|(?:되지|하지)\s*(?:않|아니))|"
+    r"not\s+(?:be\s+)?liable|no\s+liability|non-?refundable)",
+    re.IGNORECASE,
+)
+
+_HIGH_RISK_RULE = re.compile(
+    r"(?:면책|자동(?:으로)?\s*(?:갱신|연장|결제)|사전\s*(?:통지|고지|동의)\s*없이|일방적으로|"
+    r"제\s*3\s*자에게\s*(?:제공|판매|공유)|"
+    r"without\s+(?:prior\s+)?notice|automatically\s+renew|"
+    r"binding\s+arbitration|class\s+action\s+waiver|waive\s+(?:any|your)\s+right|"
+    r"(?:sell|share)\s+your\s+(?:personal\s+)?(?:data|information))",
+    re.IGNORECASE,
+)
+
+_NEGATION_RULE = re.compile(
+    r"(?:지\s*(?:않|아니|못)|금지|\b(?:not|never|no\s+longer|cannot|can't|won't|don't|doesn't)\b)",
+    re.IGNORECASE,
+)
+
+# 계정 정지·삭제는 회사가 주체일 때만 위험 조항 ("회원은 언제든지 계정을 삭제할 수 있습니다"는 권리 조항)
+_ACCOUNT_ACTION_RULE = re.compile(
+    r"계정을?\s*(?:정지|해지|삭제|이용\s*제한)|(?:terminate|suspend)\s+your\s+account",
+    re.IGNORECASE,
+)
+_COMPANY_ACTOR_RULE = re.compile(
+    r"(?:회사|당사|운영자|서비스\s*제공자)\s*(?:는|은|가|의\s*판단)|\b(?:we|the\s+company)\b",
+    re.IGNORECASE,
+)
+
+
+def _is_high_risk(sentence: str) -> bool:
+    if _NEGATIVE_RISK_RULE.search(sentence):
+        return True
+    risky = _HIGH_RISK_RULE.search(sentence) or (
+        _ACCOUNT_ACTION_RULE.search(sentence) and _COMPANY_ACTOR_RULE.search(sentence)
+    )
+    return bool(risky) and not _NEGATION_RULE.search(sentence)
+
+
+def prefilter_sentence(sentence: str) -> Optional[Tuple[int, str]]:
+    """
+    규칙으로 점수를 확정할 수 있으면 (중요도 점수, 규칙 이름)을, 애매하면 None을 반환한다.
+    위험 규칙과 낮은 점수 규칙이 함께 일치하면 점수를 정하지 않고 모델에 맡긴다.
+    """
+    high_risk = _is_high_risk(sentence)
+    for rule, score, pattern in _LOW_SCORE_RULES:
+        if pattern.search(sentence):
+            return None if high_risk else (score, rule)
+    if high_risk and len(sentence) >= MIN_HIGH_RISK_LENGTH:
+        return 5, "high_risk"
+    return None
+
+
+def prefilter_records(records: List[SentenceRecord]) -> Tuple[Set[int], Dict[str, int]]:
+    """
+    records(SentenceRecord)에 규칙을 적용해 확정된 문장에 importance_score를 기록한다.
+    반환값: (규칙으로 점수를 확정한 id 집합, 규칙별 문장 수)
+    """
+    decided: Set[int] = set()
+    stats: Counter = Counter()
+    for record in records:
+        result = prefilter_sentence(record.sentence)
+        if result is None:
+            continue
+        score, rule = result
+        record.importance_score = score
+        decided.add(record.id)
+        stats[rule] += 1
+    return decided, dict(stats)
@@ -0,0 +1,92 @@
+from typing import Dict, List, Optional, Tuple
+
+
+# 파이프라인 전체에서 쓰는 문장 레코드
+# 정규화된 약관 본문(text)에서의 위치(start, end)와 분석 결과(중요도, 카테고리)만 보관하고,
+# 문장 문자열은 모델 메시지나 규칙 매칭처럼 실제로 필요한 곳에서 text를 잘라 쓴다.
+# 같은 문서의 레코드는 모두 같은 text 객체를 참조한다.
+
+
+class SentenceRecord:
+    """문장 하나의 위치와 분석 결과. importance_score/category는 정해지기 전까지 None이다."""
+
+    __slots__ = ("id", "start", "end", "text", "importance_score", "category")
+
+    def __init__(
+        self,
+        id: int,
+        start: int,
+        end: int,
+        text: str,
+        importance_score: Optional[int] = None,
+        category: Optional[str] = None,
+    ):
+        self.id = id
+        self.start = start
+        self.end = end
+        self.text = text
+        self.importance_score = importance_score
+        self.category = category
+
+    @property
+    def sentence(self) -> str:
+        return self.text[self.start:self.end]
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        return self.start, self.end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return (
+            f"SentenceRecord(id={self.id}, span={self.span}, importance_score={self.importance_score}, "
+            f"category={self.category!r}, sentence={self.sentence[:30]!r})"
+        )
+
+    def result(self) -> Dict:
+        """문장 결과 저장소에 기록할 분석 결과 { "importance_score", "category" }"""
+        result = {"importance_score": self.importance_score}
+        if self.category:
+            result["category"] = self.category
+        return result
+
+    def to_dict(self) -> Dict:
+        """체크포인트용 직렬화 형식 (본문 제외) { "id", "start", "end", "importance_score"?, "category"? }"""
+        item = {"id": self.id, "start": self.start, "end": self.end}
+        if self.importance_score is not None:
+            item["importance_score"] = self.importance_score
+        if self.category is not None:
+            item["category"] = self.category
+        return item
+
+    @classmethod
+    def from_dict(cls, item: Dict, text: str) -> "SentenceRecord":
+        return cls(
+            item["id"], item["start"], item["end"], text,
+            item.get("importance_score"), item.get("category"),
+        )
+
+
+def dump_records(records: List[SentenceRecord], include_text: bool = True) -> Dict:
+    """
+    레코드 목록 직렬화 형식 { "text"?, "records" }
+    같은 본문을 이미 다른 곳에 저장했다면 include_text=False로 본문을 생략한다.
+    """
+    payload: Dict = {"records": [record.to_dict() for record in records]}
+    if include_text:
+        payload["text"] = records[0].text if records else ""
+    return payload
+
+
+def load_records(payload, text: Optional[str] = None) -> Optional[List[SentenceRecord]]:
+    """
+    dump_records 형식을 레코드 목록으로 되돌린다. text가 주어지면 저장된 본문 대신 사용한다.
+    형식이 다르면(이전 버전 체크포인트) None을 반환한다.
+    """
+    if not isinstance(payload, dict) or "records" not in payload:
+        return None
+    if text is None:
+        text = payload.get("text", "")
+    return [SentenceRecord.from_dict(item, text) for item in payload["records"]]
@@ -0,0 +1,87 @@
+import hashlib
+import re
+import threading
+from typing import Dict, Iterable, Optional
+
+
+# 문장 단위 분석 결과(중요도 점수, 카테고리) 저장소
+# URL/문서 버전과 무관하게 정규화된 문장 해시로 결과를 공유한다.
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# DynamoDB BatchGetItem 한 번에 조회 가능한 최대 키 개수
+_BATCH_GET_LIMIT = 100
+
+
+def normalize_sentence(sentence: str) -> str:
+    """공백과 대소문자 차이를 무시하도록 문장을 정규화한다."""
+    return _WHITESPACE_RE.sub(" ", sentence).strip().lower()
+
+
+def sentence_key(sentence: str, version: str) -> str:
+    """정규화된 문장 해시와 프롬프트/모델 버전을 결합한 저장소 키를 만든다."""
+    digest = hashlib.sha256(normalize_sentence(sentence).encode("utf-8")).hexdigest()
+    return f"{version}#{digest}"
+
+
+def _to_record(item: Dict) -> Dict:
+    # DynamoDB 숫자(Decimal)를 int로 되돌리고 필요한 필드만 남긴다.
+    record = {"importance_score": int(item.get("importance_score", 0))}
+    if item.get("category"):
+        record["category"] = item["category"]
+    return record
+
+
+class InMemorySentenceStore:
+    """테스트/로컬 실행용 메모리 저장소."""
+
+    def __init__(self):
+        self._items: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        with self._lock:
+            return {key: dict(self._items[key]) for key in keys if key in self._items}
+
+    def put_many(self, records: Dict[str, Dict]) -> None:
+        with self._lock:
+            for key, item in records.items():
+                self._items[key] = _to_record(item)
+
+
+class DynamoDBSentenceStore:
+    """
+    DynamoDB 기반 저장소.
+    테이블 키: sentence_key (S)
+    """
+
+    def __init__(self, table, key_name: str = "sentence_key"):
+        self.table = table
+        self.key_name = key_name
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        unique_keys = list(dict.fromkeys(keys))
+        results: Dict[str, Dict] = {}
+        dynamodb = self.table.meta.client
+
+        for i in range(0, len(unique_keys), _BATCH_GET_LIMIT):
+            request: Optional[Dict] = {
+                self.table.name: {
+                    "Keys": [{self.key_name: key} for key in unique_keys[i : i + _BATCH_GET_LIMIT]]
+                }
+            }
+            # 처리되지 못한 키(UnprocessedKeys)는 재요청
+            while request:
+                response = dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self.table.name, []):
+                    results[item[self.key_name]] = _to_record(item)
+                request = response.get("UnprocessedKeys") or None
+
+        return results
+
+    def put_many(self, records: Dict[str, Dict]) -> None:
+        if not records:
+            return
+        with self.table.batch_writer(overwrite_by_pkeys=[self.key_name]) as writer:
+            for key, item in records.items():
+                writer.put_item(Item={self.key_name: key, **_to_record(item)})
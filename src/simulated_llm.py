@@ -0,0 +1,221 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from llm_client import STREAM_METRIC_KEYS, USAGE_KEYS
+from llm_governor import get_limiter
+from token_budget import estimate_tokens
+
+
+# Bedrock 없이 파이프라인 성능을 측정하기 위한 가짜 LLMClient (벤치마크/로컬 실행용)
+# - 시스템 프롬프트로 단계를 구분해 각 단계가 기대하는 형식의 응답을 만든다.
+# - 점수/카테고리/라벨은 문장 해시로 정하므로 같은 입력에는 항상 같은 응답을 돌려준다.
+# - 호출 지연 시간은 분포("fixed:0.2", "uniform:0.1,0.5", "lognormal:0.8,0.4")로 지정한다.
+# - 스로틀링/일시적 오류를 지정한 비율로 발생시키며, 실제 클라이언트처럼 모델별 동시성 조절기를 거친다.
+# - 응답은 항상 출력 스키마를 지키므로 output_schema는 받기만 한다.
+# - generate_response_stream은 지연 시간의 first_token_ratio만큼 기다린 뒤 나머지 시간 동안 응답을 조각으로 나눠 보낸다.
+
+SMALL_MODEL_ID = "simulated.small"
+LARGE_MODEL_ID = "simulated.large"
+
+
+class SimulatedServiceError(Exception):
+    """botocore ClientError와 같은 형식의 response를 가진 예외 (동시성 조절기가 오류 코드를 읽음)."""
+
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code, "Message": "simulated"}}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """지연 시간 분포 문자열을 (난수 생성기 → 초) 함수로 바꾼다."""
+    kind, _, args = spec.partition(":")
+    values = [float(value) for value in args.split(",") if value] if args else []
+    if kind == "fixed":
+        return lambda rng: values[0] if values else 0.0
+    if kind == "uniform":
+        low, high = values
+        return lambda rng: rng.uniform(low, high)
+    if kind == "lognormal":
+        # median(초), sigma
+        median, sigma = values
+        return lambda rng: median * rng.lognormvariate(0, sigma)
+    raise ValueError(f"알 수 없는 지연 시간 분포: {spec}")
+
+
+def _stable_int(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+class SimulatedLLMClient:
+    """
+    LLMClient와 같은 인터페이스(generate_response, generate_response_stream, usage_snapshot)를 제공하는 가짜 클라이언트.
+    important_ratio: 중요도 4 이상을 받는 문장 비율
+    first_token_ratio: 스트리밍 시 전체 지연 시간 중 첫 조각까지 걸리는 비율
+    stream_chunk_chars: 스트리밍 조각 하나의 글자 수
+    """
+
+    def __init__(
+        self,
+        small_latency: str = "lognormal:0.6,0.3",
+        large_latency: str = "lognormal:2.5,0.3",
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        important_ratio: float = 0.3,
+        seed: int = 0,
+        sleep: Callable[[float], None] = time.sleep,
+        first_token_ratio: float = 0.3,
+        stream_chunk_chars: int = 16,
+    ):
+        self.small_model_id = SMALL_MODEL_ID
+        self.large_model_id = LARGE_MODEL_ID
+        self.response_cache = None
+        self._latency = {
+            SMALL_MODEL_ID: parse_latency(small_latency),
+            LARGE_MODEL_ID: parse_latency(large_latency),
+        }
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.important_ratio = important_ratio
+        self.first_token_ratio = first_token_ratio
+        self.stream_chunk_chars = stream_chunk_chars
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self._categories = None
+        self._in_flight = 0
+        # 동시에 진행 중이던 호출 수의 최댓값 (reset_peak로 초기화)
+        self.peak_in_flight = 0
+
+    def generate_response(
+        self,
+        system_instruction: str,
+        message: str,
+        model_size: str = "small",
+        model_id: str = None,
+        output_schema: Optional[Dict] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+    ) -> str:
+        selected_model = model_id or (self.large_model_id if model_size == "large" else self.small_model_id)
+        text = self._respond(system_instruction, message)
+        return get_limiter(selected_model).call(lambda: self._invoke(selected_model, system_instruction, message, text))
+
+    def generate_response_stream(
+        self,
+        system_instruction: str,
+        message: str,
+        on_text: Callable[[str], None],
+        model_size: str = "small",
+        model_id: str = None,
+        output_schema: Optional[Dict] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+    ) -> str:
+        selected_model = model_id or (self.large_model_id if model_size == "large" else self.small_model_id)
+        text = self._respond(system_instruction, message)
+        return get_limiter(selected_model).call(
+            lambda: self._invoke(selected_model, system_instruction, message, text, on_text)
+        )
+
+    def _invoke(
+        self,
+        model_id: str,
+        system_instruction: str,
+        message: str,
+        text: str,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        with self._lock:
+            roll = self._rng.random()
+            latency = self._latency.get(model_id, self._latency[SMALL_MODEL_ID])(self._rng)
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        started = time.monotonic()
+        try:
+            # 스트리밍이면 첫 조각까지만 기다린 뒤 오류 여부를 정함 (요청 시점의 스로틀링과 같게)
+            self._sleep(latency if on_text is None else latency * self.first_token_ratio)
+            if roll < self.throttle_rate:
+                raise SimulatedServiceError("ThrottlingException")
+            if roll < self.throttle_rate + self.error_rate:
+                raise SimulatedServiceError("ServiceUnavailableException")
+            if on_text is not None:
+                first_token = time.monotonic() - started
+                ends = list(range(self.stream_chunk_chars, len(text), self.stream_chunk_chars)) + [len(text)]
+                interval = latency * (1 - self.first_token_ratio) / len(ends)
+                for idx, end in enumerate(ends):
+                    if idx:
+                        self._sleep(interval)
+                    on_text(text[:end])
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        self._record_usage(model_id, {
+            "inputTokens": estimate_tokens(system_instruction) + estimate_tokens(message),
+            "outputTokens": estimate_tokens(text),
+        })
+        if on_text is not None:
+            self._record_usage(model_id, {
+                "streamCalls": 1,
+                "firstTokenMs": int(first_token * 1000),
+                "streamLatencyMs": int((time.monotonic() - started) * 1000),
+            }, count_call=False)
+        return text
+
+    def _respond(self, system_instruction: str, message: str) -> str:
+        from tos_processing import CATEGORIZE_SYSTEM_INSTRUCTION, FUSED_SYSTEM_INSTRUCTION, SCORE_SYSTEM_INSTRUCTION
+        from tos_summarize import SUMMARY_SYSTEM_INSTRUCTION
+
+        if system_instruction in (SCORE_SYSTEM_INSTRUCTION, CATEGORIZE_SYSTEM_INSTRUCTION, FUSED_SYSTEM_INSTRUCTION):
+            items = json.loads(message)["sentences"]
+            results = []
+            for item in items:
+                result: Dict[str, Any] = {"id": item["id"]}
+                if system_instruction != CATEGORIZE_SYSTEM_INSTRUCTION:
+                    result["importance_score"] = self._score(item["sentence"])
+                if system_instruction == CATEGORIZE_SYSTEM_INSTRUCTION or result["importance_score"] >= 4:
+                    result["category"] = self._category(item["sentence"])
+                results.append(result)
+            return json.dumps(results, ensure_ascii=False)
+
+        if system_instruction == SUMMARY_SYSTEM_INSTRUCTION:
+            lines = [line.split(": ", 1)[-1] for line in message.splitlines()[2:]]
+            return " ".join(line[:60] for line in lines[:4]) or "요약할 문장이 없습니다."
+
+        label = ("good", "neutral", "bad")[_stable_int(message) % 3]
+        return json.dumps({"reasoning": "시뮬레이션 평가입니다.", "label": label}, ensure_ascii=False)
+
+    def _score(self, sentence: str) -> int:
+        ratio = (_stable_int(sentence) % 1000) / 1000
+        if ratio < self.important_ratio:
+            return 5 if ratio < self.important_ratio / 2 else 4
+        return 1 + _stable_int(sentence[::-1]) % 3
+
+    def _category(self, sentence: str) -> str:
+        if self._categories is None:
+            from tos_evaluate import CATEGORY_EVAL_POINTS
+            self._categories = list(CATEGORY_EVAL_POINTS)
+        return self._categories[_stable_int(sentence) % len(self._categories)]
+
+    def _record_usage(self, model_id: str, usage: Dict[str, int], count_call: bool = True) -> None:
+        with self._lock:
+            totals = self._usage.setdefault(
+                model_id, {key: 0 for key in ("calls",) + USAGE_KEYS + STREAM_METRIC_KEYS}
+            )
+            if count_call:
+                totals["calls"] += 1
+            for key, value in usage.items():
+                totals[key] += value
+
+    def usage_snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {model_id: dict(totals) for model_id, totals in self._usage.items()}
+
+    def reset_peak(self) -> None:
+        with self._lock:
+            self.peak_in_flight = self._in_flight
+
+    def total_calls(self) -> int:
+        return sum(totals["calls"] for totals in self.usage_snapshot().values())
@@ -4,6 +4,7 @@ import re
 from typing import List, Optional, Tuple
 
 from llm_client import LLMClient
+from sentence_record import SentenceRecord
 
 
 def _extract_json_array(text: str) -> List[str]:
@@ -45,25 +46,76 @@ def _extract_json_array(text: str) -> List[str]:
     return sentences
 
 
+# 정규화 단계: 엔티티 해제 → <br>/태그 제거 → 문자 치환 → 공백 정리
+# 각 단계는 해당 문자가 있을 때만 본문을 다시 훑으며, 정규식은 리터럴로 시작하는 패턴만 써서
+# 후보 위치를 빠르게 건너뛴다. (str.translate는 한글 본문에서 str.replace 연쇄보다 느림)
+_BR_TAG = re.compile(r"<\s*br\s*/?>", re.IGNORECASE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_CHAR_FOLDS = (
+    ("\u00a0", " "), ("“", '"'), ("”", '"'), ("‘", "'"), ("’", "'"),
+    ("\t", " "), ("\r", " "), ("\f", " "), ("\v", " "),
+)
+_NEWLINE_RUN = re.compile(r"\n\n\n+")
+_SPACE_RUN = re.compile(r"  +")
+
+# 엔티티(&...)가 넘지 못하는 문자: 스트리밍 정규화에서 원문을 이 문자 앞에서 자른다.
+_ENTITY_STOP_CHARS = " \t\n\f<&"
+# 문자 종류 개수는 UTF-8 바이트로 센다. 한글 음절(U+AC00~U+D7A3)은 선두 바이트가 EA B0~ED 9E A3이다.
+_NON_LATIN_BYTES = bytes(b for b in range(256) if not (0x41 <= b <= 0x5A or 0x61 <= b <= 0x7A))
+_HANGUL_EDGE_BYTES = re.compile(rb"\xea[\xb0-\xbf]|\xed(?:[\x80-\x9d]|\x9e[\x80-\xa3])")
+
+# 이보다 긴 블록은 조각 단위로 정규화해 중간 사본이 블록 전체 크기로 커지지 않게 한다.
+_STREAM_CHUNK_SIZE = 1 << 18
+
+
+def _unescape(text: str) -> str:
+    return html.unescape(text) if "&" in text else text
+
+
+def _strip_tags(text: str) -> str:
+    if "<" not in text:
+        return text
+    text = _BR_TAG.sub("\n", text)
+    return _HTML_TAG.sub(" ", text)
+
+
+def _fold_chars(text: str) -> str:
+    for old, new in _CHAR_FOLDS:
+        text = text.replace(old, new)
+    return text
+
+
+def _fold_whitespace(text: str) -> str:
+    """
+    (_fold_chars 이후) 3개 이상 줄바꿈을 2개로, 줄바꿈 양옆 공백 제거, 연속 공백을 하나로 줄인다.
+    본문 양끝의 공백은 줄바꿈에 붙은 경우만 지우며, 나머지는 호출한 쪽에서 strip한다.
+    """
+    if "\n\n\n" in text:
+        text = _NEWLINE_RUN.sub("\n\n", text)
+    if " \n" in text or "\n " in text:
+        lines = text.split("\n")
+        text = "\n".join([lines[0].rstrip(" "), *[line.strip(" ") for line in lines[1:-1]], lines[-1].lstrip(" ")])
+    if "  " in text:
+        text = _SPACE_RUN.sub(" ", text)
+    return text
+
+
 def _normalize_block(block: str) -> str:
     """
     HTML 태그/엔티티 제거 및 공백/따옴표 정규화로 LLM 입력을 정돈한다.
     """
-    text = html.unescape(block)
-    text = re.sub(r"<\s*br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = text.replace("\u00a0", " ")
-    text = re.sub(r"[“”]", '"', text)
-    text = re.sub(r"[‘’]", "'", text)
-    text = re.sub(r"[ \t\r\f\v]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r"[ ]*\n[ ]*", "\n", text)
-    return text.strip()
+    return _fold_whitespace(_fold_chars(_strip_tags(_unescape(block)))).strip()
 
 
-def _is_korean_text(text: str) -> bool:
-    hangul = len(re.findall(r"[가-힣]", text))
-    latin = len(re.findall(r"[A-Za-z]", text))
+def _count_scripts(text: str) -> Tuple[int, int]:
+    """(한글 음절 수, 로마자 수)"""
+    data = text.encode("utf-8", "surrogatepass")
+    latin = len(data.translate(None, _NON_LATIN_BYTES))
+    hangul = data.count(b"\xeb") + data.count(b"\xec") + len(_HANGUL_EDGE_BYTES.findall(data))
+    return hangul, latin
+
+
+def _is_korean_counts(hangul: int, latin: int) -> bool:
     if hangul == 0 and latin == 0:
         return True
     if hangul == 0:
@@ -73,17 +125,102 @@ def _is_korean_text(text: str) -> bool:
     return hangul / (hangul + latin) >= 0.3
 
 
+def _is_korean_text(text: str) -> bool:
+    return _is_korean_counts(*_count_scripts(text))
+
+
+class StreamingNormalizer:
+    """
+    조각(chunk) 단위로 받은 원문을 _normalize_block과 같은 결과로 정규화한다.
+    feed/close가 돌려준 문자열을 이어 붙이면 _normalize_block(원문 전체)와 같고,
+    hangul/latin에는 지금까지 내보낸 정규화 결과의 문자 수가 누적된다.
+
+    각 단계는 다음 조각에 따라 결과가 달라질 수 있는 꼬리만 남기고 앞부분을 처리한다.
+    - 엔티티: 마지막 공백/'<'/'&' 앞까지
+    - 태그: 마지막 '>' 뒤까지 (그 뒤에 '<'가 없으면 끝까지)
+    - 공백: 마지막 공백이 아닌 문자까지 (공백 연속 구간이 조각 사이에서 끊기지 않게)
+    """
+
+    def __init__(self):
+        self.hangul = 0
+        self.latin = 0
+        self._raw = ""
+        self._unescaped = ""
+        self._whitespace = ""
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        raw = self._raw + chunk
+        cut = max(raw.rfind(char) for char in _ENTITY_STOP_CHARS)
+        if cut <= 0:
+            self._raw = raw
+            return ""
+        self._raw = raw[cut:]
+        unescaped = self._unescaped + _unescape(raw[:cut])
+
+        cut = len(unescaped)
+        if "<" in unescaped:
+            last_close = unescaped.rfind(">")
+            if unescaped.find("<", last_close + 1) != -1:
+                cut = last_close + 1
+        head = _BR_TAG.sub("\n", unescaped[:cut]) if "<" in unescaped[:cut] else unescaped[:cut]
+        # <br>이 닫히지 않은 태그 안에 있었다면 태그 제거가 뒤 조각까지 이어질 수 있으므로 전부 남긴다.
+        if head.find("<", head.rfind(">") + 1) != -1:
+            self._unescaped = unescaped
+            return ""
+        self._unescaped = unescaped[cut:]
+        return self._emit(_HTML_TAG.sub(" ", head) if "<" in head else head, final=False)
+
+    def close(self) -> str:
+        text = _strip_tags(self._unescaped + _unescape(self._raw))
+        self._raw = self._unescaped = ""
+        return self._emit(text, final=True)
+
+    def _emit(self, text: str, final: bool) -> str:
+        text = self._whitespace + _fold_chars(text)
+        body = text.rstrip()
+        self._whitespace = "" if final else text[len(body):]
+        if not body:
+            return ""
+        body = _fold_whitespace(body)
+        if not self._started:
+            body = body.lstrip()
+            self._started = True
+        hangul, latin = _count_scripts(body)
+        self.hangul += hangul
+        self.latin += latin
+        return body
+
+
+def _normalize_with_counts(block: str, chunk_size: int = _STREAM_CHUNK_SIZE) -> Tuple[str, int, int]:
+    """(정규화된 블록, 한글 음절 수, 로마자 수)"""
+    normalizer = StreamingNormalizer()
+    pieces = [normalizer.feed(block[start:start + chunk_size]) for start in range(0, len(block), chunk_size)]
+    pieces.append(normalizer.close())
+    return "".join(pieces), normalizer.hangul, normalizer.latin
+
+
+def normalize_block(block: str) -> str:
+    """
+    split_sentences_block이 문장 위치의 기준으로 쓰는 정규화된 블록.
+    위치만 저장한 체크포인트에서 레코드를 되살릴 때 원문으로부터 다시 만든다.
+    """
+    return _normalize_with_counts(block)[0]
+
+
+# 분할 엔진: 후보 문자(줄바꿈, 문장부호)만 정규식으로 찾고,
+# 약어/소수점/글머리 규칙은 해당 위치에 고정된 매칭으로 판단한다. (문서 길이에 선형)
+_BOUNDARY_CANDIDATE = re.compile(r"[\n.?!…。！？]")
+_SKIP_TO_SIGNIFICANT = re.compile(r'[ \t\r\f\v")\]}\u201d\u2019]*')
+_TOKEN_BEFORE = re.compile(r"([A-Za-z가-힣0-9㈜]+)[.?!…]*$")
+_KO_SENTENCE_START = re.compile(r"[가-힣0-9A-Z\"'“‘(]")
+_EN_SENTENCE_START = re.compile(r"[A-Z0-9\"'“‘(]")
+
+
 def _next_significant_char(text: str, start: int) -> Tuple[Optional[str], int]:
-    idx = start
-    while idx < len(text):
-        ch = text[idx]
-        if ch in " \t\r\f\v":
-            idx += 1
-            continue
-        if ch in '")]}\u201d\u2019':
-            idx += 1
-            continue
-        return ch, idx
+    idx = _SKIP_TO_SIGNIFICANT.match(text, start).end()
+    if idx < len(text):
+        return text[idx], idx
     return None, len(text)
 
 
@@ -98,8 +235,9 @@ def _prev_significant_char(text: str, start: int) -> Tuple[Optional[str], int]:
     return None, -1
 
 
+# 위치 고정 매칭(pattern.match(text, pos))에 쓰므로 `^` 없이 정의
 _BULLET_PATTERN = re.compile(
-    r"^\s*(?:[\-\*\u2022\u2023\u25E6\u25AA\u25CF\u00B7\u25B6\u25B8\u25C0\u25C2\u25BA\u25C6\u25C7\u25A0\u25A1\u2605\u203B]"
+    r"\s*(?:[\-\*\u2022\u2023\u25E6\u25AA\u25CF\u00B7\u25B6\u25B8\u25C0\u25C2\u25BA\u25C6\u25C7\u25A0\u25A1\u2605\u203B]"
     r"|\d+[.)]|[A-Za-z가-힣][.)])\s+"
 )
 
@@ -119,6 +257,7 @@ _SF_EXCEPTION_SUFFIXES = {
     "권",
     "쪽",
 }
+_SF_EXCEPTION_SUFFIX_TUPLE = tuple(_SF_EXCEPTION_SUFFIXES)
 
 _TITLE_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr"}
 _COMMON_ABBREVIATIONS = {
@@ -152,8 +291,7 @@ def _is_ellipsis(text: str, idx: int) -> bool:
 
 def _extract_token_before(text: str, idx: int) -> str:
     window_start = max(0, idx - 15)
-    snippet = text[window_start : idx + 1]
-    match = re.search(r"([A-Za-z가-힣0-9㈜]+)[.?!…]*$", snippet)
+    match = _TOKEN_BEFORE.search(text, window_start, idx + 1)
     if not match:
         return ""
     return match.group(1)
@@ -170,7 +308,7 @@ def _is_abbreviation(text: str, idx: int, language: str, next_char: Optional[str
         if idx + 2 < len(text) and text[idx + 2] == ".":
             return True
 
-    if token.endswith(tuple(_SF_EXCEPTION_SUFFIXES)):
+    if token.endswith(_SF_EXCEPTION_SUFFIX_TUPLE):
         return True
 
     if token in _TITLE_ABBREVIATIONS:
@@ -190,7 +328,7 @@ def _is_abbreviation(text: str, idx: int, language: str, next_char: Optional[str
 
 
 def _looks_like_bullet_start(text: str, start: int) -> bool:
-    return bool(_BULLET_PATTERN.match(text[start:]))
+    return bool(_BULLET_PATTERN.match(text, start))
 
 
 def _should_split_on_newline(text: str, idx: int) -> bool:
@@ -229,48 +367,60 @@ def _should_split_on_punctuation(text: str, idx: int, language: str) -> bool:
         return True
 
     if language == "ko":
-        return bool(re.match(r"[가-힣0-9A-Z\"'“‘(]", next_ch))
-    return bool(re.match(r"[A-Z0-9\"'“‘(]", next_ch))
+        return bool(_KO_SENTENCE_START.match(next_ch))
+    return bool(_EN_SENTENCE_START.match(next_ch))
 
 
-def _split_by_rules(text: str, language: str) -> List[str]:
-    sentences: List[str] = []
-    buffer: List[str] = []
-    length = len(text)
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    # text[start:end].strip()과 같은 범위
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
 
-    for idx, ch in enumerate(text):
-        buffer.append(ch)
 
-        split = False
-        if ch == "\n":
+def _split_spans(text: str, language: str) -> List[Tuple[int, int]]:
+    """문장마다 text에서의 (start, end) 위치를 반환한다. 앞뒤 공백은 범위에서 제외한다."""
+    spans: List[Tuple[int, int]] = []
+    start = 0
+
+    for match in _BOUNDARY_CANDIDATE.finditer(text):
+        idx = match.start()
+        if text[idx] == "\n":
             split = _should_split_on_newline(text, idx)
-        elif _should_split_on_punctuation(text, idx, language):
-            split = True
+        else:
+            split = _should_split_on_punctuation(text, idx, language)
 
         if split:
-            sentence = "".join(buffer).strip()
-            if sentence:
-                sentences.append(sentence)
-            buffer = []
-
-    tail = "".join(buffer).strip()
-    if tail:
-        sentences.append(tail)
-    return sentences
+            span = _strip_span(text, start, idx + 1)
+            if span[0] < span[1]:
+                spans.append(span)
+            start = idx + 1
 
+    span = _strip_span(text, start, len(text))
+    if span[0] < span[1]:
+        spans.append(span)
+    return spans
 
-def split_sentences_block(block: str, client: Optional[LLMClient] = None) -> List[str]:
+
+def _split_by_rules(text: str, language: str) -> List[str]:
+    return [text[start:end] for start, end in _split_spans(text, language)]
+
+
+def split_sentences_block(block: str, client: Optional[LLMClient] = None) -> List[SentenceRecord]:
     """
     약관 블록을 규칙 기반으로 문장 단위 분리한다. (LLM 비사용)
+    반환되는 레코드는 모두 정규화된 블록 하나를 참조하며, id는 문장 순서다.
     """
     print(f"원본 블록 길이: {len(block)}")
-    block = _normalize_block(block)
+    block, hangul, latin = _normalize_with_counts(block)
     print(f"정규화된 블록 길이: {len(block)}")
     if not block:
         return []
 
-    language = "ko" if _is_korean_text(block) else "en"
-    sentences = _split_by_rules(block, language)
-    # print("rule-base 분리 후 문장들:")
-    # print(sentences)
-    return sentences
+    language = "ko" if _is_korean_counts(hangul, latin) else "en"
+    return [
+        SentenceRecord(idx, start, end, block)
+        for idx, (start, end) in enumerate(_split_spans(block, language))
+    ]
@@ -0,0 +1,74 @@
+import os
+import re
+from typing import Callable, Dict, List
+
+
+# 토큰 예산 기반 배치 구성
+# 문장 수가 아닌 추정 토큰 수로 배치를 나눠, 짧은 문장은 한 번에 더 많이 보내고
+# 긴 조항은 출력 JSON이 잘리지 않도록 작게 나눈다.
+# 토크나이저를 내려받지 않고 문자 종류별 근사치로 토큰 수를 추정한다.
+
+# 배치 하나에 담을 문장들의 추정 입력 토큰 수 (시스템 프롬프트 제외)
+BATCH_TOKEN_BUDGET = int(os.environ.get("TERMLENS_BATCH_TOKEN_BUDGET", "1500"))
+# 배치 하나에 담을 최대 문장 수 (문장마다 출력 JSON 항목이 하나씩 생기므로 출력 길이 상한 역할)
+BATCH_MAX_ITEMS = int(os.environ.get("TERMLENS_BATCH_MAX_ITEMS", "40"))
+
+# JSON 객체 하나({"id": n, "sentence": "..."})의 구조 토큰
+ITEM_OVERHEAD_TOKENS = 8
+
+_HANGUL_RUN = re.compile(r"[가-힣ㄱ-ㆎ]+")
+_LATIN_RUN = re.compile(r"[A-Za-z]+")
+_DIGIT_RUN = re.compile(r"[0-9]+")
+_OTHER_CHAR = re.compile(r"[^\sA-Za-z0-9가-힣ㄱ-ㆎ]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    BPE 계열 토크나이저 기준의 대략적인 토큰 수.
+    - 한글: 음절당 약 1토큰
+    - 영문: 단어 조각 4자당 약 1토큰
+    - 숫자: 3자리당 약 1토큰
+    - 그 외 기호: 문자당 1토큰
+    """
+    if not text:
+        return 0
+    hangul = sum(len(run) for run in _HANGUL_RUN.findall(text))
+    latin = sum((len(run) + 3) // 4 for run in _LATIN_RUN.findall(text))
+    digits = sum((len(run) + 2) // 3 for run in _DIGIT_RUN.findall(text))
+    other = len(_OTHER_CHAR.findall(text))
+    return hangul + latin + digits + other
+
+
+def item_tokens(item: Dict, key: str = "sentence") -> int:
+    """배치 메시지에 들어갈 항목 하나의 추정 토큰 수."""
+    return estimate_tokens(str(item.get(key, ""))) + ITEM_OVERHEAD_TOKENS
+
+
+def record_tokens(record) -> int:
+    """문장 레코드(SentenceRecord) 하나의 추정 토큰 수."""
+    return estimate_tokens(record.sentence) + ITEM_OVERHEAD_TOKENS
+
+
+def batch_by_token_budget(
+    items: List[Dict],
+    token_budget: int = BATCH_TOKEN_BUDGET,
+    max_items: int = BATCH_MAX_ITEMS,
+    size: Callable[[Dict], int] = item_tokens,
+) -> List[List[Dict]]:
+    """
+    입력 순서를 유지하며, 추정 토큰 합이 token_budget을 넘지 않도록 배치를 나눈다.
+    예산보다 큰 항목은 단독 배치가 된다.
+    """
+    batches: List[List[Dict]] = []
+    current: List[Dict] = []
+    current_tokens = 0
+    for item in items:
+        tokens = size(item)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
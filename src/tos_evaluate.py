@@ -1,8 +1,9 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List
+from concurrent.futures import Executor, as_completed
+from typing import Dict, Iterator, List, Optional
 
 from json_utils import extract_json_fragment as _extract_json_fragment
-from llm_client import LLMClient
+from llm_client import LLMClient, object_output_schema
+from runtime import get_executor
 
 
 def _calculate_overall_evaluation(labels: List[str]) -> str:
@@ -310,7 +311,7 @@ BASE_SYSTEM_INSTRUCTION = """
 """
 
 
-def _build_system_instruction_for_category(category: str) -> str:
+def build_system_instruction_for_category(category: str) -> str:
     eval_points = CATEGORY_EVAL_POINTS.get(
         category, CATEGORY_EVAL_POINTS.get("기타", "")
     )
@@ -325,16 +326,38 @@ def _build_system_instruction_for_category(category: str) -> str:
 """
 
 
+# 구조화 출력(도구 사용) 스키마: 프롬프트의 출력 형식과 같음 (reasoning → label 순서)
+EVALUATION_OUTPUT_SCHEMA = object_output_schema(
+    "record_evaluation",
+    "요약 조항에 대한 평가 근거와 라벨을 기록합니다.",
+    {
+        "type": "object",
+        "properties": {
+            "reasoning": {"type": "string"},
+            "label": {"type": "string", "enum": ["good", "neutral", "bad"]},
+        },
+        "required": ["reasoning", "label"],
+    },
+)
+
+
+def build_evaluation_message(summary: str) -> str:
+    return f"[입력 요약 조항]\n{summary}"
+
+
 def evaluate_summary(category: str, summary: str, client: LLMClient) -> Dict:
     """
     단일 요약 조항과 카테고리에 대해,
     공정위 약관심사지침 취지를 반영한 카테고리별 기준으로
     good/neutral/bad + reasoning을 생성한다.
     """
-    system_instruction = _build_system_instruction_for_category(category)
+    system_instruction = build_system_instruction_for_category(category)
 
-    message = f"[입력 요약 조항]\n{summary}"
-    response = client.generate_response(system_instruction, message, model_size="large")
+    message = build_evaluation_message(summary)
+    response = client.generate_response(
+        system_instruction, message, model_size="large", output_schema=EVALUATION_OUTPUT_SCHEMA,
+        validate=_extract_json_fragment,
+    )
 
     # 기대 형식:
     # {
@@ -344,47 +367,73 @@ def evaluate_summary(category: str, summary: str, client: LLMClient) -> Dict:
     return _extract_json_fragment(response)
 
 
-def evaluate_category_summaries(
-    category_summaries: List[Dict], client: LLMClient
-) -> Dict:
+def evaluate_clause(category: str, summary: str, client: LLMClient) -> Dict:
     """
-    카테고리별 요약을 평가하고 전체 약관 등급(A~E)을 계산한다.
-    category_summaries: [{ "category": str, "summary": str }, ...]
+    한 카테고리의 요약을 평가해 조항 결과로 반환한다.
+    반환 형식: { "evaluation", "summarized_clause", "category", "reasoning" }
+    """
+    return clause_from_evaluation(category, summary, evaluate_summary(category, summary, client))
+
+
+def clause_from_evaluation(category: str, summary: str, evaluation: Dict) -> Dict:
+    """모델의 평가 응답({ "reasoning", "label" })을 조항 결과 형식으로 바꾼다."""
+    label = evaluation.get("label", "neutral")
+    reasoning = evaluation.get("reasoning", "error")
+
+    return {
+        "evaluation": label,
+        "summarized_clause": summary,
+        "category": category,
+        "reasoning": reasoning,
+    }
+
+
+def iter_category_evaluations(
+    category_summaries: List[Dict], client: LLMClient, executor: Optional[Executor] = None
+) -> Iterator[Dict]:
+    """
+    카테고리별 요약을 병렬로 평가하고, 평가가 끝나는 순서대로 결과를 하나씩 반환한다.
+    반환 형식: { "evaluation", "summarized_clause", "category", "reasoning" }
     """
     if not category_summaries:
-        return {"overall_evaluation": "E", "evaluation_for_each_clause": []}
+        return
+
+    executor = executor or get_executor()
+    futures = [
+        executor.submit(evaluate_clause, item.get("category", "기타"), item.get("summary", ""), client)
+        for item in category_summaries
+    ]
+    for future in as_completed(futures):
+        yield future.result()
 
-    def _evaluate_item(item: Dict) -> Dict:
-        category = item.get("category", "기타")
-        summary = item.get("summary", "")
-        evaluation = evaluate_summary(category, summary, client)
-        label = evaluation.get("label", "neutral")
-        reasoning = evaluation.get("reasoning", "error")
-
-        return {
-            "label": label,
-            "result": {
-                "evaluation": label,
-                "summarized_clause": summary,
-                "category": category,
-                "reasoning": reasoning,
-            },
-        }
-
-    labels: List[str] = []
-    clause_results: List[Dict] = []
-    with ThreadPoolExecutor(max_workers=len(category_summaries)) as executor:
-        futures = [executor.submit(_evaluate_item, item) for item in category_summaries]
-        for future in as_completed(futures):
-            data = future.result()
-            labels.append(data["label"])
-            clause_results.append(data["result"])
-
-    overall = _calculate_overall_evaluation(labels)
+
+def sort_clause_results(clause_results: List[Dict]) -> List[Dict]:
+    """카테고리 정의 순서대로 평가 결과를 정렬한다."""
     category_order = list(CATEGORY_EVAL_POINTS.keys())
-    clause_results.sort(key=lambda x: category_order.index(x["category"]) if x["category"] in category_order else len(category_order))
+    return sorted(
+        clause_results,
+        key=lambda x: category_order.index(x["category"]) if x["category"] in category_order else len(category_order),
+    )
 
+
+def build_evaluation_result(clause_results: List[Dict]) -> Dict:
+    """카테고리별 평가 결과로 전체 약관 등급(A~E)을 계산하고 응답 형식으로 묶는다."""
+    overall = _calculate_overall_evaluation([item["evaluation"] for item in clause_results])
     return {
         "overall_evaluation": overall,
-        "evaluation_for_each_clause": clause_results,
+        "evaluation_for_each_clause": sort_clause_results(clause_results),
     }
+
+
+def evaluate_category_summaries(
+    category_summaries: List[Dict], client: LLMClient, executor: Optional[Executor] = None
+) -> Dict:
+    """
+    카테고리별 요약을 평가하고 전체 약관 등급(A~E)을 계산한다.
+    category_summaries: [{ "category": str, "summary": str }, ...]
+    """
+    if not category_summaries:
+        return {"overall_evaluation": "E", "evaluation_for_each_clause": []}
+
+    clause_results = list(iter_category_evaluations(category_summaries, client, executor))
+    return build_evaluation_result(clause_results)
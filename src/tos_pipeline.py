@@ -0,0 +1,226 @@
+from concurrent.futures import Executor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from llm_client import LLMClient
+from runtime import get_executor
+from sentence_record import SentenceRecord, dump_records, load_records
+from text_splitter import normalize_block, split_sentences_block
+from tos_evaluate import build_evaluation_result, evaluate_clause
+from tos_processing import analyze_sentences
+from tos_summarize import group_by_category, summarize_category
+
+
+def _save_checkpoint(checkpoints, content_hash: str, stage: str, payload: Any) -> None:
+    """체크포인트 저장 실패는 분석 실패로 이어지지 않도록 기록만 하고 넘어간다."""
+    if checkpoints is None:
+        return
+    try:
+        checkpoints.put(content_hash, stage, payload)
+    except Exception as err:
+        print(f"체크포인트 저장 실패: {stage}: {err}")
+
+
+def _run_stage(
+    checkpoints,
+    content_hash: str,
+    stage: str,
+    run: Callable[[], Any],
+    on_stage: Optional[Callable[[str], None]] = None,
+    dump: Callable[[Any], Any] = lambda value: value,
+    load: Callable[[Any], Any] = lambda payload: payload,
+) -> Any:
+    """
+    체크포인트가 있으면 재사용하고, 없으면 단계를 실행한 뒤 결과를 저장한다.
+    dump/load는 결과와 저장 형식(JSON) 사이의 변환이며, load가 None을 반환하면 체크포인트를 무시한다.
+    """
+    if on_stage is not None:
+        on_stage(stage)
+
+    if checkpoints is not None:
+        cached = checkpoints.get(content_hash, stage)
+        if cached is not None:
+            cached = load(cached)
+        if cached is not None:
+            print(f"체크포인트 재사용: {stage}")
+            return cached
+
+    result = run()
+
+    if checkpoints is not None:
+        _save_checkpoint(checkpoints, content_hash, stage, dump(result))
+    return result
+
+
+def split_document(tos_content: str, client: Optional[LLMClient] = None) -> List[SentenceRecord]:
+    """
+    파이프라인의 분할 단계: 약관 본문을 문장 레코드로 나누고 10자 이하 문장을 뺀 뒤 id를 순서대로 다시 매긴다.
+    iter_pipeline_events(sentences=...)에 미리 분할한 문장을 넘길 때 사용한다.
+    """
+    # 1) 문장 단위 분할
+    sentences = split_sentences_block(tos_content, client)
+    print(f"문장 분할 개수: {len(sentences)}")
+    print(f"문장들 길이 합: {sum(len(s) for s in sentences)}")
+
+    # 1-1) 짧은 문장 필터링 (10자 이하 제거), id는 남은 문장의 순서
+    sentences = [s for s in sentences if len(s) > 10]
+    for idx, record in enumerate(sentences):
+        record.id = idx
+    print(f"10자 이하 제거 후 문장 개수: {len(sentences)}")
+    return sentences
+
+
+def _load_sentences(payload, tos_content: str) -> Optional[List[SentenceRecord]]:
+    """
+    분할 단계 체크포인트(위치만 저장)를 원문을 다시 정규화한 본문 위에 되살린다.
+    위치가 본문을 벗어나면(정규화 방식이 바뀐 이전 체크포인트) None을 반환해 다시 분할한다.
+    """
+    text = normalize_block(tos_content)
+    records = load_records(payload, text)
+    if records is None or any(record.end > len(text) for record in records):
+        return None
+    return records
+
+
+def _clause_stage(category: str) -> str:
+    return f"clause:{category}"
+
+
+def _summarize_and_evaluate(category: str, items: List[SentenceRecord], client: LLMClient) -> Dict:
+    summary = summarize_category(category, items, client)
+    return evaluate_clause(category, summary["summary"], client)
+
+
+def _log_usage(before: Dict, after: Dict) -> None:
+    """이번 분석에서 사용한 모델별 토큰 수와 프롬프트 캐시 적중 토큰 수, 스트리밍 첫 토큰 시간을 출력한다."""
+    for model_id, totals in after.items():
+        previous = before.get(model_id, {})
+        delta = {key: value - previous.get(key, 0) for key, value in totals.items()}
+        if not delta.get("calls"):
+            continue
+        print(
+            f"토큰 사용량 [{model_id}] 호출 {delta['calls']}, 입력 {delta['inputTokens']}, "
+            f"출력 {delta['outputTokens']}, 캐시 적중 {delta['cacheReadInputTokens']}, "
+            f"캐시 기록 {delta['cacheWriteInputTokens']}"
+        )
+        streams = delta.get("streamCalls")
+        if streams:
+            print(
+                f"스트리밍 응답 [{model_id}] 호출 {streams}, 첫 토큰 평균 {delta['firstTokenMs'] // streams}ms, "
+                f"전체 평균 {delta['streamLatencyMs'] // streams}ms"
+            )
+
+
+def iter_pipeline_events(
+    tos_content: str,
+    content_hash: str,
+    client: LLMClient,
+    sentence_store=None,
+    checkpoints=None,
+    on_stage: Optional[Callable[[str], None]] = None,
+    executor: Optional[Executor] = None,
+    sentences: Optional[List[SentenceRecord]] = None,
+) -> Iterator[Dict]:
+    """
+    분할 → 점수화/분류 → 요약 → 평가 순서로 약관을 분석하며 결과를 이벤트로 반환한다.
+    - 카테고리 평가가 끝날 때마다 { "type": "clause", "category", "summarized_clause", "reasoning", "evaluation" }
+    - 마지막으로 { "type": "overall", "overall_evaluation" }
+    checkpoints가 주어지면 단계별(요약·평가는 카테고리별) 결과를 content_hash 기준으로 저장하고,
+    재시도 시 완료되지 않은 단계부터 다시 실행한다.
+    on_stage는 각 단계를 시작할 때 단계 이름으로 호출된다. (진행 상황 보고용)
+    sentences(split_document의 결과)가 주어지면 분할 단계를 건너뛰고 그 문장 레코드를 그대로 사용한다.
+    """
+    # 테스트용 가짜 클라이언트는 사용량 집계를 제공하지 않을 수 있음
+    usage_snapshot = getattr(client, "usage_snapshot", None)
+    usage_before = usage_snapshot() if usage_snapshot else {}
+
+    if sentences is None:
+        sentences = _run_stage(
+            checkpoints, content_hash, "sentences",
+            lambda: split_document(tos_content, client),
+            on_stage,
+            # 본문은 원문에서 다시 만들 수 있으므로 체크포인트에는 문장 위치만 저장
+            dump=lambda records: dump_records(records, include_text=False),
+            load=lambda payload: _load_sentences(payload, tos_content),
+        )
+    text = sentences[0].text if sentences else ""
+
+    # 2) 중요도 점수화 및 3) 카테고리 분류
+    # 문장 단위 결과 저장소에 있는 문장은 재사용하고, 처음 보는 문장만 모델에 전달
+    # 체크포인트에는 본문 없이 위치와 결과만 저장
+    categorized = _run_stage(
+        checkpoints, content_hash, "categorized",
+        lambda: analyze_sentences(sentences, client, store=sentence_store),
+        on_stage,
+        dump=lambda records: dump_records(records, include_text=False),
+        load=lambda payload: load_records(payload, text),
+    )
+
+    # 카테고리별 문장 수 계산 후 출력 (디버깅 용도)
+    category_counts = {}
+    for item in categorized:
+        category = item.category or "UNKNOWN"
+        category_counts[category] = category_counts.get(category, 0) + 1
+    print("카테고리별 문장 수:")
+    for category, count in category_counts.items():
+        print(f"{category}: {count}")
+
+    # 4) 카테고리별 요약 → 5) 요약 평가
+    # 카테고리마다 요약이 끝나면 다른 카테고리의 요약을 기다리지 않고 바로 평가하며,
+    # 평가가 끝나는 즉시 반환한다. 체크포인트는 카테고리 단위로 저장한다.
+    if on_stage is not None:
+        on_stage("evaluation")
+
+    clause_results: List[Dict] = []
+    pending: Dict[str, List[Dict]] = {}
+    for category, items in group_by_category(categorized).items():
+        cached = checkpoints.get(content_hash, _clause_stage(category)) if checkpoints is not None else None
+        if cached is None:
+            pending[category] = items
+            continue
+        print(f"체크포인트 재사용: {_clause_stage(category)}")
+        clause_results.append(cached)
+        yield {"type": "clause", **cached}
+
+    executor = executor or get_executor()
+    futures = {
+        executor.submit(_summarize_and_evaluate, category, items, client): category
+        for category, items in pending.items()
+    }
+    for future in as_completed(futures):
+        clause = future.result()
+        _save_checkpoint(checkpoints, content_hash, _clause_stage(futures[future]), clause)
+        clause_results.append(clause)
+        yield {"type": "clause", **clause}
+
+    evaluation_result = build_evaluation_result(clause_results)
+    if usage_snapshot:
+        _log_usage(usage_before, usage_snapshot())
+    response_cache = getattr(client, "response_cache", None)
+    if response_cache is not None:
+        print(f"응답 캐시: {response_cache.stats()}")
+    yield {"type": "overall", "overall_evaluation": evaluation_result["overall_evaluation"]}
+
+
+def run_pipeline(
+    tos_content: str,
+    content_hash: str,
+    client: LLMClient,
+    sentence_store=None,
+    checkpoints=None,
+    on_stage: Optional[Callable[[str], None]] = None,
+) -> Dict:
+    """
+    iter_pipeline_events의 결과를 모아 { "overall_evaluation", "evaluation_for_each_clause" }로 반환한다.
+    """
+    clause_results: List[Dict] = []
+    for event in iter_pipeline_events(
+        tos_content, content_hash, client, sentence_store, checkpoints, on_stage
+    ):
+        if event["type"] == "clause":
+            clause_results.append(_clause_from_event(event))
+    return build_evaluation_result(clause_results)
+
+
+def _clause_from_event(event: Dict) -> Dict:
+    """clause 이벤트에서 type 필드를 제외한 평가 결과를 꺼낸다."""
+    return {key: value for key, value in event.items() if key != "type"}
@@ -1,20 +1,23 @@
+import hashlib
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List
-
-from json_utils import extract_json_fragment as _extract_json_fragment
-from llm_client import LLMClient
-
-
-def score_sentence_importance(sentences: List[str], client: LLMClient) -> List[Dict]:
-    """
-    중요도 1~5로 문장별 점수를 산출한다.
-    """
-    if not sentences:
-        return []
-
-    batch_size = 10
-    system_instruction = """
+import os
+from concurrent.futures import Executor, as_completed
+from typing import Callable, Dict, List, Optional, Set
+
+from category_classifier import LOCAL_CATEGORIZER_ENABLED, get_classifier
+from dataflow import Dataflow
+from json_utils import JsonArrayItemParser, extract_json_fragment as _extract_json_fragment
+from llm_client import STREAM_RESPONSES_ENABLED, LLMClient, list_output_schema
+from runtime import get_executor
+from sentence_dedup import DEDUP_ENABLED, representatives
+from sentence_prefilter import PREFILTER_ENABLED, prefilter_records
+from sentence_record import SentenceRecord
+from sentence_store import sentence_key
+from token_budget import batch_by_token_budget, record_tokens
+from tos_evaluate import CATEGORY_EVAL_POINTS
+
+
+_SCORE_HEADER = """
 당신은 온라인 서비스 이용약관 문장을 중요도 1~5로 평가하는 분석가입니다.
 입력은 JSON 객체이며, "sentences" 필드 아래에 다음 형태의 리스트가 주어집니다.
 
@@ -33,7 +36,10 @@ def score_sentence_importance(sentences: List[str], client: LLMClient) -> List[D
 - id는 입력 값을 그대로 복사합니다.
 - 출력 배열의 길이는 입력 "sentences" 리스트 길이와 같아야 하며, 모든 id가 포함되어야 합니다.
 - JSON 배열 이외의 텍스트(설명, 코드블록, 주석 등)는 절대 출력하지 마십시오.
+"""
 
+# 중요도 기준 (융합 모드 프롬프트와 공유)
+_SCORE_CRITERIA = """
 [importance_score 정의: '사용자 입장에서 얼마나 반드시 알아야 하는지']
 
 5 = CRITICAL (최상위 중요)
@@ -91,53 +97,8 @@ def score_sentence_importance(sentences: List[str], client: LLMClient) -> List[D
 - 애매할 때는 항상 한 단계 낮은 점수를 주어 보수적으로 평가합니다.
 """
 
-    indexed_sentences = [
-        {"id": idx, "sentence": sentence}
-        for idx, sentence in enumerate(sentences)
-    ]
-    sentence_batches = [
-        indexed_sentences[i : i + batch_size]
-        for i in range(0, len(indexed_sentences), batch_size)
-    ]
-
-    def _score_batch(batch: List[Dict]) -> List[Dict]:
-        message = json.dumps({"sentences": batch}, ensure_ascii=False)
-        response = client.generate_response(system_instruction, message, model_size="small")
-        parsed = _extract_json_fragment(response)
-
-        batch_results = []
-        for item in parsed:
-            try:
-                score = int(item.get("importance_score", 0))
-            except Exception:
-                score = 0
-            batch_results.append(
-                {
-                    "id": item.get("id"),
-                    "importance_score": score,
-                }
-            )
-        return batch_results
 
-    all_results: List[Dict] = []
-    with ThreadPoolExecutor(max_workers=len(sentence_batches)) as executor:
-        futures = [executor.submit(_score_batch, batch) for batch in sentence_batches]
-        for future in as_completed(futures):
-            all_results.extend(future.result())
-
-    # 입력 순서를 유지
-    return sorted(all_results, key=lambda x: x.get("id", 0))
-
-
-def categorize_sentences(scored_sentences: List[Dict], client: LLMClient) -> List[Dict]:
-    """
-    중요도가 3 이상인 문장을 미리 정의된 카테고리로 분류한다.
-    """
-    if not scored_sentences:
-        return []
-
-    batch_size = 10
-    system_instruction = """
+_CATEGORIZE_HEADER = """
 당신은 온라인 서비스 이용약관 문장을 미리 정의된 category로 분류하는 전문가입니다.
 
 [입력 형식]
@@ -157,7 +118,10 @@ def categorize_sentences(scored_sentences: List[Dict], client: LLMClient) -> Lis
 - id는 입력 값을 그대로 복사하고, category만 추가합니다.
 - category 필드는 아래 정의된 키 중 하나를 정확히 사용해야 합니다.
 - JSON 배열 이외의 설명/주석/코드블록 텍스트는 절대 출력하지 마십시오.
+"""
 
+# category 기준 (융합 모드 프롬프트와 공유)
+_CATEGORY_CRITERIA = """
 [category 목록 및 기준]
 
 - 계정 관리 및 가입 조건
@@ -210,34 +174,482 @@ def categorize_sentences(scored_sentences: List[Dict], client: LLMClient) -> Lis
 - 애매할 때는 가장 관련성이 높은 category를 보수적으로 선택하고, 정말 어느 쪽으로도 분류하기 어려운 경우에만 "기타"를 사용하십시오.
 """
 
+
+
+SCORE_SYSTEM_INSTRUCTION = _SCORE_HEADER + _SCORE_CRITERIA
+
+CATEGORIZE_SYSTEM_INSTRUCTION = _CATEGORIZE_HEADER + _CATEGORY_CRITERIA
+
+# 융합 모드: 중요도 점수와 category를 한 번의 호출로 함께 산출
+_FUSED_HEADER = """
+당신은 온라인 서비스 이용약관 문장을 중요도 1~5로 평가하고, 중요한 문장을 미리 정의된 category로 분류하는 분석가입니다.
+입력은 JSON 객체이며, "sentences" 필드 아래에 다음 형태의 리스트가 주어집니다.
+
+{
+  "sentences": [
+    { "id": 0, "sentence": "..." },
+    { "id": 1, "sentence": "..." },
+    ...
+  ]
+}
+
+당신의 작업:
+- 각 sentence에 대해 importance_score (1~5)를 하나씩 부여합니다.
+- importance_score가 4 이상인 문장에만 category를 하나 부여하고, 3 이하인 문장의 category는 null로 둡니다.
+- 결과는 JSON 배열로만 출력하며, 각 요소는 다음 필드를 포함해야 합니다.
+  { "id": <정수>, "importance_score": <1~5 정수>, "category": "<아래 목록 중 하나>" | null }
+- id는 입력 값을 그대로 복사합니다.
+- 출력 배열의 길이는 입력 "sentences" 리스트 길이와 같아야 하며, 모든 id가 포함되어야 합니다.
+- category 필드는 아래 정의된 키 중 하나를 정확히 사용해야 합니다.
+- JSON 배열 이외의 텍스트(설명, 코드블록, 주석 등)는 절대 출력하지 마십시오.
+"""
+
+FUSED_SYSTEM_INSTRUCTION = _FUSED_HEADER + _SCORE_CRITERIA + _CATEGORY_CRITERIA
+
+# 구조화 출력(도구 사용) 스키마: 프롬프트가 요구하는 출력 배열의 항목 형식과 같음
+_CATEGORIES = list(CATEGORY_EVAL_POINTS)
+
+SCORE_OUTPUT_SCHEMA = list_output_schema(
+    "record_importance_scores",
+    "입력 문장별 중요도 점수(1~5)를 기록합니다.",
+    {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "importance_score": {"type": "integer", "minimum": 1, "maximum": 5},
+        },
+        "required": ["id", "importance_score"],
+    },
+)
+
+CATEGORY_OUTPUT_SCHEMA = list_output_schema(
+    "record_categories",
+    "입력 문장별 category를 기록합니다.",
+    {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "category": {"type": "string", "enum": _CATEGORIES},
+        },
+        "required": ["id", "category"],
+    },
+)
+
+FUSED_OUTPUT_SCHEMA = list_output_schema(
+    "record_scores_and_categories",
+    "입력 문장별 중요도 점수(1~5)와, 4 이상인 문장의 category를 기록합니다.",
+    {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer"},
+            "importance_score": {"type": "integer", "minimum": 1, "maximum": 5},
+            "category": {"type": ["string", "null"], "enum": _CATEGORIES + [None]},
+        },
+        "required": ["id", "importance_score"],
+    },
+)
+
+# 문장 분석 방식: "separate"(점수화 후 분류, 2회 호출) 또는 "fused"(1회 호출)
+SENTENCE_MODE_SEPARATE = "separate"
+SENTENCE_MODE_FUSED = "fused"
+SENTENCE_ANALYSIS_MODE = os.environ.get("TERMLENS_SENTENCE_MODE", SENTENCE_MODE_SEPARATE)
+
+
+def _parse_score(item: Dict) -> int:
+    try:
+        return int(item.get("importance_score", 0))
+    except Exception:
+        return 0
+
+
+def build_sentence_batch_message(batch: List[Dict]) -> str:
+    """점수화/분류 배치의 사용자 메시지. batch: [{ "id", "sentence" }, ...]"""
+    return json.dumps({"sentences": batch}, ensure_ascii=False)
+
+
+def _score_item(item: Dict) -> Dict:
+    return {"id": item.get("id"), "importance_score": _parse_score(item)}
+
+
+def _category_item(item: Dict) -> Dict:
+    return {"id": item.get("id"), "category": item.get("category", "기타")}
+
+
+def _fused_item(item: Dict) -> Dict:
+    score = _parse_score(item)
+    result = {"id": item.get("id"), "importance_score": score}
+    if score >= 4:
+        result["category"] = item.get("category") or "기타"
+    return result
+
+
+def parse_score_response(response: str) -> List[Dict]:
+    return [_score_item(item) for item in _extract_json_fragment(response)]
+
+
+def parse_category_response(response: str) -> List[Dict]:
+    return [_category_item(item) for item in _extract_json_fragment(response)]
+
+
+def parse_fused_response(response: str) -> List[Dict]:
+    return [_fused_item(item) for item in _extract_json_fragment(response)]
+
+
+def _score_batch(batch: List[Dict], client: LLMClient) -> List[Dict]:
+    message = build_sentence_batch_message(batch)
+    response = client.generate_response(
+        SCORE_SYSTEM_INSTRUCTION, message, model_size="small", output_schema=SCORE_OUTPUT_SCHEMA, validate=parse_score_response
+    )
+    return parse_score_response(response)
+
+
+def _categorize_batch(batch: List[Dict], client: LLMClient) -> List[Dict]:
+    message = build_sentence_batch_message(batch)
+    response = client.generate_response(
+        CATEGORIZE_SYSTEM_INSTRUCTION, message, model_size="small", output_schema=CATEGORY_OUTPUT_SCHEMA, validate=parse_category_response
+    )
+    return parse_category_response(response)
+
+
+def _score_and_categorize_batch(batch: List[Dict], client: LLMClient) -> List[Dict]:
+    message = build_sentence_batch_message(batch)
+    response = client.generate_response(
+        FUSED_SYSTEM_INSTRUCTION, message, model_size="small", output_schema=FUSED_OUTPUT_SCHEMA, validate=parse_fused_response
+    )
+    return parse_fused_response(response)
+
+
+# 배치 종류별 (시스템 프롬프트, 출력 스키마, 항목 변환, 응답 전체 파싱)
+_STREAM_KINDS = {
+    _score_batch: (SCORE_SYSTEM_INSTRUCTION, SCORE_OUTPUT_SCHEMA, _score_item, parse_score_response),
+    _categorize_batch: (CATEGORIZE_SYSTEM_INSTRUCTION, CATEGORY_OUTPUT_SCHEMA, _category_item, parse_category_response),
+    _score_and_categorize_batch: (FUSED_SYSTEM_INSTRUCTION, FUSED_OUTPUT_SCHEMA, _fused_item, parse_fused_response),
+}
+
+
+def supports_streaming(client) -> bool:
+    """스트리밍 응답을 사용할지 여부 (설정이 켜져 있고 클라이언트가 generate_response_stream을 제공할 때)"""
+    return STREAM_RESPONSES_ENABLED and hasattr(client, "generate_response_stream")
+
+
+def _stream_batch(
+    batch_fn, batch: List[Dict], client: LLMClient, on_items: Callable[[List[Dict]], None]
+) -> List[Dict]:
+    """
+    batch_fn(_score_batch 등)과 같은 요청을 스트리밍으로 보내고, 응답 배열의 항목이 완성될 때마다
+    변환한 결과를 on_items로 넘긴다. (작업 스레드에서 호출됨)
+    응답이 끝나면 on_items로 넘기지 못한 나머지 결과를 반환한다.
+    배열이 중간에 깨졌다면 응답 전체를 기존 방식(보정 포함)으로 다시 파싱해 빠진 id만 반환한다.
+    """
+    system_instruction, output_schema, item_fn, parse_fn = _STREAM_KINDS[batch_fn]
+    parser = JsonArrayItemParser()
+    dispatched: Set[int] = set()
+
+    def on_text(text: str) -> None:
+        fresh = []
+        for item in parser.feed(text):
+            if not isinstance(item, dict):
+                continue
+            result = item_fn(item)
+            idx = result["id"]
+            # 재시도로 응답이 처음부터 다시 오면 이미 넘긴 id는 건너뜀
+            if isinstance(idx, int):
+                if idx in dispatched:
+                    continue
+                dispatched.add(idx)
+            fresh.append(result)
+        if fresh:
+            on_items(fresh)
+
+    message = build_sentence_batch_message(batch)
+    response = client.generate_response_stream(
+        system_instruction, message, on_text, model_size="small", output_schema=output_schema, validate=parse_fn
+    )
+    if parser.closed:
+        return []
+    return [
+        result for result in parse_fn(response)
+        if not (isinstance(result["id"], int) and result["id"] in dispatched)
+    ]
+
+
+def _run_batches(batch_fn, batches: List[List[Dict]], client: LLMClient, executor: Optional[Executor]) -> List[Dict]:
+    all_results: List[Dict] = []
+    executor = executor or get_executor()
+    futures = [executor.submit(batch_fn, batch, client) for batch in batches]
+    for future in as_completed(futures):
+        all_results.extend(future.result())
+
+    # 입력 순서를 유지
+    return sorted(all_results, key=lambda x: x.get("id", 0))
+
+
+def score_sentence_importance(
+    sentences: List[str], client: LLMClient, executor: Optional[Executor] = None
+) -> List[Dict]:
+    """
+    중요도 1~5로 문장별 점수를 산출한다.
+    """
+    if not sentences:
+        return []
+
+    indexed_sentences = [
+        {"id": idx, "sentence": sentence}
+        for idx, sentence in enumerate(sentences)
+    ]
+    return _run_batches(_score_batch, batch_by_token_budget(indexed_sentences), client, executor)
+
+
+def categorize_sentences(
+    scored_sentences: List[Dict], client: LLMClient, executor: Optional[Executor] = None
+) -> List[Dict]:
+    """
+    중요도가 3 이상인 문장을 미리 정의된 카테고리로 분류한다.
+    """
+    if not scored_sentences:
+        return []
+
     sanitized = [
         {"id": item.get("id"), "sentence": str(item.get("sentence", "")).strip()}
         for item in scored_sentences
     ]
-    sentence_batches = [
-        sanitized[i : i + batch_size]
-        for i in range(0, len(sanitized), batch_size)
+    return _run_batches(_categorize_batch, batch_by_token_budget(sanitized), client, executor)
+
+
+def score_and_categorize_sentences(
+    sentences: List[str], client: LLMClient, executor: Optional[Executor] = None
+) -> List[Dict]:
+    """
+    중요도 점수화와 카테고리 분류를 한 번의 호출로 수행한다. (융합 모드)
+    category는 중요도 4 이상인 문장에만 포함된다.
+    """
+    if not sentences:
+        return []
+
+    indexed_sentences = [
+        {"id": idx, "sentence": sentence}
+        for idx, sentence in enumerate(sentences)
     ]
+    return _run_batches(_score_and_categorize_batch, batch_by_token_budget(indexed_sentences), client, executor)
 
-    def _categorize_batch(batch: List[Dict]) -> List[Dict]:
-        message = json.dumps({"sentences": batch}, ensure_ascii=False)
-        response = client.generate_response(system_instruction, message, model_size="small")
-        parsed = _extract_json_fragment(response)
-
-        batch_results = []
-        for item in parsed:
-            batch_results.append(
-                {
-                    "id": item.get("id"),
-                    "category": item.get("category", "기타"),
-                }
+
+def sentence_results_version(client: LLMClient, mode: str = SENTENCE_MODE_SEPARATE) -> str:
+    """
+    문장 단위 결과 저장소의 버전 키.
+    프롬프트나 소형 모델, 분석 방식이 바뀌면 값이 달라져 이전 결과를 재사용하지 않는다.
+    """
+    if mode == SENTENCE_MODE_FUSED:
+        prompts = [FUSED_SYSTEM_INSTRUCTION, CATEGORIZE_SYSTEM_INSTRUCTION]
+    else:
+        prompts = [SCORE_SYSTEM_INSTRUCTION, CATEGORIZE_SYSTEM_INSTRUCTION]
+    # "model-only": 모델이 낸 결과만 저장하도록 바뀌기 전의 항목(규칙·로컬 분류기 결과 포함)은 재사용하지 않음
+    source = "\n".join([client.small_model_id, "model-only", *prompts])
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def _score_and_categorize_pipelined(
+    pending: List[SentenceRecord],
+    uncategorized: List[SentenceRecord],
+    client: LLMClient,
+    mode: str,
+    executor: Optional[Executor] = None,
+) -> Set[int]:
+    """
+    pending 문장을 점수화하고, 중요 문장(4 이상)이 배치 하나를 채울 만큼 모이는 즉시 분류 배치를 제출한다.
+    (모든 점수화 배치가 끝나기를 기다리지 않음)
+    uncategorized는 점수는 있지만 category가 없는 중요 문장이며, 함께 분류한다.
+    로컬 분류기가 확신하는 중요 문장은 모델에 보내지 않고 바로 분류한다.
+    스트리밍을 사용하면 점수화 응답의 항목이 완성되는 대로 반영해, 배치 응답이 끝나기 전에도 분류 배치를 채운다.
+    결과는 각 레코드에 importance_score / category로 기록하고, 로컬 분류기로 분류한 레코드 id 집합을 반환한다.
+    """
+    flow = Dataflow(executor or get_executor())
+    streaming = supports_streaming(client)
+    index_to_record = {record.id: record for record in pending + uncategorized}
+    classifier = get_classifier() if LOCAL_CATEGORIZER_ENABLED else None
+    waiting: List[SentenceRecord] = []
+    routed = {"local": 0, "model": 0}
+    locally_categorized: Set[int] = set()
+
+    def queue_for_category(record: SentenceRecord) -> None:
+        category = classifier.classify(record.sentence) if classifier is not None else None
+        if category is not None:
+            record.category = category
+            locally_categorized.add(record.id)
+            routed["local"] += 1
+        else:
+            waiting.append(record)
+            routed["model"] += 1
+    score_batches = batch_by_token_budget([
+        # 점수화 입력의 id는 pending 내 위치
+        {"id": idx, "sentence": record.sentence}
+        for idx, record in enumerate(pending)
+    ])
+    remaining = {"score_batches": len(score_batches)}
+
+    def submit_categorize(flush: bool) -> None:
+        batches = batch_by_token_budget(waiting, size=record_tokens)
+        # 마지막 배치는 예산이 덜 찼을 수 있으므로 flush일 때만 제출
+        ready = batches if flush else batches[:-1]
+        del waiting[: sum(len(batch) for batch in ready)]
+        for batch in ready:
+            submit_batch(
+                _categorize_batch,
+                [{"id": record.id, "sentence": record.sentence} for record in batch],
+                on_items=on_categorized,
+                on_done=on_categorized,
             )
-        return batch_results
 
-    all_results: List[Dict] = []
-    with ThreadPoolExecutor(max_workers=len(sentence_batches)) as executor:
-        futures = [executor.submit(_categorize_batch, batch) for batch in sentence_batches]
-        for future in as_completed(futures):
-            all_results.extend(future.result())
+    def submit_batch(batch_fn, batch: List[Dict], on_items, on_done) -> None:
+        if streaming:
+            # 완성된 항목은 작업 스레드에서 드라이버 스레드로 전달되어 on_items로 반영되고,
+            # on_done은 스트림에서 꺼내지 못한 나머지 결과만 받음
+            flow.submit(_stream_batch, batch_fn, batch, client, lambda items: flow.post(on_items, items), on_done=on_done)
+        else:
+            flow.submit(batch_fn, batch, client, on_done=on_done)
+
+    def on_categorized(results: List[Dict]) -> None:
+        for item in results:
+            record = index_to_record.get(item.get("id"))
+            if record is not None:
+                record.category = item.get("category", "기타")
+
+    def on_score_items(results: List[Dict]) -> None:
+        apply_scores(results)
+        submit_categorize(flush=False)
+
+    def on_scored(results: List[Dict]) -> None:
+        apply_scores(results)
+        remaining["score_batches"] -= 1
+        submit_categorize(flush=remaining["score_batches"] == 0)
+
+    def apply_scores(results: List[Dict]) -> None:
+        for item in results:
+            idx = item.get("id")
+            if not (isinstance(idx, int) and 0 <= idx < len(pending)):
+                continue
+            record = pending[idx]
+            record.importance_score = item.get("importance_score", 0)
+            if item.get("category"):
+                record.category = item["category"]
+            elif record.importance_score >= 4:
+                queue_for_category(record)
+
+    for record in uncategorized:
+        queue_for_category(record)
+    score_fn = _score_and_categorize_batch if mode == SENTENCE_MODE_FUSED else _score_batch
+    for batch in score_batches:
+        submit_batch(score_fn, batch, on_items=on_score_items, on_done=on_scored)
+    submit_categorize(flush=not score_batches)
+    flow.run()
+    if routed["local"]:
+        print(f"로컬 분류기 확정: {routed['local']} / {routed['local'] + routed['model']}")
+    return locally_categorized
+
+
+def _model_result(record: SentenceRecord, locally_categorized: Set[int]) -> Dict:
+    """문장 결과 저장소에 기록할 모델 분석 결과 (로컬 분류기가 정한 category는 제외)"""
+    result = record.result()
+    if record.id in locally_categorized:
+        result.pop("category", None)
+    return result
+
+
+def analyze_sentences(
+    records: List[SentenceRecord], client: LLMClient, store=None, mode: Optional[str] = None
+) -> List[SentenceRecord]:
+    """
+    문장별 중요도 점수화와 카테고리 분류를 수행해 중요 문장(4 이상)만 반환한다.
+    규칙으로 점수를 확정할 수 있는 문장은 모델에 보내지 않고, 거의 같은 문장은 대표 문장만 보낸다.
+    store가 주어지면 이미 분석된 문장의 결과를 재사용하고, 새로 분석한 결과를 저장한다.
+    mode가 "fused"이면 점수화와 분류를 한 번의 호출로 수행한다. (기본값: TERMLENS_SENTENCE_MODE)
+    결과는 각 레코드의 importance_score / category에 기록하며, 분류까지 끝난 중요 문장 레코드를 반환한다.
+    """
+    mode = mode or SENTENCE_ANALYSIS_MODE
+
+    # 규칙으로 점수를 확정할 수 있는 문장(조항 제목, 연락처, 명백한 위험 조항 등)은 모델에 보내지 않음
+    decided: Set[int] = set()
+    if PREFILTER_ENABLED:
+        decided, rule_counts = prefilter_records(records)
+        print(f"규칙 기반 사전 분류: {len(decided)} / {len(records)} {rule_counts}")
+
+    # 낮은 점수로 확정된 문장은 분류도 필요 없으므로 저장소 조회에서도 제외
+    lookup = [
+        record for record in records
+        if record.id not in decided or record.importance_score >= 4
+    ]
 
-    return sorted(all_results, key=lambda x: x.get("id", 0))
+    keys: Dict[int, str] = {}
+    cached: Dict[str, Dict] = {}
+    if store is not None:
+        version = sentence_results_version(client, mode)
+        keys = {record.id: sentence_key(record.sentence, version) for record in lookup}
+        cached = store.get_many(keys.values())
+
+    # 저장소에 없고 규칙으로도 정하지 못한 문장만 모델에 전달
+    pending: List[SentenceRecord] = []
+    hits = 0
+    for record in lookup:
+        hit = cached.get(keys.get(record.id))
+        if hit is None:
+            if record.id not in decided:
+                pending.append(record)
+            continue
+        hits += 1
+        if record.id not in decided:
+            record.importance_score = hit["importance_score"]
+        if hit.get("category"):
+            record.category = hit["category"]
+    if store is not None:
+        print(f"문장 결과 저장소 적중: {hits} / {len(lookup)}")
+
+    # 저장소에 점수만 있고 category가 없는 중요 문장
+    uncategorized = [
+        record for record in records
+        if (record.importance_score or 0) >= 4 and record.category is None
+    ]
+
+    # 거의 같은 문장은 대표 문장 하나만 모델에 전달
+    representative_of = list(range(len(pending)))
+    if DEDUP_ENABLED and len(pending) > 1:
+        representative_of = representatives([record.sentence for record in pending])
+    unique = [record for idx, record in enumerate(pending) if representative_of[idx] == idx]
+    if len(unique) < len(pending):
+        print(f"유사 문장 중복 제거: {len(pending)} → {len(unique)}")
+
+    # 1) 중요도 점수화 → 2) 카테고리 분류 (점수화가 끝난 배치부터 바로 분류)
+    locally_categorized = _score_and_categorize_pipelined(unique, uncategorized, client, mode)
+
+    # 대표 문장의 결과를 같은 묶음의 문장에 복사
+    copied: Set[int] = set()
+    for idx, record in enumerate(pending):
+        representative = pending[representative_of[idx]]
+        if representative is record:
+            continue
+        copied.add(record.id)
+        if representative.importance_score is not None:
+            record.importance_score = representative.importance_score
+        if representative.category is not None:
+            record.category = representative.category
+            if representative.id in locally_categorized:
+                locally_categorized.add(record.id)
+
+    important = [record for record in records if (record.importance_score or 0) >= 4]
+    print(f"중요도 4 이상 문장 수: {len(important)}")
+    print(f"중요도 4 이상 문장들 길이 합: {sum(len(record) for record in important)}")
+
+    # 3) 새로 분석한 결과 저장
+    # 저장소 버전 키는 모델과 프롬프트만 반영하므로 모델이 낸 결과만 저장한다.
+    # (규칙으로 정한 점수, 로컬 분류기의 카테고리는 규칙·분류기가 바뀌면 달라질 수 있어 매번 다시 계산)
+    # 유사 문장에 복사한 결과도 그 문장을 모델이 본 결과가 아니므로 대표 문장의 결과만 저장한다.
+    if store is not None:
+        updated = {
+            record.id: record for record in pending + uncategorized
+            if record.id not in decided and record.id not in copied
+        }
+        store.put_many({
+            keys[idx]: _model_result(record, locally_categorized)
+            for idx, record in updated.items()
+            if record.importance_score is not None
+        })
+
+    return [record for record in important if record.category is not None]
@@ -1,22 +1,13 @@
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List
+from concurrent.futures import Executor, as_completed
+from typing import Dict, List, Optional
 
 from llm_client import LLMClient
+from runtime import get_executor
+from sentence_record import SentenceRecord
 
 
-def summarize_by_category(categorized_sentences: List[Dict], client: LLMClient) -> List[Dict]:
-    """
-    중요 문장을 카테고리별로 묶어 요약합니다.
-    """
-    if not categorized_sentences:
-        return []
-
-    grouped = defaultdict(list)
-    for item in categorized_sentences:
-        grouped[item["category"]].append(item)
-
-    system_instruction = """
+SUMMARY_SYSTEM_INSTRUCTION = """
 당신은 온라인 서비스 이용약관을 일반 사용자가 이해하기 쉽게 설명하는 약관 분석 전문가입니다.
 
 [입력 형식]
@@ -50,39 +41,68 @@ def summarize_by_category(categorized_sentences: List[Dict], client: LLMClient)
 """
 
 
-    def _summarize_category(category: str, items: List[Dict]) -> Dict:
-        message_lines = [
-            f"카테고리: {category}",
-            "중요 문장 목록:",
-        ]
-        for idx, entry in enumerate(items, start=1):
-            message_lines.append(
-                f"{idx}. 중요도 {entry.get('importance_score')}: {entry.get('sentence')}"
-            )
+def group_by_category(categorized_sentences: List[SentenceRecord]) -> Dict[str, List[SentenceRecord]]:
+    """중요 문장을 카테고리별로 묶는다. (처음 등장한 카테고리 순서 유지)"""
+    grouped = defaultdict(list)
+    for item in categorized_sentences:
+        grouped[item.category].append(item)
+    return dict(grouped)
+
+
+def build_summary_message(category: str, items: List[SentenceRecord]) -> str:
+    message_lines = [
+        f"카테고리: {category}",
+        "중요 문장 목록:",
+    ]
+    for idx, entry in enumerate(items, start=1):
+        message_lines.append(
+            f"{idx}. 중요도 {entry.importance_score}: {entry.sentence}"
+        )
+    return "\n".join(message_lines)
 
-        message = "\n".join(message_lines)
-        summary = client.generate_response(system_instruction, message, model_size="large").strip()
 
-        # 모델이 "요약:" 머리글을 덧붙이는 경우 이후 텍스트만 사용
-        marker = "요약:\n\n"
-        marker_idx = summary.find(marker)
-        if marker_idx != -1:
-            summary = summary[marker_idx + len(marker):].strip()
+def clean_summary(summary: str) -> str:
+    summary = summary.strip()
 
-        return {
-            "category": category,
-            "summary": summary,
-            "sentences": items,
-        }
+    # 모델이 "요약:" 머리글을 덧붙이는 경우 이후 텍스트만 사용
+    marker = "요약:\n\n"
+    marker_idx = summary.find(marker)
+    if marker_idx != -1:
+        summary = summary[marker_idx + len(marker):].strip()
+    return summary
+
+
+def summarize_category(category: str, items: List[SentenceRecord], client: LLMClient) -> Dict:
+    """
+    한 카테고리의 중요 문장을 요약한다.
+    반환 형식: { "category", "summary", "sentences" } (sentences는 입력 레코드 그대로)
+    """
+    message = build_summary_message(category, items)
+    summary = client.generate_response(SUMMARY_SYSTEM_INSTRUCTION, message, model_size="large")
+
+    return {
+        "category": category,
+        "summary": clean_summary(summary),
+        "sentences": items,
+    }
+
+
+def summarize_by_category(
+    categorized_sentences: List[SentenceRecord], client: LLMClient, executor: Optional[Executor] = None
+) -> List[Dict]:
+    """
+    중요 문장을 카테고리별로 묶어 요약합니다.
+    """
+    if not categorized_sentences:
+        return []
 
     summaries: List[Dict] = []
-    categories = list(grouped.items())
-    with ThreadPoolExecutor(max_workers=len(categories) or 1) as executor:
-        futures = [
-            executor.submit(_summarize_category, category, items)
-            for category, items in categories
-        ]
-        for future in as_completed(futures):
-            summaries.append(future.result())
+    executor = executor or get_executor()
+    futures = [
+        executor.submit(summarize_category, category, items, client)
+        for category, items in group_by_category(categorized_sentences).items()
+    ]
+    for future in as_completed(futures):
+        summaries.append(future.result())
 
     return summaries
@@ -0,0 +1,26 @@
+import html
+import re
+from typing import Tuple
+
+
+# 블록 정규화의 기존 구현 (고정된 기준)
+# 블록 전체에 정규식 치환을 차례로 적용하던 구현을 그대로 보관한다.
+# text_splitter._normalize_block, StreamingNormalizer를 바꿀 때 결과가 같은지 비교하는 기준이므로 이 파일은 수정하지 않는다.
+# (tests/test_text_splitter.py, scripts/benchmark_splitter.py에서 사용)
+
+
+def reference_normalize_block(block: str) -> str:
+    text = html.unescape(block)
+    text = re.sub(r"<\s*br\s*/?>", "\n", text, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = text.replace("\u00a0", " ")
+    text = re.sub(r"[“”]", '"', text)
+    text = re.sub(r"[‘’]", "'", text)
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub(r"[ ]*\n[ ]*", "\n", text)
+    return text.strip()
+
+
+def reference_counts(text: str) -> Tuple[int, int]:
+    return len(re.findall(r"[가-힣]", text)), len(re.findall(r"[A-Za-z]", text))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# src/ 모듈을 패키지 없이 그대로 임포트 (scripts/와 같은 방식)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
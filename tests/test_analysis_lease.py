@@ -0,0 +1,119 @@
+import hashlib
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import lambda_function
+from analysis_lease import DynamoDBLeaseStore, InMemoryLeaseStore
+from runtime import ANALYSIS_TABLE_NAME, RuntimeContext, set_runtime
+
+
+class ConditionalCheckFailedException(Exception):
+    pass
+
+
+class FakeLeaseTable:
+    """DynamoDB 임대 테이블의 조건부 쓰기/삭제를 흉내 낸다. (임대 저장소가 쓰는 조건식만 해석)"""
+
+    def __init__(self):
+        self.items = {}
+        self.meta = SimpleNamespace(client=SimpleNamespace(
+            exceptions=SimpleNamespace(ConditionalCheckFailedException=ConditionalCheckFailedException)
+        ))
+
+    def put_item(self, Item, ConditionExpression, ExpressionAttributeValues):
+        current = self.items.get(Item["lease_key"])
+        if current is not None and not current["expires_at"] < ExpressionAttributeValues[":now"]:
+            raise ConditionalCheckFailedException()
+        self.items[Item["lease_key"]] = Item
+
+    def delete_item(self, Key, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+        current = self.items.get(Key["lease_key"])
+        if current is None or current["owner"] != ExpressionAttributeValues[":owner"]:
+            raise ConditionalCheckFailedException()
+        del self.items[Key["lease_key"]]
+
+
+@pytest.fixture(params=["memory", "dynamodb"])
+def lease_store(request):
+    return InMemoryLeaseStore() if request.param == "memory" else DynamoDBLeaseStore(FakeLeaseTable())
+
+
+def test_only_one_owner(lease_store):
+    assert lease_store.acquire("doc", "a", 60)
+    assert not lease_store.acquire("doc", "b", 60)
+    # 다른 문서 버전은 별개의 임대
+    assert lease_store.acquire("doc#v2", "b", 60)
+
+
+def test_release_by_owner_only(lease_store):
+    assert lease_store.acquire("doc", "a", 60)
+    lease_store.release("doc", "b")
+    assert not lease_store.acquire("doc", "b", 60)
+    lease_store.release("doc", "a")
+    assert lease_store.acquire("doc", "b", 60)
+
+
+def test_expired_lease_can_be_taken_over(lease_store):
+    assert lease_store.acquire("doc", "a", -5)
+    assert lease_store.acquire("doc", "b", 60)
+    # 만료 후 다른 호출이 가져간 임대는 이전 보유자가 지우지 못함
+    lease_store.release("doc", "a")
+    assert not lease_store.acquire("doc", "c", 60)
+
+
+class FakeAnalysisTable:
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get(Key["url"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["url"]] = Item
+
+
+class FinishingLeaseStore(InMemoryLeaseStore):
+    """임대를 내주기 직전에 이전 보유자가 결과를 저장하고 임대를 놓은 상황을 만든다."""
+
+    def __init__(self, on_acquire):
+        super().__init__()
+        self.on_acquire = on_acquire
+        self.released = []
+
+    def acquire(self, key, owner, ttl_seconds):
+        self.on_acquire()
+        return super().acquire(key, owner, ttl_seconds)
+
+    def release(self, key, owner):
+        self.released.append(key)
+        super().release(key, owner)
+
+
+def test_result_saved_before_lease_is_returned(monkeypatch):
+    url = "https://example.com/tos"
+    content = "<p>회사는 사전 통지 없이 서비스를 변경할 수 있습니다.</p>"
+    url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    table = FakeAnalysisTable()
+    clause = {"category": "약관 및 서비스 변경", "evaluation": "bad"}
+
+    def previous_owner_finishes():
+        table.put_item({
+            "url": url_hash, "content_hash": content_hash, "raw_hash": "other",
+            "overall_evaluation": "bad", "evaluation_for_each_clause": [clause],
+        })
+
+    leases = FinishingLeaseStore(previous_owner_finishes)
+    # 파이프라인을 실행하면 LLM 클라이언트를 만들다 실패하도록 클라이언트를 넘기지 않음
+    set_runtime(RuntimeContext(tables={ANALYSIS_TABLE_NAME: table}, lease_store=leases))
+    monkeypatch.setattr(lambda_function, "_extract_content", lambda body: content)
+    try:
+        events = list(lambda_function.iter_analysis_events(url, f"<html>{time.time()}</html>"))
+    finally:
+        set_runtime(None)
+
+    assert events == [{"type": "clause", **clause}, {"type": "overall", "overall_evaluation": "bad"}]
+    assert leases.released == [f"{url_hash}#{content_hash}"]
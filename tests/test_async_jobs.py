@@ -0,0 +1,113 @@
+from async_jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RETRYING,
+    InMemoryJobQueue,
+    LocalObjectStorage,
+    failed_message_ids,
+    get_job_status,
+    process_job,
+    submit_job,
+)
+
+RESULT = {"overall_evaluation": "bad", "evaluation_for_each_clause": []}
+CLAUSE = {"category": "기타", "evaluation": "bad"}
+
+
+def analyze_ok(url, body, on_stage=None, on_clause=None):
+    on_stage("categorized")
+    on_clause(CLAUSE)
+    return 200, RESULT
+
+
+def test_submit_and_process_job(tmp_path):
+    storage = LocalObjectStorage(str(tmp_path))
+    queue = InMemoryJobQueue()
+    job_id = submit_job("https://example.com/tos", "<p>약관</p>", storage, queue)
+    assert get_job_status(job_id, storage)["status"] == JOB_QUEUED
+
+    seen = []
+
+    def worker(message):
+        seen.append(message)
+        return process_job(message, storage, analyze_ok)
+
+    assert queue.drain(worker) == 1
+    assert seen == [{"job_id": job_id, "url": "https://example.com/tos"}]
+    status = get_job_status(job_id, storage)
+    assert status["status"] == JOB_COMPLETED
+    assert status["result"] == RESULT
+
+
+def test_partial_results_are_visible_while_running(tmp_path):
+    storage = LocalObjectStorage(str(tmp_path))
+    job_id = submit_job("https://example.com/tos", "<p>약관</p>", storage, InMemoryJobQueue())
+    snapshots = []
+
+    def analyze(url, body, on_stage=None, on_clause=None):
+        on_clause(CLAUSE)
+        snapshots.append(get_job_status(job_id, storage))
+        return 200, RESULT
+
+    process_job({"job_id": job_id, "url": "https://example.com/tos"}, storage, analyze)
+    assert snapshots[0]["partial_results"] == [CLAUSE]
+
+
+def test_in_progress_job_is_requeued(tmp_path):
+    storage = LocalObjectStorage(str(tmp_path))
+    job_id = submit_job("https://example.com/tos", "<p>약관</p>", storage, InMemoryJobQueue())
+    analyze = lambda url, body, on_stage=None, on_clause=None: (202, {"status": "in_progress"})  # noqa: E731
+    assert process_job({"job_id": job_id, "url": "https://example.com/tos"}, storage, analyze) is False
+    assert get_job_status(job_id, storage)["status"] == JOB_QUEUED
+
+
+def test_failures(tmp_path):
+    storage = LocalObjectStorage(str(tmp_path))
+    job_id = submit_job("https://example.com/tos", "<p>약관</p>", storage, InMemoryJobQueue())
+
+    # 입력 오류는 재시도하지 않음
+    bad_input = lambda url, body, on_stage=None, on_clause=None: (400, {"error": "약관 전처리에 실패했습니다."})  # noqa: E731
+    assert process_job({"job_id": job_id, "url": "u"}, storage, bad_input) is True
+    assert get_job_status(job_id, storage)["status"] == JOB_FAILED
+
+    # 예외는 재시도 대상: 마지막 시도 전까지는 종료 상태가 아님
+    def crash(url, body, on_stage=None, on_clause=None):
+        raise RuntimeError("boom")
+
+    assert process_job({"job_id": job_id, "url": "u"}, storage, crash, max_attempts=3) is False
+    status = get_job_status(job_id, storage)
+    assert status["status"] == JOB_RETRYING
+    assert status["error"] == "boom"
+    assert status["attempt"] == 1
+
+    assert process_job({"job_id": job_id, "url": "u", "attempt": 2}, storage, crash, max_attempts=3) is False
+    assert get_job_status(job_id, storage)["status"] == JOB_RETRYING
+
+    # 마지막 시도에서 실패하면 failed (메시지는 DLQ로 옮겨지도록 False)
+    assert process_job({"job_id": job_id, "url": "u", "attempt": 3}, storage, crash, max_attempts=3) is False
+    status = get_job_status(job_id, storage)
+    assert status["status"] == JOB_FAILED
+    assert status["error"] == "boom"
+
+    # 본문이 없는 작업
+    assert process_job({"job_id": "missing", "url": "u"}, storage, analyze_ok) is True
+    assert get_job_status("missing", storage)["status"] == JOB_FAILED
+
+
+def test_failed_message_ids():
+    records = [
+        {"messageId": "a", "body": '{"job_id": "1"}'},
+        {"messageId": "b", "body": '{"job_id": "2"}'},
+    ]
+    assert failed_message_ids(records, lambda message: message["job_id"] == "1") == ["b"]
+
+
+def test_receive_count_is_passed_as_attempt():
+    records = [
+        {"messageId": "a", "body": '{"job_id": "1"}', "attributes": {"ApproximateReceiveCount": "3"}},
+        {"messageId": "b", "body": '{"job_id": "2"}'},
+    ]
+    seen = []
+    failed_message_ids(records, lambda message: seen.append(message["attempt"]) or True)
+    assert seen == [3, 1]
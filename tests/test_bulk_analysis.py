@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bulk_analysis import LocalBatchBackend, read_batch_output, run_bulk, stage_paths
+from simulated_llm import LARGE_MODEL_ID, SMALL_MODEL_ID, SimulatedLLMClient
+
+
+DOCUMENT = "\n".join([
+    "제1조 (목적)",
+    "이 약관은 회사가 제공하는 온라인 서비스의 이용 조건과 절차를 정합니다.",
+    "회사는 이용자의 동의 없이 개인정보를 마케팅 목적으로 활용할 수 있습니다.",
+    "유료 서비스는 매월 결제일에 등록된 결제 수단으로 이용 요금이 청구됩니다.",
+    "이용자는 언제든지 설정 메뉴에서 회원 탈퇴를 신청할 수 있습니다.",
+    "회사는 서비스 운영상 필요한 경우 공지 후 서비스 내용을 변경할 수 있습니다.",
+])
+
+
+class CountingClient(SimulatedLLMClient):
+    """단계(시스템 프롬프트)별 호출 수를 세는 가짜 클라이언트."""
+
+    def __init__(self):
+        super().__init__(sleep=lambda seconds: None, important_ratio=0.8)
+        self.calls = []
+
+    def generate_response(self, system_instruction, message, **kwargs):
+        self.calls.append(message)
+        return super().generate_response(system_instruction, message, **kwargs)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def _run(work_dir, documents, client, executor):
+    backend = LocalBatchBackend(str(work_dir), client=client, executor=executor)
+    return run_bulk(documents, backend, SMALL_MODEL_ID, LARGE_MODEL_ID)
+
+
+def test_run_bulk_with_local_backend(tmp_path, executor):
+    client = CountingClient()
+    results = _run(tmp_path, {"a": DOCUMENT, "b": DOCUMENT.replace("회사", "당사")}, client, executor)
+
+    assert set(results) == {"a", "b"}
+    for result in results.values():
+        assert "overall_evaluation" in result
+        assert result["evaluation_for_each_clause"]
+    assert client.calls
+    assert any(name.startswith("score.") and name.endswith(".jsonl.out") for name in os.listdir(tmp_path))
+
+
+def test_rerun_reuses_stage_outputs(tmp_path, executor):
+    documents = {"a": DOCUMENT}
+    first = _run(tmp_path, documents, CountingClient(), executor)
+
+    client = CountingClient()
+    assert _run(tmp_path, documents, client, executor) == first
+    assert client.calls == []
+
+
+def test_changed_input_is_resubmitted(tmp_path, executor):
+    _run(tmp_path, {"a": DOCUMENT}, CountingClient(), executor)
+
+    # recordId는 같은 순번(TL000000001…)이지만 내용이 달라졌으므로 이전 출력을 쓰면 안 됨
+    changed = DOCUMENT.replace("개인정보를 마케팅 목적으로", "위치 정보를 광고 목적으로")
+    client = CountingClient()
+    _run(tmp_path, {"a": changed}, client, executor)
+
+    assert any("위치 정보를 광고 목적으로" in message for message in client.calls)
+
+
+def test_stage_paths_depend_on_input_and_model(tmp_path):
+    requests = [{"recordId": "TL000000001", "system": "system", "message": "message"}]
+    input_path, output_path = stage_paths(str(tmp_path), "score", SMALL_MODEL_ID, requests)
+
+    assert os.path.exists(input_path)
+    assert stage_paths(str(tmp_path), "score", SMALL_MODEL_ID, requests)[1] == output_path
+    changed = [dict(requests[0], message="message 2")]
+    assert stage_paths(str(tmp_path), "score", SMALL_MODEL_ID, changed)[1] != output_path
+    assert stage_paths(str(tmp_path), "score", LARGE_MODEL_ID, requests)[1] != output_path
+
+
+def test_failed_records_are_skipped(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text(
+        '{"recordId": "TL000000001", "modelOutput": {"output": {"message": {"content": [{"text": "ok"}]}}}}\n'
+        '{"recordId": "TL000000002", "error": "throttled"}\n\n',
+        encoding="utf-8",
+    )
+    assert read_batch_output(str(path), "amazon.nova-lite-v1:0") == {"TL000000001": "ok"}
@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from category_classifier import KeywordCategoryClassifier, get_classifier
+from sentence_record import SentenceRecord
+from simulated_llm import SimulatedLLMClient
+import tos_processing
+
+
+PAYMENT = "유료 서비스의 결제 후 7일 이내에는 환불을 요청할 수 있으며 별도의 수수료는 부과되지 않습니다."
+UNRELATED = "본 조항은 회사와 회원 사이의 일반적인 사항을 정합니다."
+
+
+class CategorizeCountingClient(SimulatedLLMClient):
+    """분류 호출에 담긴 문장을 기록하는 가짜 클라이언트."""
+
+    def __init__(self):
+        super().__init__(sleep=lambda seconds: None)
+        self.categorized = []
+
+    def _respond(self, system_instruction, message):
+        if system_instruction == tos_processing.CATEGORIZE_SYSTEM_INSTRUCTION:
+            self.categorized.append(message)
+        return super()._respond(system_instruction, message)
+
+
+def test_confident_match():
+    classifier = get_classifier()
+    assert classifier.classify(PAYMENT) == "결제 및 환불 규정"
+    category, confidence = classifier.predict(PAYMENT)
+    assert category == "결제 및 환불 규정"
+    assert confidence >= classifier.threshold
+
+
+def test_no_match_returns_none():
+    classifier = get_classifier()
+    assert classifier.predict(UNRELATED) == (None, 0.0)
+    assert classifier.classify(UNRELATED) is None
+    # 영문 어휘는 단어 단위로만 일치 (fee ≠ feedback)
+    assert classifier.matched_keywords("Send us your feedback.") == []
+
+
+def test_ambiguous_or_tied_sentence_returns_none():
+    classifier = KeywordCategoryClassifier({"A": {"alpha": 3}, "B": {"beta": 3, "gamma": 1}})
+    # 동점: 신뢰도 0.5
+    assert classifier.predict("alpha beta") == ("A", 0.5)
+    assert classifier.classify("alpha beta") is None
+    # 약한 단서 하나뿐이면 (min_score 미만) 확정하지 않음
+    assert classifier.predict("gamma") == ("B", 0.0)
+    assert classifier.classify("gamma") is None
+    # 여러 카테고리 어휘가 섞인 문장
+    assert get_classifier().classify("회사는 결제 정보와 함께 개인정보를 수집합니다.") is None
+
+
+def test_keyword_spacing_is_flexible():
+    classifier = KeywordCategoryClassifier({"A": {"sign up": 3}})
+    assert classifier.classify("You must SIGN  UP first.") == "A"
+    assert classifier.classify("You must signup first.") == "A"
+
+
+def test_unclassified_sentences_fall_back_to_model(monkeypatch):
+    monkeypatch.setattr(tos_processing, "LOCAL_CATEGORIZER_ENABLED", True)
+    text = f"{PAYMENT}\n{UNRELATED}"
+    local = SentenceRecord(0, 0, len(PAYMENT), text, importance_score=5)
+    model = SentenceRecord(1, len(PAYMENT) + 1, len(text), text, importance_score=4)
+    client = CategorizeCountingClient()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        locally_categorized = tos_processing._score_and_categorize_pipelined(
+            [], [local, model], client, tos_processing.SENTENCE_MODE_SEPARATE, executor=executor,
+        )
+
+    assert locally_categorized == {0}
+    assert local.category == "결제 및 환불 규정"
+    assert model.category is not None
+    assert len(client.categorized) == 1
+    assert UNRELATED in client.categorized[0]
+    assert PAYMENT not in client.categorized[0]
@@ -0,0 +1,92 @@
+import pytest
+
+from checkpoint_store import MAX_DYNAMODB_PAYLOAD_BYTES, DynamoDBCheckpointStore, InMemoryCheckpointStore
+from sentence_record import dump_records
+from text_splitter import split_sentences_block
+from tos_pipeline import _load_sentences, _run_stage
+
+
+class FakeTable:
+    """get_item/put_item만 흉내 낸 DynamoDB 테이블"""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get(Key["checkpoint_id"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["checkpoint_id"]] = Item
+
+
+class FailingStore:
+    def get(self, content_hash, stage):
+        return None
+
+    def put(self, content_hash, stage, value):
+        raise RuntimeError("ValidationException: Item size has exceeded the maximum allowed size")
+
+
+def test_in_memory_store_keeps_snapshot():
+    store = InMemoryCheckpointStore()
+    value = {"records": [1, 2]}
+    store.put("hash", "stage", value)
+    value["records"].append(3)
+    assert store.get("hash", "stage") == {"records": [1, 2]}
+    assert store.get("hash", "other") is None
+
+
+def test_dynamodb_store_round_trip():
+    store = DynamoDBCheckpointStore(FakeTable())
+    store.put("hash", "clause:기타", {"label": "bad", "reasoning": "일방적 변경"})
+    assert store.get("hash", "clause:기타") == {"label": "bad", "reasoning": "일방적 변경"}
+    assert "expires_at" in store.table.items["hash#clause:기타"]
+
+
+def test_dynamodb_store_skips_oversized_payload():
+    store = DynamoDBCheckpointStore(FakeTable())
+    # 한글은 UTF-8로 3바이트이므로 글자 수가 아니라 바이트 수로 판단해야 함
+    store.put("hash", "sentences", "가" * (MAX_DYNAMODB_PAYLOAD_BYTES // 3 + 1))
+    assert store.table.items == {}
+    assert store.get("hash", "sentences") is None
+
+
+def test_run_stage_reuses_checkpoint():
+    store = InMemoryCheckpointStore()
+    calls = []
+    run = lambda: calls.append(1) or [1, 2]  # noqa: E731
+    assert _run_stage(store, "hash", "stage", run) == [1, 2]
+    assert _run_stage(store, "hash", "stage", run) == [1, 2]
+    assert len(calls) == 1
+
+
+def test_run_stage_ignores_unloadable_checkpoint():
+    store = InMemoryCheckpointStore()
+    store.put("hash", "stage", ["이전 형식"])
+    assert _run_stage(store, "hash", "stage", lambda: "new", load=lambda payload: None) == "new"
+
+
+def test_run_stage_survives_checkpoint_write_failure():
+    assert _run_stage(FailingStore(), "hash", "stage", lambda: "result") == "result"
+
+
+@pytest.mark.parametrize("content", [
+    "<p>제1조 (목적) 이 약관은 회사가 제공하는 서비스의 이용 조건을 정합니다.</p><p>회사는 사전 통지 없이 서비스를 변경할 수 있습니다.</p>",
+    "Welcome &amp; thanks.  We may terminate your account at any time. You agree to binding arbitration.",
+])
+def test_sentence_checkpoint_rebuilds_text_from_input(content):
+    records = split_sentences_block(content)
+    payload = dump_records(records, include_text=False)
+    assert "text" not in payload
+
+    restored = _load_sentences(payload, content)
+    assert [record.sentence for record in restored] == [record.sentence for record in records]
+    # 같은 문서의 레코드는 같은 본문 객체를 공유
+    assert len({id(record.text) for record in restored}) == 1
+
+
+def test_sentence_checkpoint_rejects_spans_outside_text():
+    records = split_sentences_block("회사는 사전 통지 없이 서비스를 변경할 수 있습니다. 회원은 이에 동의합니다.")
+    payload = dump_records(records, include_text=False)
+    assert _load_sentences(payload, "짧은 본문") is None
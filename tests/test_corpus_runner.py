@@ -0,0 +1,99 @@
+import hashlib
+import json
+
+from corpus_runner import load_completed, run_corpus
+from simulated_llm import SimulatedLLMClient
+from tos_pipeline import split_document
+
+DOCUMENT = (
+    "<p>회사는 사전 통지 없이 서비스의 전부 또는 일부를 변경할 수 있습니다.</p>"
+    "<p>유료 서비스의 이용 요금은 매월 등록된 결제 수단으로 청구됩니다.</p>"
+    "<p>회원은 설정 메뉴에서 언제든지 회원 탈퇴를 신청할 수 있습니다.</p>"
+)
+
+
+def prepare_stub(path):
+    """(프로세스 풀에서 실행) trafilatura 없이 파일 내용을 그대로 본문으로 사용한다."""
+    with open(path, encoding="utf-8") as f:
+        body = f.read()
+    if "broken" in body:
+        return {"path": path, "error": "약관 전처리에 실패했습니다."}
+    if "crash" in body:
+        raise RuntimeError("추출 중 오류")
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    return {"path": path, "raw_hash": digest, "content_hash": digest, "sentences": split_document(body)}
+
+
+def _write_docs(tmp_path, contents):
+    paths = []
+    for name, content in contents.items():
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def _run(paths, out_path, seen=None):
+    client = SimulatedLLMClient(sleep=lambda seconds: None)
+    return run_corpus(
+        paths, str(out_path), client, processes=1, documents=2, prepare=prepare_stub,
+        on_record=None if seen is None else seen.append,
+    )
+
+
+def _lines(out_path):
+    return out_path.read_text(encoding="utf-8").splitlines()
+
+
+def test_load_completed(tmp_path):
+    out_path = tmp_path / "out.jsonl"
+    assert load_completed(str(out_path)) == set()
+
+    out_path.write_text(
+        json.dumps({"path": "a", "result": {}}) + "\n"
+        + json.dumps({"path": "b", "error": "실패"}) + "\n"
+        + "\n"
+        + '{"path": "c", "result": {"overall_eval',
+        encoding="utf-8",
+    )
+    # 오류 줄과 잘린 마지막 줄은 완료로 보지 않음
+    assert load_completed(str(out_path)) == {"a"}
+
+
+def test_run_corpus_records_results_and_errors(tmp_path):
+    paths = _write_docs(tmp_path, {"a.html": DOCUMENT, "b.html": "broken", "c.html": "crash"})
+    out_path = tmp_path / "out.jsonl"
+
+    counts = _run(paths, out_path)
+
+    assert counts == {"skipped": 0, "completed": 1, "failed": 2}
+    records = {record["path"]: record for record in map(json.loads, _lines(out_path))}
+    assert "overall_evaluation" in records[paths[0]]["result"]
+    assert records[paths[1]]["error"] == "약관 전처리에 실패했습니다."
+    assert records[paths[2]]["error"] == "추출 중 오류"
+
+
+def test_resume_skips_completed_and_retries_errors(tmp_path):
+    paths = _write_docs(tmp_path, {"a.html": DOCUMENT, "b.html": DOCUMENT, "c.html": DOCUMENT})
+    out_path = tmp_path / "out.jsonl"
+    # a는 완료, b는 오류로 끝남, c는 쓰는 도중 중단되어 마지막 줄이 잘림
+    out_path.write_text(
+        json.dumps({"path": paths[0], "result": {"overall_evaluation": "good"}}, ensure_ascii=False) + "\n"
+        + json.dumps({"path": paths[1], "error": "ThrottlingException"}) + "\n"
+        + json.dumps({"path": paths[2], "result": {}})[:25],
+        encoding="utf-8",
+    )
+
+    seen = []
+    counts = _run(paths, out_path, seen)
+
+    assert counts == {"skipped": 1, "completed": 2, "failed": 0}
+    assert sorted(record["path"] for record in seen) == paths[1:]
+    assert load_completed(str(out_path)) == set(paths)
+    # 잘린 줄 뒤에 새 결과를 이어 붙이지 않음
+    lines = _lines(out_path)
+    assert len(lines) == 5
+    assert all("result" in json.loads(line) for line in lines[3:])
+
+    # 모두 끝난 뒤 다시 실행하면 아무것도 하지 않음
+    assert _run(paths, out_path) == {"skipped": 3, "completed": 0, "failed": 0}
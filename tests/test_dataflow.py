@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dataflow import Dataflow
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def test_callbacks_run_on_driver_thread(executor):
+    flow = Dataflow(executor)
+    driver = threading.get_ident()
+    threads = []
+    for value in range(5):
+        flow.submit(lambda x: x * 2, value, on_done=lambda result: threads.append((threading.get_ident(), result)))
+    flow.run()
+    assert sorted(result for _, result in threads) == [0, 2, 4, 6, 8]
+    assert {ident for ident, _ in threads} == {driver}
+
+
+def test_follow_up_runs_without_waiting_for_slow_task(executor):
+    # 느린 작업이 끝나기 전에 빠른 작업의 후속 작업이 실행되어야 함 (단계 간 장벽 없음)
+    flow = Dataflow(executor)
+    release_slow = threading.Event()
+    order = []
+
+    def slow():
+        assert release_slow.wait(5)
+        return "slow"
+
+    def follow_up():
+        order.append("follow_up")
+        release_slow.set()
+        return "follow_up"
+
+    flow.submit(slow, on_done=order.append)
+    flow.submit(lambda: "fast", on_done=lambda result: (order.append(result), flow.submit(follow_up)))
+    flow.run()
+    assert order == ["fast", "follow_up", "slow"]
+
+
+def test_posts_are_handled_before_task_completion(executor):
+    flow = Dataflow(executor)
+    events = []
+
+    def task(name):
+        for idx in range(3):
+            flow.post(events.append, (name, idx))
+        return name
+
+    for name in ("a", "b"):
+        flow.submit(task, name, on_done=lambda result: events.append((result, "done")))
+    flow.run()
+    for name in ("a", "b"):
+        mine = [event for event in events if event[0] == name]
+        # 같은 작업의 중간 결과는 보낸 순서대로, 완료 콜백보다 먼저 처리
+        assert mine == [(name, 0), (name, 1), (name, 2), (name, "done")]
+
+
+def test_run_returns_when_nothing_submitted(executor):
+    Dataflow(executor).run()
+
+
+def test_task_exception_propagates(executor):
+    flow = Dataflow(executor)
+
+    def fail():
+        raise ValueError("boom")
+
+    flow.submit(fail)
+    with pytest.raises(ValueError):
+        flow.run()
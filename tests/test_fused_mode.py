@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from sentence_record import SentenceRecord
+from simulated_llm import SimulatedLLMClient
+import tos_processing
+from tos_processing import (
+    CATEGORIZE_SYSTEM_INSTRUCTION,
+    FUSED_SYSTEM_INSTRUCTION,
+    SCORE_SYSTEM_INSTRUCTION,
+    SENTENCE_MODE_FUSED,
+    SENTENCE_MODE_SEPARATE,
+    parse_fused_response,
+)
+
+SENTENCES = [
+    "회원은 서비스 이용 시 관계 법령과 이 약관의 규정을 준수하여야 합니다.",
+    "회사는 회원이 등록한 게시물을 서비스 홍보 목적으로 사용할 수 있습니다.",
+    "유료 서비스의 이용 요금은 매월 등록된 결제 수단으로 청구됩니다.",
+    "회원은 설정 메뉴에서 언제든지 알림 수신 여부를 변경할 수 있습니다.",
+    "회사는 운영상 필요한 경우 서비스의 전부 또는 일부를 변경할 수 있습니다.",
+]
+
+
+def test_parse_fused_response():
+    response = json.dumps([
+        {"id": 0, "importance_score": 5, "category": "금지사항"},
+        {"id": 1, "importance_score": 4},
+        {"id": 2, "importance_score": 4, "category": None},
+        {"id": 3, "importance_score": 2, "category": "금지사항"},
+        {"id": 4, "importance_score": "4", "category": "결제 및 환불 규정"},
+        {"id": 5, "importance_score": "high"},
+    ], ensure_ascii=False)
+    assert parse_fused_response(response) == [
+        {"id": 0, "importance_score": 5, "category": "금지사항"},
+        # 중요 문장에 category가 없으면 기타
+        {"id": 1, "importance_score": 4, "category": "기타"},
+        {"id": 2, "importance_score": 4, "category": "기타"},
+        # 중요하지 않은 문장의 category는 버림
+        {"id": 3, "importance_score": 2},
+        {"id": 4, "importance_score": 4, "category": "결제 및 환불 규정"},
+        # 숫자가 아닌 점수는 0
+        {"id": 5, "importance_score": 0},
+    ]
+
+
+def test_parse_fused_response_with_surrounding_text():
+    assert parse_fused_response('```json\n[{"id": 0, "importance_score": 5}]\n```') == [
+        {"id": 0, "importance_score": 5, "category": "기타"},
+    ]
+    assert parse_fused_response('결과: [{"id": 0, "importance_score": 1}] 입니다.') == [
+        {"id": 0, "importance_score": 1},
+    ]
+
+
+def test_parse_fused_response_truncated_output():
+    # 마지막 항목의 값까지 온 응답은 닫는 기호를 보정해 파싱
+    assert parse_fused_response('[{"id": 0, "importance_score": 5, "category": "금지사항"}, {"id": 1, "importance_score": 4') == [
+        {"id": 0, "importance_score": 5, "category": "금지사항"},
+        {"id": 1, "importance_score": 4, "category": "기타"},
+    ]
+
+
+@pytest.mark.parametrize("response", [
+    '[{"id": 0, "importance_score": 5}, {"id": 1, "impo',
+    '[{"id": 0, "importance_score": 5}, {"id": 1, "importance_score":',
+    "점수를 매길 수 없습니다.",
+])
+def test_parse_fused_response_rejects_broken_output(response):
+    # 검증(validate)에서 예외가 나야 클라이언트가 다시 요청하고 캐시에 남기지 않음
+    with pytest.raises(ValueError):
+        parse_fused_response(response)
+
+
+class RecordingClient(SimulatedLLMClient):
+    """호출마다 시스템 프롬프트를 기록하는 가짜 클라이언트."""
+
+    def __init__(self):
+        super().__init__(sleep=lambda seconds: None, important_ratio=0.6)
+        self.systems = []
+
+    def _respond(self, system_instruction, message):
+        self.systems.append(system_instruction)
+        return super()._respond(system_instruction, message)
+
+
+def _records():
+    text = "\n".join(SENTENCES)
+    records, start = [], 0
+    for idx, sentence in enumerate(SENTENCES):
+        records.append(SentenceRecord(idx, start, start + len(sentence), text))
+        start += len(sentence) + 1
+    return records
+
+
+@pytest.fixture(autouse=True)
+def pipeline_flags(monkeypatch):
+    monkeypatch.setattr(tos_processing, "PREFILTER_ENABLED", False)
+    monkeypatch.setattr(tos_processing, "LOCAL_CATEGORIZER_ENABLED", False)
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_mode_switch(monkeypatch, streaming):
+    monkeypatch.setattr(tos_processing, "STREAM_RESPONSES_ENABLED", streaming)
+
+    separate_client = RecordingClient()
+    separate = _records()
+    tos_processing.analyze_sentences(separate, separate_client, mode=SENTENCE_MODE_SEPARATE)
+
+    fused_client = RecordingClient()
+    fused = _records()
+    tos_processing.analyze_sentences(fused, fused_client, mode=SENTENCE_MODE_FUSED)
+
+    assert set(separate_client.systems) == {SCORE_SYSTEM_INSTRUCTION, CATEGORIZE_SYSTEM_INSTRUCTION}
+    # 융합 모드는 점수화와 분류를 한 번의 호출로 수행
+    assert set(fused_client.systems) == {FUSED_SYSTEM_INSTRUCTION}
+    assert len(fused_client.systems) < len(separate_client.systems)
+    # 가짜 클라이언트는 문장별로 같은 점수/카테고리를 주므로 두 방식의 결과가 같아야 함
+    assert [(r.importance_score, r.category) for r in fused] == [(r.importance_score, r.category) for r in separate]
+
+
+def test_default_mode_from_setting(monkeypatch):
+    monkeypatch.setattr(tos_processing, "SENTENCE_ANALYSIS_MODE", SENTENCE_MODE_FUSED)
+    client = RecordingClient()
+    tos_processing.analyze_sentences(_records(), client)
+    assert set(client.systems) == {FUSED_SYSTEM_INSTRUCTION}
+
+
+def test_version_depends_on_mode():
+    client = RecordingClient()
+    assert tos_processing.sentence_results_version(client, SENTENCE_MODE_FUSED) != (
+        tos_processing.sentence_results_version(client, SENTENCE_MODE_SEPARATE)
+    )
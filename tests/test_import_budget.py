@@ -0,0 +1,33 @@
+import importlib.util
+import os
+
+# README의 `profile_imports.py --budget-ms 200 --forbid trafilatura --forbid boto3`와 같은 기준
+BUDGET_MS = 200
+FORBIDDEN = ("trafilatura", "boto3")
+# 측정 잡음을 줄이기 위해 여러 번 재고 가장 빠른 값을 사용
+RUNS = 3
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_profiler():
+    spec = importlib.util.spec_from_file_location("profile_imports", os.path.join(ROOT, "scripts", "profile_imports.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_lambda_cold_import_budget():
+    profiler = _load_profiler()
+    runs = [profiler.measure("lambda_function", os.path.join(ROOT, "src")) for _ in range(RUNS)]
+
+    imported = {name.split(".")[0] for name, _, _, _ in runs[0]}
+    for package in FORBIDDEN:
+        assert package not in imported, f"콜드 임포트 중 {package}이(가) 로드됨"
+
+    totals = [
+        next(cumulative_us for name, _, cumulative_us, depth in entries if name == "lambda_function" and depth == 0)
+        for entries in runs
+    ]
+    total_ms = min(totals) / 1000
+    assert total_ms < BUDGET_MS, f"콜드 임포트 {total_ms:.1f} ms가 예산 {BUDGET_MS} ms를 초과"
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from json_utils import JsonArrayItemParser
+from tos_processing import _score_batch, _stream_batch
+
+ITEMS = [{"id": idx, "importance_score": idx % 5 + 1} for idx in range(6)]
+RESPONSE = json.dumps(ITEMS, ensure_ascii=False)
+
+
+def feed_in_chunks(parser, text, size):
+    items = []
+    for end in range(size, len(text) + size, size):
+        items.extend(parser.feed(text[:end]))
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64])
+def test_items_are_emitted_once_as_they_complete(size):
+    parser = JsonArrayItemParser()
+    assert feed_in_chunks(parser, "설명: " + RESPONSE, size) == ITEMS
+    assert parser.closed
+
+
+def test_numbers_wait_for_delimiter():
+    parser = JsonArrayItemParser()
+    assert parser.feed("[1, 2") == [1]
+    assert parser.feed("[1, 23") == []
+    assert parser.feed("[1, 23]") == [23]
+    assert parser.closed
+
+
+def test_retry_restarts_parsing():
+    parser = JsonArrayItemParser()
+    first = parser.feed(RESPONSE[: len(RESPONSE) // 2])
+    assert first == ITEMS[: len(first)] and first
+    # 재시도로 응답이 처음부터 다시 오면 이전 항목부터 다시 꺼냄 (중복 제거는 호출한 쪽에서)
+    retried = json.dumps(ITEMS[::-1], ensure_ascii=False)
+    assert feed_in_chunks(parser, retried, 5) == ITEMS[::-1]
+    assert parser.closed
+
+
+def test_object_or_broken_item_stops_parsing():
+    parser = JsonArrayItemParser()
+    assert parser.feed('{"results": [1, 2]}') == []
+    assert not parser.closed
+
+    parser = JsonArrayItemParser()
+    assert parser.feed('[{"id": 0}, {"id": 1, "note": "제1조\\_정의"}, {"id": 2}]') == [{"id": 0}]
+    assert not parser.closed
+
+
+class RetryingStreamClient:
+    """첫 시도는 응답 일부를 보낸 뒤 끊기고, 재시도에서 (다를 수 있는) 전체 응답을 처음부터 보내는 스트리밍 클라이언트"""
+
+    small_model_id = "fake"
+
+    def __init__(self, partial, final, chunk=4):
+        self.partial = partial
+        self.final = final
+        self.chunk = chunk
+
+    def generate_response_stream(self, system_instruction, message, on_text, model_size="small", model_id=None, output_schema=None, validate=None):
+        for text in (self.partial, self.final):
+            for end in range(self.chunk, len(text) + self.chunk, self.chunk):
+                on_text(text[:end])
+        return self.final
+
+
+def _batch():
+    return [{"id": item["id"], "sentence": f"문장 {item['id']}"} for item in ITEMS]
+
+
+def test_stream_batch_dispatches_each_id_once_across_retries():
+    partial = RESPONSE[: len(RESPONSE) // 2]
+    final = json.dumps([{**item, "importance_score": 5} for item in ITEMS[::-1]], ensure_ascii=False)
+    streamed = []
+    rest = _stream_batch(_score_batch, _batch(), RetryingStreamClient(partial, final), streamed.extend)
+
+    ids = [item["id"] for item in streamed]
+    assert sorted(ids) == [item["id"] for item in ITEMS]
+    assert len(ids) == len(set(ids))
+    assert rest == []
+    # 첫 시도에서 이미 넘긴 항목은 첫 시도의 값 그대로
+    first_attempt = {item["id"] for item in JsonArrayItemParser().feed(partial)}
+    for item in streamed:
+        expected = ITEMS[item["id"]]["importance_score"] if item["id"] in first_attempt else 5
+        assert item["importance_score"] == expected
+
+
+def test_stream_batch_reparses_broken_response():
+    broken = RESPONSE.replace('"id": 3,', '"note": "제1조\\_정의", "id": 3,', 1)
+    streamed = []
+    rest = _stream_batch(_score_batch, _batch(), RetryingStreamClient("", broken), streamed.extend)
+
+    assert [item["id"] for item in streamed] == [0, 1, 2]
+    # 보정 파싱으로 나머지 항목을 반환하되 이미 넘긴 id는 빼고 반환
+    assert [item["id"] for item in rest] == [3, 4, 5]
@@ -0,0 +1,152 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import lambda_function
+from analysis_lease import InMemoryLeaseStore
+from checkpoint_store import InMemoryCheckpointStore
+from runtime import ANALYSIS_TABLE_NAME, RuntimeContext, set_runtime
+from sentence_store import InMemorySentenceStore
+from simulated_llm import SimulatedLLMClient
+
+URL = "https://example.com/tos"
+BODY = "<html><body><p>회사는 사전 통지 없이 서비스를 변경할 수 있습니다.</p></body></html>"
+CONTENT = "<p>회사는 사전 통지 없이 서비스를 변경할 수 있습니다.</p>"
+CLAUSE = {"category": "약관 및 서비스 변경", "summarized_clause": "요약", "reasoning": "근거", "evaluation": "bad"}
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+URL_HASH = _sha256(URL)
+
+
+class FakeAnalysisTable:
+    """분석 결과 테이블 (url 해시 키). update_item은 raw_hash 갱신식만 해석한다."""
+
+    def __init__(self, items=()):
+        self.items = {item["url"]: dict(item) for item in items}
+        self.updates = []
+        self.puts = []
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get(Key["url"])
+        return {"Item": dict(item)} if item else {}
+
+    def put_item(self, Item):
+        self.puts.append(Item)
+        self.items[Item["url"]] = dict(Item)
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues):
+        self.updates.append((Key, UpdateExpression, ExpressionAttributeValues))
+        assert UpdateExpression == "SET raw_hash = :raw_hash"
+        self.items[Key["url"]]["raw_hash"] = ExpressionAttributeValues[":raw_hash"]
+
+
+class ForbiddenLeaseStore(InMemoryLeaseStore):
+    def acquire(self, key, owner, ttl_seconds):
+        raise AssertionError("캐시 적중 시 임대를 잡으면 안 됨")
+
+
+def _cached_item(**fields):
+    return {
+        "url": URL_HASH, "overall_evaluation": "bad", "evaluation_for_each_clause": [CLAUSE], **fields,
+    }
+
+
+def _invoke(url=URL, body=BODY):
+    event = {"queryStringParameters": {"url": url}, "body": body}
+    response = lambda_function.lambda_handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+@pytest.fixture
+def runtime():
+    def install(table, **kwargs):
+        set_runtime(RuntimeContext(tables={ANALYSIS_TABLE_NAME: table}, **kwargs))
+
+    yield install
+    set_runtime(None)
+
+
+@pytest.fixture
+def extract_calls(monkeypatch):
+    calls = []
+
+    def extract(body):
+        calls.append(body)
+        return CONTENT
+
+    monkeypatch.setattr(lambda_function, "_extract_content", extract)
+    return calls
+
+
+def test_raw_hash_hit_skips_extraction(runtime, extract_calls):
+    table = FakeAnalysisTable([_cached_item(raw_hash=_sha256(BODY), content_hash="old")])
+    runtime(table, lease_store=ForbiddenLeaseStore())
+
+    # 쿼리 파라미터와 해시는 무시하고 같은 문서로 조회
+    status, payload = _invoke(url=f"{URL}?utm_source=x#section")
+
+    assert status == 200
+    assert payload == {"overall_evaluation": "bad", "evaluation_for_each_clause": [CLAUSE]}
+    assert extract_calls == []
+    assert table.updates == [] and table.puts == []
+
+
+def test_content_hash_hit_backfills_raw_hash(runtime, extract_calls):
+    table = FakeAnalysisTable([_cached_item(raw_hash="other-html", content_hash=_sha256(CONTENT))])
+    runtime(table, lease_store=ForbiddenLeaseStore())
+
+    status, payload = _invoke()
+
+    assert status == 200
+    assert payload["evaluation_for_each_clause"] == [CLAUSE]
+    assert extract_calls == [BODY]
+    assert table.updates == [
+        ({"url": URL_HASH}, "SET raw_hash = :raw_hash", {":raw_hash": _sha256(BODY)}),
+    ]
+    assert table.puts == []
+
+    # 다음 요청은 추출 없이 원본 해시로 적중
+    assert _invoke() == (status, payload)
+    assert extract_calls == [BODY]
+    assert len(table.updates) == 1
+
+
+def test_miss_runs_pipeline_and_stores_hashes(runtime, extract_calls):
+    table = FakeAnalysisTable([_cached_item(raw_hash="other-html", content_hash="changed")])
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        runtime(
+            table,
+            llm_client=SimulatedLLMClient(sleep=lambda seconds: None),
+            executor=executor,
+            sentence_store=InMemorySentenceStore(),
+            checkpoint_store=InMemoryCheckpointStore(),
+            lease_store=InMemoryLeaseStore(),
+        )
+        status, payload = _invoke()
+
+    assert status == 200
+    assert "overall_evaluation" in payload
+    assert table.updates == []
+    stored = table.items[URL_HASH]
+    assert stored["raw_hash"] == _sha256(BODY)
+    assert stored["content_hash"] == _sha256(CONTENT)
+
+
+def test_empty_extraction_is_bad_request(runtime, monkeypatch):
+    runtime(FakeAnalysisTable())
+    monkeypatch.setattr(lambda_function, "_extract_content", lambda body: None)
+    assert _invoke() == (400, {"error": "약관 전처리에 실패했습니다."})
+
+
+def test_missing_parameters(runtime):
+    runtime(FakeAnalysisTable())
+    response = lambda_function.lambda_handler({"queryStringParameters": None, "body": BODY}, None)
+    assert response["statusCode"] == 400
+    response = lambda_function.lambda_handler({"queryStringParameters": {"url": URL}, "body": ""}, None)
+    assert response["statusCode"] == 400
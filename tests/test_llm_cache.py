@@ -0,0 +1,53 @@
+from llm_cache import ResponseCache, SQLiteResponseStore, response_cache_key
+
+
+class BrokenStore:
+    def get(self, key):
+        raise RuntimeError("unavailable")
+
+    def put(self, key, response):
+        raise RuntimeError("unavailable")
+
+
+def test_cache_key_depends_on_every_input():
+    base = ("model", {"temperature": 0}, "system", "message")
+    key = response_cache_key(*base)
+    assert key == response_cache_key(*base)
+    assert key != response_cache_key("other", *base[1:])
+    assert key != response_cache_key("model", {"temperature": 0.2}, "system", "message")
+    assert key != response_cache_key("model", {"temperature": 0, "outputSchema": {}}, "system", "message")
+    assert key != response_cache_key("model", {"temperature": 0}, "system", "message 2")
+
+
+def test_memory_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"  # a가 최근 사용으로 이동
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["memory_hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_persistent_hit_is_promoted_to_memory():
+    store = SQLiteResponseStore(":memory:")
+    ResponseCache(persistent=store).put("key", "응답")
+
+    cache = ResponseCache(persistent=store)
+    assert cache.get("key") == "응답"
+    assert cache.get("key") == "응답"
+    stats = cache.stats()
+    assert (stats["persistent_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_persistent_store_failures_are_misses():
+    cache = ResponseCache(persistent=BrokenStore())
+    assert cache.get("key") is None
+    cache.put("key", "응답")
+    # 영속 저장소에 쓰지 못해도 메모리에는 남음
+    assert cache.get("key") == "응답"
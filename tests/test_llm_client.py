@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+pytest.importorskip("boto3")
+
+from llm_cache import ResponseCache  # noqa: E402
+from llm_client import LLMClient, list_output_schema  # noqa: E402
+from tos_processing import parse_score_response  # noqa: E402
+
+MODEL_ID = "us.amazon.nova-micro-v1:0"
+SCHEMA = list_output_schema("record_scores", "점수 기록", {"type": "object"})
+
+
+class FakeRuntime:
+    """converse/converse_stream에 미리 정한 응답을 차례로 돌려주는 Bedrock 런타임"""
+
+    def __init__(self, responses=(), streams=()):
+        self.responses = list(responses)
+        self.streams = list(streams)
+        self.calls = 0
+
+    def converse(self, **request):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    def converse_stream(self, **request):
+        self.calls += 1
+        return {"stream": iter(self.streams.pop(0))}
+
+
+def text_response(text):
+    return {"output": {"message": {"content": [{"text": text}]}}, "usage": {}}
+
+
+def tool_response(tool_input):
+    return {"output": {"message": {"content": [{"toolUse": {"input": tool_input}}]}}, "usage": {}}
+
+
+def _client(runtime, structured_output=False):
+    client = LLMClient(small_model_id=MODEL_ID, response_cache=ResponseCache(), structured_output=structured_output)
+    client.client = runtime
+    return client
+
+
+def test_unparsable_response_is_not_cached():
+    runtime = FakeRuntime([text_response("죄송합니다. 처리할 수 없습니다."), text_response('[{"id": 0, "importance_score": 3}]')])
+    client = _client(runtime)
+
+    first = client.generate_response("system", "message", validate=parse_score_response)
+    with pytest.raises(ValueError):
+        parse_score_response(first)
+    assert client.response_cache.stats()["entries"] == 0
+
+    # 다시 호출하면 캐시가 아니라 모델을 호출하고, 이번에는 파싱되는 응답이 캐시됨
+    second = client.generate_response("system", "message", validate=parse_score_response)
+    assert parse_score_response(second) == [{"id": 0, "importance_score": 3}]
+    assert client.generate_response("system", "message", validate=parse_score_response) == second
+    assert runtime.calls == 2
+
+
+def test_response_without_validate_is_cached():
+    runtime = FakeRuntime([text_response("요약")])
+    client = _client(runtime)
+    assert client.generate_response("system", "message") == "요약"
+    assert client.generate_response("system", "message") == "요약"
+    assert runtime.calls == 1
+
+
+def test_tool_use_response_returns_array():
+    runtime = FakeRuntime([tool_response({"results": [{"id": 0, "importance_score": 5}]})])
+    client = _client(runtime, structured_output=True)
+    response = client.generate_response("system", "message", output_schema=SCHEMA, validate=parse_score_response)
+    assert json.loads(response) == [{"id": 0, "importance_score": 5}]
+
+
+def _delta(**delta):
+    return {"contentBlockDelta": {"delta": delta}}
+
+
+def test_stream_ignores_text_before_tool_use():
+    # Nova는 도구 호출 전에 <thinking> 설명을 텍스트로 보내기도 함
+    events = [
+        _delta(text='<thinking>예: [{"id": 7, "importance_score": 1}]'),
+        _delta(text="</thinking>"),
+        _delta(toolUse={"input": '{"results": [{"id": 0, "importance_score": 5},'}),
+        _delta(toolUse={"input": ' {"id": 1, "importance_score": 2}]}'}),
+        {"metadata": {"usage": {}}},
+    ]
+    client = _client(FakeRuntime(streams=[events]), structured_output=True)
+    seen = []
+    response = client.generate_response_stream("system", "message", seen.append, output_schema=SCHEMA)
+
+    assert all("thinking" not in text for text in seen)
+    assert seen[-1] == '[{"id": 0, "importance_score": 5}, {"id": 1, "importance_score": 2}]}'
+    assert json.loads(response) == [{"id": 0, "importance_score": 5}, {"id": 1, "importance_score": 2}]
+
+
+def test_stream_without_schema_forwards_text():
+    events = [_delta(text="[1,"), _delta(text=" 2]"), {"metadata": {"usage": {}}}]
+    client = _client(FakeRuntime(streams=[events]))
+    seen = []
+    assert client.generate_response_stream("system", "message", seen.append) == "[1, 2]"
+    assert seen == ["[1,", "[1, 2]"]
@@ -0,0 +1,106 @@
+import pytest
+
+from llm_governor import AdaptiveConcurrencyLimiter, is_retryable, is_transient_network_error
+from simulated_llm import SimulatedServiceError
+
+
+# botocore가 없는 환경에서도 분류를 확인할 수 있도록 botocore.exceptions와 같은 계층을 흉내 낸 예외
+class BotoCoreError(Exception):
+    pass
+
+
+class ConnectionError(BotoCoreError):
+    pass
+
+
+class EndpointConnectionError(ConnectionError):
+    pass
+
+
+class HTTPClientError(BotoCoreError):
+    pass
+
+
+class ReadTimeoutError(HTTPClientError):
+    pass
+
+
+class ConnectionClosedError(HTTPClientError):
+    pass
+
+
+for _cls in (BotoCoreError, ConnectionError, EndpointConnectionError, HTTPClientError, ReadTimeoutError, ConnectionClosedError):
+    _cls.__module__ = "botocore.exceptions"
+
+
+def _limiter():
+    return AdaptiveConcurrencyLimiter("test-model", initial_limit=2, max_retries=3, sleep=lambda seconds: None)
+
+
+def _failing(errors):
+    """errors를 차례로 던진 뒤 "ok"를 반환하는 함수와 호출 횟수 목록"""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return fn, calls
+
+
+@pytest.mark.parametrize("err", [
+    SimulatedServiceError("ThrottlingException"),
+    SimulatedServiceError("throttlingException"),
+    SimulatedServiceError("ServiceUnavailableException"),
+    SimulatedServiceError("ModelStreamErrorException"),
+    EndpointConnectionError(),
+    ReadTimeoutError(),
+    ConnectionClosedError(),
+])
+def test_retryable_errors(err):
+    assert is_retryable(err)
+
+
+@pytest.mark.parametrize("err", [
+    SimulatedServiceError("ValidationException"),
+    SimulatedServiceError("AccessDeniedException"),
+    HTTPClientError(),
+    ValueError("bad json"),
+])
+def test_non_retryable_errors(err):
+    assert not is_retryable(err)
+
+
+def test_network_error_requires_botocore_module():
+    # 같은 이름이라도 botocore 예외가 아니면 (예: 내장 ConnectionError) 네트워크 오류로 보지 않음
+    assert not is_transient_network_error(TimeoutError())
+    assert is_transient_network_error(EndpointConnectionError())
+
+
+def test_call_retries_transient_network_errors():
+    limiter = _limiter()
+    fn, calls = _failing([ReadTimeoutError(), EndpointConnectionError()])
+    assert limiter.call(fn) == "ok"
+    assert len(calls) == 3
+    assert limiter.stats()["retries"] == 2
+    assert limiter.stats()["throttled"] == 0
+
+
+def test_call_raises_non_retryable_immediately():
+    limiter = _limiter()
+    fn, calls = _failing([SimulatedServiceError("ValidationException")])
+    with pytest.raises(SimulatedServiceError):
+        limiter.call(fn)
+    assert len(calls) == 1
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_call_gives_up_after_max_retries():
+    limiter = _limiter()
+    fn, calls = _failing([SimulatedServiceError("ThrottlingException")] * 10)
+    with pytest.raises(SimulatedServiceError):
+        limiter.call(fn)
+    assert len(calls) == limiter.max_retries + 1
+    assert limiter.stats()["throttled"] == len(calls)
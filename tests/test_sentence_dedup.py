@@ -0,0 +1,65 @@
+from sentence_dedup import representatives
+from sentence_record import SentenceRecord
+from sentence_store import InMemorySentenceStore
+from simulated_llm import SimulatedLLMClient
+import tos_processing
+
+
+BASE = (
+    "유료 서비스 이용자는 결제일로부터 칠 일 이내에 서비스를 이용하지 않은 경우에 한하여 "
+    "고객센터를 통해 결제 취소를 요청할 수 있으며 회사는 요청을 받은 날부터 삼 영업일 이내에 처리합니다"
+)
+# 마지막 글자만 다른 문장 (shingle 대부분이 같음)
+NEAR = BASE[:-1] + "함"
+OTHER = "회사는 서비스 개선을 위하여 이용자의 접속 기록과 기기 정보를 수집하여 통계 목적으로만 활용합니다"
+
+
+def test_identical_sentence_points_to_first():
+    assert representatives([BASE, OTHER, BASE]) == [0, 1, 0]
+
+
+def test_whitespace_difference_is_ignored():
+    assert representatives([BASE, BASE.replace(" ", "  ")]) == [0, 0]
+
+
+def test_near_duplicate_is_grouped():
+    assert representatives([OTHER, BASE, NEAR]) == [0, 1, 1]
+
+
+def test_below_threshold_pair_is_not_grouped():
+    # 앞부분만 같고 뒷부분이 다른 문장
+    half = BASE[: len(BASE) // 2] + " 다만 디지털 콘텐츠를 내려받은 경우에는 취소가 제한됩니다"
+    assert representatives([BASE, half]) == [0, 1]
+    # 기준을 1.0으로 올리면 거의 같은 문장도 묶지 않음
+    assert representatives([BASE, NEAR], threshold=1.0) == [0, 1]
+
+
+def test_short_strings():
+    # SHINGLE_SIZE 이하의 짧은 문자열은 문자열 전체가 하나의 shingle
+    assert representatives(["동의", "동의", "거부"]) == [0, 0, 2]
+    assert representatives(["", ""]) == [0, 0]
+    assert representatives([]) == []
+
+
+def test_analyze_sentences_stores_representatives_only(monkeypatch):
+    monkeypatch.setattr(tos_processing, "PREFILTER_ENABLED", False)
+    monkeypatch.setattr(tos_processing, "DEDUP_ENABLED", True)
+    text = "\n".join([BASE, NEAR, OTHER])
+    records = []
+    start = 0
+    for idx, sentence in enumerate([BASE, NEAR, OTHER]):
+        records.append(SentenceRecord(idx, start, start + len(sentence), text))
+        start += len(sentence) + 1
+    store = InMemorySentenceStore()
+    client = SimulatedLLMClient(sleep=lambda seconds: None)
+
+    tos_processing.analyze_sentences(records, client, store=store)
+
+    # 복사된 결과도 레코드에는 기록
+    assert records[1].importance_score == records[0].importance_score
+    assert records[1].category == records[0].category
+    version = tos_processing.sentence_results_version(client, tos_processing.SENTENCE_ANALYSIS_MODE)
+    stored = store.get_many([tos_processing.sentence_key(sentence, version) for sentence in (BASE, NEAR, OTHER)])
+    assert tos_processing.sentence_key(BASE, version) in stored
+    assert tos_processing.sentence_key(OTHER, version) in stored
+    assert tos_processing.sentence_key(NEAR, version) not in stored
@@ -0,0 +1,66 @@
+import pytest
+
+from sentence_prefilter import prefilter_sentence
+
+
+@pytest.mark.parametrize("sentence, expected", [
+    ("제1조 (목적)", (1, "heading")),
+    ("제3조의2【정의】", (1, "heading")),
+    ("제5조 요금", (1, "heading")),
+    ("Article 5. Termination", (1, "heading")),
+    ("Section 12 Limitation of Liability", (1, "heading")),
+    ("1. 개요", (1, "heading")),
+    ("2.3 Payment Terms", (1, "heading")),
+    ("3. 개인정보의 수집 및 이용", (1, "heading")),
+    ("제1조(목적) 제2조(정의) 제3조(약관의 효력 및 변경) 제4조(회원가입)", (1, "toc")),
+    ("제1조 목적, 제2조 정의, 제3조 약관의 효력", (1, "toc")),
+    ("목적 .......... 3", (1, "toc")),
+    ("고객센터: 1588-1234", (1, "contact")),
+    ("E-mail: help@example.com", (1, "contact")),
+    ("부칙", (1, "effective_date")),
+    ("이 약관은 2024년 1월 1일부터 시행합니다.", (1, "effective_date")),
+    ("시행일자: 2024. 1. 1.", (1, "effective_date")),
+    ("Last updated: March 3, 2024", (1, "effective_date")),
+    ("Effective date: 2024-01-01", (1, "effective_date")),
+    ("\"회원\"이란 회사와 이용계약을 체결한 자를 말합니다.", (2, "definition")),
+    ("회사는 회원이 약관을 위반한 경우 계정을 정지할 수 있습니다.", (5, "high_risk")),
+    ("회사는 천재지변으로 인한 손해에 대하여 책임을 지지 아니합니다.", (5, "high_risk")),
+    ("회사는 사전 통지 없이 서비스를 변경할 수 있습니다.", (5, "high_risk")),
+    ("유료 서비스는 결제 후 환불이 불가합니다.", (5, "high_risk")),
+    ("We may terminate your account without cause at any time.", (5, "high_risk")),
+])
+def test_decided(sentence, expected):
+    assert prefilter_sentence(sentence) == expected
+
+
+def test_clause_citing_articles_is_not_toc():
+    sentence = "회사는 제5조, 제7조 및 제9조에 따라 사전 통지 없이 회원의 계정을 정지할 수 있습니다."
+    assert prefilter_sentence(sentence) == (5, "high_risk")
+
+
+def test_clause_with_contact_is_not_contact():
+    sentence = "회사는 서비스 이용 중 발생한 손해에 대하여 책임을 지지 않습니다. 문의: 02-1234-5678"
+    assert prefilter_sentence(sentence) == (5, "high_risk")
+
+
+@pytest.mark.parametrize("sentence", [
+    # 제목 번호 뒤에 본문이 이어지거나 서술어로 끝나는 문장은 제목이 아님
+    "제5조 (요금) 회사는 요금을 변경할 수 있습니다",
+    "1. 회사는 언제든지 요금을 변경할 수 있음",
+    "2. 구매한 디지털 콘텐츠는 환불 대상 아님",
+    "Section 4 Fees are charged monthly to your card",
+    # 날짜 뒤에 동의 간주 내용이 이어지는 문장은 시행일이 아님
+    "변경된 약관은 2024년 1월 1일부터 적용되며, 이의를 제기하지 않으면 동의한 것으로 봅니다.",
+    # 위험 규칙과 제목 규칙이 함께 일치하면 모델에 맡김
+    "1. 유료 서비스는 환불되지 않음",
+    # 보호 조항 (이용자가 주체, 부정형)
+    "회원은 언제든지 계정을 삭제할 수 있습니다.",
+    "You may terminate your account at any time.",
+    "회사는 회원의 개인정보를 본인의 동의 없이 제3자에게 제공하지 아니합니다.",
+    "회사는 회원의 개인정보를 제3자에게 제공하지 않습니다.",
+    "회사는 사전 동의 없이 개인정보를 제공하지 않습니다",
+    "회사는 고의 또는 중대한 과실로 인한 손해에 대하여 면책되지 않습니다",
+    "We will never sell your personal data",
+])
+def test_left_to_model(sentence):
+    assert prefilter_sentence(sentence) is None
@@ -0,0 +1,115 @@
+import pytest
+
+from sentence_record import SentenceRecord
+from sentence_store import InMemorySentenceStore, normalize_sentence, sentence_key
+from simulated_llm import SimulatedLLMClient
+import tos_processing
+
+
+SENTENCES = [
+    "회원은 서비스 이용 시 관계 법령과 이 약관의 규정을 준수하여야 합니다.",
+    "회사는 회원이 등록한 게시물을 서비스 홍보 목적으로 사용할 수 있습니다.",
+    "유료 서비스의 이용 요금은 매월 등록된 결제 수단으로 청구됩니다.",
+    "회원은 설정 메뉴에서 언제든지 알림 수신 여부를 변경할 수 있습니다.",
+]
+# 규칙으로 점수를 확정하는 문장 (조항 제목 1점, 명백한 위험 조항 5점)
+HEADING = "제1조 (목적)"
+HIGH_RISK = "회사는 서비스 이용 중 발생한 손해에 대하여 책임을 지지 않습니다."
+
+
+class CountingClient(SimulatedLLMClient):
+    """모델이 받은 문장 배치 메시지를 기록하는 가짜 클라이언트."""
+
+    def __init__(self, small_model_id=None):
+        super().__init__(sleep=lambda seconds: None, important_ratio=0.5)
+        if small_model_id:
+            self.small_model_id = small_model_id
+        self.messages = []
+
+    def _respond(self, system_instruction, message):
+        self.messages.append(message)
+        return super()._respond(system_instruction, message)
+
+
+def _records(sentences):
+    text = "\n".join(sentences)
+    records, start = [], 0
+    for idx, sentence in enumerate(sentences):
+        records.append(SentenceRecord(idx, start, start + len(sentence), text))
+        start += len(sentence) + 1
+    return records
+
+
+def _results(records):
+    return [(record.importance_score, record.category) for record in records]
+
+
+@pytest.fixture(autouse=True)
+def pipeline_flags(monkeypatch):
+    monkeypatch.setattr(tos_processing, "PREFILTER_ENABLED", True)
+    monkeypatch.setattr(tos_processing, "DEDUP_ENABLED", True)
+    monkeypatch.setattr(tos_processing, "LOCAL_CATEGORIZER_ENABLED", False)
+
+
+def test_sentence_key_ignores_whitespace_and_case():
+    assert normalize_sentence("  Terms   of\nService ") == "terms of service"
+    assert sentence_key("Terms of  Service", "v1") == sentence_key("terms of service", "v1")
+    assert sentence_key("Terms of Service", "v1") != sentence_key("Terms of Service", "v2")
+
+
+def test_store_hit_skips_model():
+    store = InMemorySentenceStore()
+    first = _records(SENTENCES)
+    tos_processing.analyze_sentences(first, CountingClient(), store=store)
+
+    client = CountingClient()
+    second = _records(SENTENCES)
+    tos_processing.analyze_sentences(second, client, store=store)
+
+    assert client.messages == []
+    assert _results(second) == _results(first)
+
+
+def test_partial_hit_sends_only_new_sentences():
+    store = InMemorySentenceStore()
+    tos_processing.analyze_sentences(_records(SENTENCES[:2]), CountingClient(), store=store)
+
+    client = CountingClient()
+    tos_processing.analyze_sentences(_records(SENTENCES), client, store=store)
+
+    sent = "".join(client.messages)
+    assert SENTENCES[0] not in sent and SENTENCES[1] not in sent
+    assert SENTENCES[2] in sent and SENTENCES[3] in sent
+
+
+def test_version_change_invalidates_entries():
+    store = InMemorySentenceStore()
+    tos_processing.analyze_sentences(_records(SENTENCES), CountingClient(), store=store)
+
+    # 소형 모델이 바뀌면 이전 결과를 쓰지 않음
+    client = CountingClient(small_model_id="simulated.small-v2")
+    tos_processing.analyze_sentences(_records(SENTENCES), client, store=store)
+    assert all(sentence in "".join(client.messages) for sentence in SENTENCES)
+
+    # 분석 방식(융합 모드)이 바뀌어도 마찬가지
+    client = CountingClient()
+    tos_processing.analyze_sentences(_records(SENTENCES), client, store=store, mode=tos_processing.SENTENCE_MODE_FUSED)
+    assert all(sentence in "".join(client.messages) for sentence in SENTENCES)
+
+
+def test_rule_decided_sentences_are_not_stored():
+    store = InMemorySentenceStore()
+    client = CountingClient()
+    records = _records([HEADING, HIGH_RISK, *SENTENCES])
+    tos_processing.analyze_sentences(records, client, store=store)
+
+    assert records[0].importance_score == 1
+    assert records[1].importance_score == 5
+    # 규칙으로 5점을 받은 문장도 카테고리는 모델로 분류
+    assert records[1].category is not None
+
+    version = tos_processing.sentence_results_version(client, tos_processing.SENTENCE_ANALYSIS_MODE)
+    stored = store.get_many([sentence_key(sentence, version) for sentence in [HEADING, HIGH_RISK, *SENTENCES]])
+    assert sentence_key(HEADING, version) not in stored
+    assert sentence_key(HIGH_RISK, version) not in stored
+    assert all(sentence_key(sentence, version) in stored for sentence in SENTENCES)
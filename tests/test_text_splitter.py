@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+import text_splitter
+from baseline_normalizer import reference_counts, reference_normalize_block
+from baseline_splitter import reference_split
+
+
+# 분할 규칙이 보는 문자(문장 부호, 소수점, 약어, 글머리, 닫는 따옴표, 줄바꿈)를 섞은 토큰
+_SPLIT_TOKENS = [
+    "가", "약관", "A", "b", "The", "1", "3.14", " ", " ", "  ", "\t", "\n", "\n\n", "\n ",
+    ".", ". ", "?", "!", "…", "...", "。", "！", "？", "?.", "!.", '"', "'", "”", "’", ")", "(", "“",
+    "e.g. ", "etc. ", "Mr. ", "Dr. ", "U.S.A. ", "p. 5", "no. 3", "Inc. ", "㈜", "주식회사. ", "제1조. ", "3항. ",
+    "- ", "• ", "※ ", "1. ", "2) ", "가. ", "나) ", "a) ", "B. ",
+]
+
+DOCUMENTS = [
+    ("ko", "제1조 (목적) 이 약관은 회사가 제공하는 서비스의 이용 조건을 정합니다. 회원은 약관에 동의해야 합니다.\n"
+           "1. 요금은 3.5%의 수수료를 포함합니다.\n2. 환불은 7일 이내에 가능합니다!\n\n※ 자세한 내용은 고객센터에 문의하세요…"),
+    ("en", "Welcome to Example Inc. These Terms govern your use. See p. 5 and no. 3 for details, e.g. fees.\n"
+           "- You must be 18 or older. Mr. Smith agrees.\n- The U.S.A. law applies?\"Yes.\" (Really.) Done"),
+]
+
+
+@pytest.mark.parametrize("language,text", DOCUMENTS)
+def test_split_matches_baseline_on_documents(language, text):
+    assert text_splitter._split_by_rules(text, language) == reference_split(text, language)
+
+
+@pytest.mark.parametrize("language", ["ko", "en"])
+def test_split_matches_baseline_on_random_text(language):
+    rng = random.Random(f"split-{language}")
+    for _ in range(3000):
+        text = "".join(rng.choice(_SPLIT_TOKENS) for _ in range(rng.randint(0, 30)))
+        assert text_splitter._split_by_rules(text, language) == reference_split(text, language), repr(text)
+
+
+def test_records_reference_normalized_block():
+    records = text_splitter.split_sentences_block("<p>첫 문장입니다. 둘째 문장입니다.</p>")
+    assert [record.sentence for record in records] == ["첫 문장입니다.", "둘째 문장입니다."]
+    assert [record.id for record in records] == [0, 1]
+
+
+# 정규화가 보는 문자(엔티티, 태그, <br>, 굽은 따옴표, 여러 종류의 공백)를 섞은 토큰
+_NORMALIZE_TOKENS = list("ab가Z \t\r\f\v\n\n<>/“”‘’\u00a0\u3000&;#") + [
+    "&amp;", "&lt;", "&gt;", "&nbsp;", "&#65;", "&#x4a;", "&amp", "&ampx;", "&#44032;",
+    "<br>", "<BR />", "< br/>", "<a href=x>", "</p>", "<p class=\"c\">", "약관", "Terms",
+]
+
+HTML_DOCUMENT = (
+    "<div>\n\t<p class=\"c\">제1조 (목적)&nbsp;이 약관은 “회사”가 제공하는 서비스의 이용 조건을 정합니다.</p>\n\n\n"
+    "<li>Terms &amp; Conditions<br/></li>\r\n<p>‘Service’ means &lt;the&gt; platform.&#65;&#x4a;</p>   \n</div>"
+)
+
+
+def _stream(text, boundaries):
+    normalizer = text_splitter.StreamingNormalizer()
+    pieces = []
+    start = 0
+    for end in boundaries + [len(text)]:
+        pieces.append(normalizer.feed(text[start:end]))
+        start = end
+    pieces.append(normalizer.close())
+    return "".join(pieces), (normalizer.hangul, normalizer.latin)
+
+
+def _random_boundaries(rng, length):
+    return sorted(rng.sample(range(1, length), rng.randint(0, length - 1))) if length > 1 else []
+
+
+def test_streaming_normalizer_matches_baseline_at_every_boundary():
+    expected = reference_normalize_block(HTML_DOCUMENT).encode("utf-8")
+    for cut in range(len(HTML_DOCUMENT) + 1):
+        streamed, _ = _stream(HTML_DOCUMENT, [cut])
+        assert streamed.encode("utf-8") == expected, cut
+
+
+def test_streaming_normalizer_matches_baseline_on_random_chunks():
+    rng = random.Random("normalize")
+    for _ in range(3000):
+        text = "".join(rng.choice(_NORMALIZE_TOKENS) for _ in range(rng.randint(0, 40)))
+        expected = reference_normalize_block(text)
+        assert text_splitter._normalize_block(text).encode("utf-8") == expected.encode("utf-8"), repr(text)
+
+        boundaries = _random_boundaries(rng, len(text))
+        streamed, counts = _stream(text, boundaries)
+        assert streamed.encode("utf-8") == expected.encode("utf-8"), (text, boundaries)
+        assert counts == reference_counts(expected), (text, boundaries)
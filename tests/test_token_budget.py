@@ -0,0 +1,63 @@
+from sentence_record import SentenceRecord
+from token_budget import ITEM_OVERHEAD_TOKENS, batch_by_token_budget, estimate_tokens, item_tokens, record_tokens
+
+
+def _items(sentences):
+    return [{"id": idx, "sentence": sentence} for idx, sentence in enumerate(sentences)]
+
+
+def test_estimate_korean_and_ascii():
+    assert estimate_tokens("") == 0
+    # 한글은 음절당 1토큰 (공백 제외)
+    assert estimate_tokens("개인정보 수집") == 6
+    # 영문은 단어 조각 4자당 1토큰, 숫자는 3자리당 1토큰, 기호는 문자당 1토큰
+    assert estimate_tokens("Terms") == 2
+    assert estimate_tokens("fee") == 1
+    assert estimate_tokens("2026") == 2
+    assert estimate_tokens("a, b.") == 4
+    # 같은 글자 수라도 한글이 영문보다 토큰이 많게 추정됨
+    assert estimate_tokens("가나다라마바사아") > estimate_tokens("abcdefgh")
+    assert estimate_tokens("환불 fee 30일!") == 2 + 1 + 1 + 1 + 1
+
+
+def test_item_and_record_tokens_include_overhead():
+    assert item_tokens({"id": 0, "sentence": "환불"}) == 2 + ITEM_OVERHEAD_TOKENS
+    assert item_tokens({"id": 0}) == ITEM_OVERHEAD_TOKENS
+    text = "약관 환불"
+    assert record_tokens(SentenceRecord(0, 3, 5, text)) == 2 + ITEM_OVERHEAD_TOKENS
+
+
+def test_order_is_preserved():
+    items = _items([f"문장{idx}" for idx in range(25)])
+    batches = batch_by_token_budget(items, token_budget=50)
+    assert len(batches) > 1
+    assert [item for batch in batches for item in batch] == items
+
+
+def test_budget_boundary():
+    # 항목 하나 = 2(한글) + 8(구조) = 10토큰
+    items = _items(["환불"] * 6)
+    # 합이 예산과 같으면 같은 배치
+    assert [len(batch) for batch in batch_by_token_budget(items, token_budget=30)] == [3, 3]
+    # 1토큰 모자라면 다음 배치로
+    assert [len(batch) for batch in batch_by_token_budget(items, token_budget=29)] == [2, 2, 2]
+
+
+def test_max_items_limit():
+    items = _items(["환불"] * 5)
+    assert [len(batch) for batch in batch_by_token_budget(items, token_budget=1000, max_items=2)] == [2, 2, 1]
+
+
+def test_oversized_item_gets_its_own_batch():
+    items = _items(["환불", "가" * 100, "환불", "환불"])
+    batches = batch_by_token_budget(items, token_budget=30)
+    assert batches == [[items[0]], [items[1]], [items[2], items[3]]]
+    # 첫 항목이 예산보다 커도 빈 배치를 만들지 않음
+    assert batch_by_token_budget(items[1:2], token_budget=30) == [[items[1]]]
+    assert batch_by_token_budget([], token_budget=30) == []
+
+
+def test_custom_size_function():
+    text = "환불 규정"
+    records = [SentenceRecord(0, 0, 2, text), SentenceRecord(1, 3, 5, text)]
+    assert batch_by_token_budget(records, token_budget=10, size=record_tokens) == [[records[0]], [records[1]]]